@@ -0,0 +1,72 @@
+# agents/registry.py
+import importlib
+import threading
+from typing import Any, Callable, Dict
+
+# name -> "module:attribute" of a zero-argument builder (a class or function).
+# Nothing is imported until the first get_tool / get_agent call for that name.
+TOOLS: Dict[str, str] = {
+    "google_serper": "tools.google_serper_tool:GoogleSerperSearchTool",
+    "duckduckgo": "tools.duckduckgo_tool:DuckDuckGoSearchTool",
+    "ors_location": "tools.ors_tool:ORSLocationTool",
+    "ors_matrix": "tools.ors_tool:ORSMatrixTool",
+}
+
+AGENTS: Dict[str, str] = {
+    "travel_researcher": "agents.travel_researcher:build_travel_researcher",
+    "weather_advisor": "agents.weather_advisor_agent:build_weather_advisor",
+    "transport_advisor": "agents.transport_advisor_agent:build_transport_advisor",
+    "hotel_recommender": "agents.hotel_recommendation_agent:build_hotel_recommender",
+    "budget_optimizer": "agents.budget_optimizer_agent:build_budget_optimizer",
+    "itinerary_planner": "agents.itinerary_builder:build_itinerary_planner",
+}
+
+
+class LazyRegistry:
+    """
+    Builds each named object on first use and shares it for the rest of the
+    process. Concurrent first calls for the same name build it once.
+    """
+
+    def __init__(self, kind: str, builders: Dict[str, str]):
+        self.kind = kind
+        self.builders = builders
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()  # agent builders fetch tools while holding it
+
+    def _builder(self, name: str) -> Callable[[], Any]:
+        try:
+            path = self.builders[name]
+        except KeyError:
+            raise KeyError(f"Unknown {self.kind} {name!r}; known: {', '.join(self.builders)}") from None
+        module, _, attribute = path.partition(":")
+        return getattr(importlib.import_module(module), attribute)
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = self._builder(name)()
+        return instance
+
+    def loaded(self):
+        return list(self._instances)
+
+
+tools = LazyRegistry("tool", TOOLS)
+agents = LazyRegistry("agent", AGENTS)
+
+
+def get_tool(name: str):
+    return tools.get(name)
+
+
+def get_agent(name: str):
+    return agents.get(name)
+
+
+def get_llm(route: str = "default"):
+    from model import get_llm as _get_llm
+    return _get_llm(route)
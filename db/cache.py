@@ -0,0 +1,376 @@
+# db/cache.py
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from config.setting import (
+    LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_BYPASS, CACHE_REMOTE_RETRY,
+)
+from db import codec
+
+_MISSING = object()
+
+
+class _Flight:
+    """An in-progress computation that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TieredCache:
+    """
+    Two-tier cache: a bounded in-process LRU for hot keys in front of Redis.
+    Keys live under `cache:<namespace>:` in Redis and expire after `ttl` seconds
+    in both tiers. Redis errors are treated as misses so the cache never breaks a request;
+    after one, Redis is left alone for `retry_after` seconds and the cache runs
+    LRU-only instead of paying a connect timeout on every call.
+    `get_or_compute` coalesces concurrent misses for the same key into a single computation.
+    Values are stored in Redis with db.codec (msgpack, zstd when large; entries
+    written as JSON still read) unless `encode`/`decode` are given.
+    """
+
+    def __init__(self, namespace: str, ttl: int, max_entries: int = 1024,
+                 encode: Callable[[Any], bytes] = codec.encode, decode: Callable[[bytes], Any] = codec.decode,
+                 retry_after: float = CACHE_REMOTE_RETRY):
+        self.prefix = f"cache:{namespace}:"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._encode = encode
+        self._decode = decode
+        self._lru: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Flight] = {}
+        self._ainflight: Dict[tuple, asyncio.Future] = {}
+        self._redis = None
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.remote_skipped = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    # -------------------
+    # Redis tier
+    # -------------------
+    def _client(self):
+        if self._redis is None:
+            from db.redis_client import get_redis
+            self._redis = get_redis()
+        return self._redis
+
+    def _remote(self, call: Callable[[Any], Any], default: Any = None) -> Any:
+        """`call(client)`, or `default` if Redis fails or failed less than `retry_after` seconds ago."""
+        if time.monotonic() < self._down_until:
+            self._count("remote_skipped")
+            return default
+        try:
+            return call(self._client())
+        except Exception as e:
+            print(f"Cache {self.prefix} Redis unavailable, using the in-process tier only for {self.retry_after:g}s: {e}")
+            self._down_until = time.monotonic() + self.retry_after
+            return default
+
+    def _redis_get(self, key: str):
+        raw = self._remote(lambda r: r.get(self.prefix + key))
+        return _MISSING if raw is None else self._decode(raw)
+
+    def _redis_get_many(self, keys: list) -> list:
+        raws = self._remote(lambda r: r.mget([self.prefix + key for key in keys])) or [None] * len(keys)
+        return [_MISSING if raw is None else self._decode(raw) for raw in raws]
+
+    def _redis_set(self, key: str, value: Any, ttl: int):
+        self._remote(lambda r: r.setex(self.prefix + key, ttl, self._encode(value)))
+
+    # -------------------
+    # LRU tier
+    # -------------------
+    def _lru_get(self, key: str):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._lru[key]
+                return _MISSING
+            self._lru.move_to_end(key)
+            return value
+
+    def _lru_set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._lru[key] = (time.monotonic() + ttl, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    # -------------------
+    # Public API
+    # -------------------
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._lru_get(key)
+        if value is not _MISSING:
+            self._count("memory_hits")
+            return value
+        value = self._redis_get(key)
+        if value is not _MISSING:
+            self._count("redis_hits")
+            self._lru_set(key, value, self.ttl)
+            return value
+        self._count("misses")
+        return default
+
+    def get_many(self, keys: list) -> Dict[str, Any]:
+        """Cached values for whichever of `keys` are present; Redis is read with a single MGET."""
+        found: Dict[str, Any] = {}
+        remote = []
+        for key in keys:
+            value = self._lru_get(key)
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                self._count("memory_hits")
+                found[key] = value
+        if remote:
+            for key, value in zip(remote, self._redis_get_many(remote)):
+                if value is _MISSING:
+                    self._count("misses")
+                    continue
+                self._count("redis_hits")
+                self._lru_set(key, value, self.ttl)
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        ttl = ttl or self.ttl
+        self._lru_set(key, value, ttl)
+        self._redis_set(key, value, ttl)
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None):
+        """Store several values; Redis is written with one pipeline."""
+        ttl = ttl or self.ttl
+        for key, value in items.items():
+            self._lru_set(key, value, ttl)
+
+        def write(client):
+            pipe = client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(self.prefix + key, ttl, self._encode(value))
+            pipe.execute()
+
+        self._remote(write)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: Union[int, Callable[[Any], int], None] = None,
+                       refresh: bool = False) -> Any:
+        """
+        Return the cached value for `key`, or compute, store and return it.
+        Concurrent callers missing on the same key wait for the first caller's
+        result instead of computing it again. Exceptions are propagated to all
+        waiters and nothing is cached. `ttl` may be a function of the computed value.
+        """
+        if not refresh:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            self._count("coalesced")
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.set(key, flight.value, ttl(flight.value) if callable(ttl) else ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    async def aget_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                              ttl: Union[int, Callable[[Any], int], None] = None, refresh: bool = False) -> Any:
+        """
+        Async counterpart of `get_or_compute` for coroutine producers.
+        Redis I/O runs in a worker thread so the event loop is never blocked;
+        concurrent misses on the same event loop await a single computation.
+        If that computation is cancelled, one of its waiters takes over.
+        """
+        if not refresh:
+            value = self._lru_get(key)
+            if value is not _MISSING:
+                self._count("memory_hits")
+                return value
+            value = await asyncio.to_thread(self._redis_get, key)
+            if value is not _MISSING:
+                self._count("redis_hits")
+                self._lru_set(key, value, self.ttl)
+                return value
+            self._count("misses")
+
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        pending = self._ainflight.get(flight_key)
+        while pending is not None:
+            self._count("coalesced")
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise  # this caller was cancelled, not the computation
+            # The leader was cancelled: join whoever took over, or compute it here
+            pending = self._ainflight.get(flight_key)
+
+        flight = self._ainflight[flight_key] = loop.create_future()
+        try:
+            value = await compute()
+            flight.set_result(value)
+            await asyncio.to_thread(self.set, key, value, ttl(value) if callable(ttl) else ttl)
+            return value
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._ainflight.pop(flight_key, None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._lru.pop(key, None)
+        self._remote(lambda r: r.delete(self.prefix + key))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.redis_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "remote_skipped": self.remote_skipped,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "entries": len(self._lru),
+        }
+
+
+def hash_key(*parts: Any) -> str:
+    """Stable sha256 over JSON-serialised parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -------------------
+# Crew kickoff cache
+# -------------------
+llm_cache = TieredCache("llm", ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+
+
+@dataclass
+class CachedCrewOutput:
+    """Stand-in for CrewOutput when a crew run is served from the cache."""
+    raw: str
+    json_dict: Optional[Dict[str, Any]] = field(default=None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.json_dict or {})
+
+    def __str__(self):
+        return self.raw
+
+
+def _render(template: str, inputs: Dict[str, Any]) -> str:
+    from crewai.utilities.string_utils import interpolate_only
+    try:
+        return interpolate_only(template, inputs)
+    except (KeyError, ValueError):
+        return template
+
+
+# Task inputs that carry one user's conversation (recalled memory). They are part
+# of the cache key, and a run that has any is not cached at all: the answer is
+# built from private history and is neither shareable nor likely to recur
+PRIVATE_INPUTS = ("memory",)
+_EMPTY_INPUTS = (None, "", "none")
+
+
+def has_private_inputs(inputs: Dict[str, Any]) -> bool:
+    return any(inputs.get(k) not in _EMPTY_INPUTS for k in PRIVATE_INPUTS)
+
+
+def crew_cache_key(crew, inputs: Dict[str, Any]) -> str:
+    """
+    Content address of a crew run: agent role, model, rendered task
+    description, output schema and all inputs.
+    """
+    parts = []
+    for task in crew.tasks:
+        agent = task.agent
+        template = getattr(task, "_original_description", None) or task.description
+        parts.append((
+            getattr(agent, "role", None),
+            getattr(getattr(agent, "llm", None), "model", None),
+            _render(template, inputs),
+            getattr(getattr(task, "output_pydantic", None), "__name__", None),
+        ))
+    return hash_key(parts, hash_key(inputs))
+
+
+def cached_kickoff(crew, inputs: Dict[str, Any], task_name: str, bypass: bool = False, refresh: bool = False):
+    """
+    Run `crew.kickoff(inputs=...)` through the LLM response cache.
+    Runs with PRIVATE_INPUTS (a user's recalled memory) skip the cache;
+    prefetches pass none and are cached.
+
+    Args:
+        task_name: Name used for the per-task bypass switch (LLM_CACHE_BYPASS).
+        bypass: Skip the cache entirely for this call.
+        refresh: Ignore any cached value, run the crew and overwrite the entry.
+    """
+    if bypass or task_name in LLM_CACHE_BYPASS or has_private_inputs(inputs):
+        return crew.kickoff(inputs=inputs)
+
+    key = crew_cache_key(crew, inputs)
+    if not refresh:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return CachedCrewOutput(**cached)
+
+    result = crew.kickoff(inputs=inputs)
+    llm_cache.set(key, {"raw": str(getattr(result, "raw", result)), "json_dict": _to_dict(result) or None})
+    return result
+
+
+def _to_dict(result) -> Dict[str, Any]:
+    try:
+        return result.to_dict()
+    except Exception:
+        return {}
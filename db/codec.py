@@ -0,0 +1,86 @@
+# db/codec.py
+import threading
+from typing import Any, Union
+
+import orjson
+import ormsgpack
+import zstandard
+
+from config.setting import CODEC_COMPRESS_MIN_BYTES, CODEC_ZSTD_LEVEL
+
+# Encoded values start with a NUL byte, which no JSON document can, followed by
+# a version byte and a flags byte; anything else is a legacy JSON entry.
+MAGIC = b"\x00"
+VERSION = 1
+FLAG_ZSTD = 0x01
+
+_local = threading.local()  # zstd (de)compressors are not safe to share across threads
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    compressor = getattr(_local, "compressor", None)
+    if compressor is None:
+        compressor = _local.compressor = zstandard.ZstdCompressor(level=CODEC_ZSTD_LEVEL)
+    return compressor
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    decompressor = getattr(_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+
+def encode(value: Any, compress_min_bytes: int = CODEC_COMPRESS_MIN_BYTES) -> bytes:
+    """msgpack-encode `value`, zstd-compressing payloads of at least `compress_min_bytes`."""
+    payload = ormsgpack.packb(value, default=str, option=ormsgpack.OPT_NON_STR_KEYS)
+    flags = 0
+    if len(payload) >= compress_min_bytes:
+        compressed = _compressor().compress(payload)
+        if len(compressed) < len(payload):
+            payload, flags = compressed, FLAG_ZSTD
+    return MAGIC + bytes((VERSION, flags)) + payload
+
+
+def decode(raw: Union[bytes, str]) -> Any:
+    """Inverse of `encode`; plain JSON written before this codec existed is still readable."""
+    if isinstance(raw, str):
+        return orjson.loads(raw)
+    if not raw.startswith(MAGIC):
+        return orjson.loads(raw)
+    version, flags = raw[1], raw[2]
+    if version != VERSION:
+        raise ValueError(f"Unsupported codec version {version}")
+    payload = raw[3:]
+    if flags & FLAG_ZSTD:
+        payload = _decompressor().decompress(payload)
+    return ormsgpack.unpackb(payload)
+
+
+if __name__ == "__main__":
+    # Size and encode/decode cost vs the previous json.dumps storage
+    import json
+    import timeit
+
+    essay = (
+        "Day 1: Arrive in Jaipur, check in near MI Road and spend the evening at Nahargarh Fort for sunset. "
+        "Dinner at a rooftop restaurant in the old city; budget about ₹1,500 for two. "
+        "Day 2: Amber Fort early to beat the crowds, then Jal Mahal, Hawa Mahal and City Palace. "
+        "Transport: book an Ola/Uber for the day (~₹2,000) or take the hop-on bus. "
+    ) * 12
+    samples = {
+        "short memory": {"text": "Q: weather in Goa?\nA: Warm and dry, 31°C.", "metadata": {"intent": "weather"}},
+        "agent essay": {"text": f"Q: plan Jaipur\nA: {essay}", "metadata": {"intent": "itinerary", "user_id": "u1"}},
+        "crew output": {"raw": essay, "json_dict": None},
+    }
+    n = 2000
+    for name, value in samples.items():
+        legacy = json.dumps(value).encode("utf-8")
+        packed = encode(value)
+        assert decode(packed) == value and decode(legacy) == value
+        enc = timeit.timeit(lambda: encode(value), number=n) / n * 1e6
+        dec = timeit.timeit(lambda: decode(packed), number=n) / n * 1e6
+        json_enc = timeit.timeit(lambda: json.dumps(value), number=n) / n * 1e6
+        json_dec = timeit.timeit(lambda: json.loads(legacy), number=n) / n * 1e6
+        print(f"{name:>12}: {len(legacy):>6} B json -> {len(packed):>5} B ({len(legacy) / len(packed):.1f}x) | "
+              f"encode {enc:.1f} µs (json {json_enc:.1f}) | decode {dec:.1f} µs (json {json_dec:.1f})")
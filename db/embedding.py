@@ -1,15 +1,15 @@
 # db/embeddings.py
-from langchain.embeddings import HuggingFaceEmbeddings
+from db.embedding_service import get_embedding_service
 
 class MiniLMEmbedder:
     def __init__(self):
-        # all-MiniLM embeddings
-        self.embedder = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        # all-MiniLM embeddings, served by the process-wide batching service (one model per process)
+        self.service = get_embedding_service()
 
     def embed_text(self, text: str):
         """Return embedding vector for a single string"""
-        return self.embedder.embed_query(text)
+        return self.service.embed(text)
 
     def embed_texts(self, texts: list[str]):
         """Return embedding vectors for a list of strings"""
-        return self.embedder.embed_documents(texts)
+        return self.service.embed_many(texts)
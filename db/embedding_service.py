@@ -0,0 +1,187 @@
+# db/embedding_service.py
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.setting import (
+    EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBED_BATCH_SIZE, EMBED_BATCH_WAIT_MS, EMBED_CACHE_TTL, EMBED_CACHE_MAX_ENTRIES,
+)
+from db.cache import TieredCache, hash_key
+
+
+def _pack(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _unpack(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype=np.float32)
+
+
+# Packed float32 vectors keyed by (model, backend, text) hash
+embedding_cache = TieredCache(
+    "embedding", ttl=EMBED_CACHE_TTL, max_entries=EMBED_CACHE_MAX_ENTRIES, encode=_pack, decode=_unpack,
+)
+
+
+def _huggingface_encoder(model_name: str):
+    from langchain.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=model_name).embed_documents
+
+
+def _onnx_encoder(model_name: str):
+    from db.onnx_embedding import OnnxMiniLM
+    return OnnxMiniLM().embed_documents
+
+
+ENCODERS = {"huggingface": _huggingface_encoder, "onnx": _onnx_encoder}
+
+
+class EmbeddingService:
+    """
+    One embedding model per process, shared by every caller.
+
+    The model is loaded on the first request. Concurrent `embed`/`embed_many`
+    calls are queued and encoded together by a single worker thread in
+    micro-batches of up to `batch_size` texts, waiting at most `max_wait_ms`
+    for a batch to fill. Vectors are cached by (model, backend, text) hash as packed
+    float32 in the tiered cache, so repeated texts are never re-encoded.
+    `backend` picks the encoder (EMBEDDING_BACKEND: "huggingface" or "onnx").
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, batch_size: int = EMBED_BATCH_SIZE,
+                 max_wait_ms: float = EMBED_BATCH_WAIT_MS, cache: TieredCache = embedding_cache,
+                 encoder_factory: Optional[Callable[[str], Callable[[List[str]], Sequence]]] = None,
+                 backend: str = EMBEDDING_BACKEND):
+        if encoder_factory is None and backend not in ENCODERS:
+            raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {sorted(ENCODERS)}")
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.cache = cache
+        self._encoder_factory = encoder_factory or ENCODERS[backend]
+        self._encoder = None
+        self._queue: "queue.Queue[Tuple[str, str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batch_sizes: Counter = Counter()
+        self.encoded = 0
+        self.encode_seconds = 0.0
+
+    # -------------------
+    # Public API
+    # -------------------
+    def embed(self, text: str) -> List[float]:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        # Backends agree only within a tolerance, so their vectors are cached separately
+        keys = [hash_key(self.model_name, self.backend, text) for text in texts]
+        vectors: Dict[str, Any] = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        pending: Dict[str, Future] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in pending:
+                pending[key] = self._submit(key, text)
+        for key, future in pending.items():
+            vectors[key] = future.result()
+        return [vectors[key].tolist() for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        batches = sum(self.batch_sizes.values())
+        return {
+            "batches": batches,
+            "encoded": self.encoded,
+            "mean_batch_size": round(self.encoded / batches, 2) if batches else 0.0,
+            "max_batch_size": max(self.batch_sizes, default=0),
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "encode_ms_per_text": round(1000 * self.encode_seconds / self.encoded, 3) if self.encoded else 0.0,
+            "cache": self.cache.stats(),
+        }
+
+    # -------------------
+    # Batching worker
+    # -------------------
+    def _submit(self, key: str, text: str) -> Future:
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((key, text, future))
+        return future
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[Tuple[str, str, Future]]):
+        texts: Dict[str, str] = {}
+        waiters: Dict[str, List[Future]] = {}
+        for key, text, future in batch:
+            texts.setdefault(key, text)
+            waiters.setdefault(key, []).append(future)
+
+        try:
+            if self._encoder is None:
+                self._encoder = self._encoder_factory(self.model_name)
+            start = time.perf_counter()
+            raw = self._encoder(list(texts.values()))
+            self.encode_seconds += time.perf_counter() - start
+        except Exception as e:
+            for futures in waiters.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(texts, raw)}
+        self.batch_sizes[len(texts)] += 1
+        self.encoded += len(texts)
+        self.cache.set_many(vectors)
+        for key, futures in waiters.items():
+            for future in futures:
+                future.set_result(vectors[key])
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide EmbeddingService; the model itself loads on the first embedding request."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService()
+    return _service
+
+
+if __name__ == "__main__":
+    # Concurrency check: 8 threads embedding overlapping texts
+    from concurrent.futures import ThreadPoolExecutor
+
+    service = get_embedding_service()
+    texts = [f"trip idea {i % 40}: beaches, food and hikes" for i in range(400)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(service.embed, texts))
+    print(f"{len(texts)} embeds in {time.perf_counter() - start:.2f}s")
+    print(service.stats())
@@ -0,0 +1,160 @@
+# db/maintenance.py
+import re
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterable, List, Optional
+
+# Glob metacharacters in a literal prefix must be escaped for SCAN MATCH
+_GLOB_CHARS = re.compile(r"([*?\[\]\\])")
+
+
+def glob_escape(text: str) -> str:
+    return _GLOB_CHARS.sub(r"\\\1", text)
+
+
+@dataclass
+class PurgeReport:
+    pattern: str
+    scanned: int = 0
+    matched: int = 0
+    deleted: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    dry_run: bool = False
+
+    def __str__(self):
+        verb = "would delete" if self.dry_run else "deleted"
+        return (f"{self.pattern}: scanned {self.scanned}, matched {self.matched}, {verb} "
+                f"{self.matched if self.dry_run else self.deleted} in {self.batches} batches ({self.seconds:.1f}s)")
+
+
+def _client():
+    from db.redis_client import get_redis
+    return get_redis()
+
+
+def _idle_filter(client, keys: List[bytes], min_idle: float) -> List[bytes]:
+    """Keys not read or written for at least `min_idle` seconds (OBJECT IDLETIME, one pipeline)."""
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.object("idletime", key)
+    idle = pipe.execute(raise_on_error=False)
+    return [k for k, t in zip(keys, idle) if isinstance(t, int) and t >= min_idle]
+
+
+def purge(pattern: str, client=None, batch_size: int = 500, dry_run: bool = False,
+          min_idle: Optional[float] = None, pause: float = 0.01,
+          progress: Optional[Callable[[PurgeReport], None]] = print) -> PurgeReport:
+    """
+    Delete keys matching a SCAN pattern in batches.
+
+    SCAN walks the keyspace incrementally and each batch is removed with one
+    pipelined UNLINK (memory is reclaimed off the main thread), with a short
+    `pause` between batches so live traffic is never starved. `min_idle`
+    restricts deletion to keys idle for that many seconds. Never FLUSHDB.
+    """
+    if pattern in ("", "*"):
+        raise ValueError("Refusing to purge every key; give a session, user or prefix")
+    client = client or _client()
+    report = PurgeReport(pattern=pattern, dry_run=dry_run)
+    start = time.perf_counter()
+
+    def flush(keys: List[bytes]):
+        if min_idle is not None:
+            keys = _idle_filter(client, keys, min_idle)
+        report.matched += len(keys)
+        report.batches += 1
+        if keys and not dry_run:
+            pipe = client.pipeline(transaction=False)
+            for i in range(0, len(keys), 100):
+                pipe.unlink(*keys[i:i + 100])
+            report.deleted += sum(pipe.execute())
+        report.seconds = time.perf_counter() - start
+        if progress:
+            progress(report)
+        if pause:
+            time.sleep(pause)
+
+    pending: List[bytes] = []
+    for key in client.scan_iter(match=pattern, count=batch_size):
+        report.scanned += 1
+        pending.append(key)
+        if len(pending) >= batch_size:
+            flush(pending)
+            pending = []
+    if pending:
+        flush(pending)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def purge_prefix(prefix: str, **kwargs) -> PurgeReport:
+    if not prefix:
+        raise ValueError("Prefix must not be empty")
+    return purge(glob_escape(prefix) + "*", **kwargs)
+
+
+def purge_session(session_id: str, **kwargs) -> PurgeReport:
+    """Conversation memory of one session: documents, key list and running summary."""
+    return purge_prefix(f"{session_id}:", **kwargs)
+
+
+def purge_user(user_id: str, dry_run: bool = False, **kwargs) -> List[PurgeReport]:
+    """Everything stored for a user: Redis memory plus the on-disk semantic memory index."""
+    report = purge_session(user_id, dry_run=dry_run, **kwargs)
+    if not dry_run:
+        from db.vector_memory import get_vector_memory
+        get_vector_memory().clear(user_id)
+    return [report]
+
+
+def purge_cache(namespaces: Iterable[str] = (), **kwargs) -> List[PurgeReport]:
+    """Cached LLM/search/route/embedding results (`cache:<namespace>:*`); all namespaces if none given."""
+    namespaces = list(namespaces)
+    if not namespaces:
+        return [purge_prefix("cache:", **kwargs)]
+    return [purge_prefix(f"cache:{ns}:", **kwargs) for ns in namespaces]
+
+
+def _duration(value: str) -> float:
+    """'90', '45m', '12h', '7d' -> seconds."""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    value = value.strip().lower()
+    if value[-1:] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+if __name__ == "__main__":
+    # python -m db.maintenance {session,user,prefix,cache,vectors} ... [--dry-run] [--idle 7d]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Purge Redis keys in batches without blocking the server.")
+    parser.add_argument("target", choices=["session", "user", "prefix", "cache", "vectors"])
+    parser.add_argument("names", nargs="*", help="session/user ids, key prefixes or cache namespaces")
+    parser.add_argument("--dry-run", action="store_true", help="count matching keys, delete nothing")
+    parser.add_argument("--idle", type=_duration, help="only keys untouched for this long, e.g. 7d or 12h")
+    parser.add_argument("--batch", type=int, default=500, help="keys per SCAN/UNLINK batch")
+    parser.add_argument("--pause", type=float, default=0.01, help="seconds to sleep between batches")
+    args = parser.parse_args()
+
+    options = dict(dry_run=args.dry_run, min_idle=args.idle, batch_size=args.batch, pause=args.pause,
+                   progress=lambda r: print(f"  {r}", end="\r"))
+    reports: List[PurgeReport] = []
+    if args.target == "vectors":
+        from db.vector_memory import get_vector_memory
+        print(f"Removed {get_vector_memory().sweep()} fully expired semantic memory sessions")
+    elif args.target == "cache":
+        reports = purge_cache(args.names, **options)
+    elif not args.names:
+        parser.error(f"{args.target} needs at least one name")
+    else:
+        for name in args.names:
+            if args.target == "session":
+                reports.append(purge_session(name, **options))
+            elif args.target == "user":
+                reports.extend(purge_user(name, **options))
+            else:
+                reports.append(purge_prefix(name, **options))
+    for report in reports:
+        print(report)
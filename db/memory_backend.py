@@ -0,0 +1,407 @@
+# db/memory_backend.py
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config.setting import (
+    MEMORY_BACKEND, MEMORY_TTL,
+    MEMORY_LRU_MAX_ENTRIES, MEMORY_LRU_MAX_BYTES, MEMORY_LRU_TTL, MEMORY_REMOTE_RETRY,
+)
+from db import codec
+
+# (doc_id, text, metadata) on write; (key, text, metadata) on read, newest first
+Memory = Tuple[str, str, dict]
+# (key, text, metadata, seconds left before it expires; None when the store can't tell)
+TimedMemory = Tuple[str, str, dict, Optional[float]]
+
+
+class MemoryBackend(ABC):
+    """Storage for per-session conversation memory and its running summary."""
+
+    @abstractmethod
+    def add_memories(self, session_id: str, memories: List[Memory], ttl: int, max_items: int):
+        """Prepend memories (last one newest), keep the newest `max_items`, expire everything after `ttl`."""
+
+    @abstractmethod
+    def list_memories(self, session_id: str, start: int = 0, stop: int = -1) -> List[Memory]:
+        """(key, text, metadata) for an inclusive range of the session's memories, newest first."""
+
+    @abstractmethod
+    def get_summary(self, session_id: str) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    def set_summary(self, session_id: str, text: str, folded_until: str, ttl: int):
+        ...
+
+    @abstractmethod
+    def clear_session(self, session_id: str):
+        ...
+
+    def snapshot(self, session_id: str) -> Tuple[List[TimedMemory], Dict[str, str], Optional[float]]:
+        """All of a session's memories and its summary, each with its remaining TTL."""
+        memories = [(key, text, meta, None) for key, text, meta in self.list_memories(session_id, 0, -1)]
+        return memories, self.get_summary(session_id), None
+
+
+def _doc_key(session_id: str, doc_id: str) -> str:
+    return f"{session_id}:{doc_id}"
+
+
+def _slice(items: list, start: int, stop: int) -> list:
+    """Python slice with Redis LRANGE semantics (inclusive stop, -1 = end)."""
+    return items[start:] if stop == -1 else items[start:stop + 1]
+
+
+# -------------------
+# Redis
+# -------------------
+class RedisMemoryBackend(MemoryBackend):
+    """
+    A `<session>:turns` list of the documents themselves (db.codec: msgpack,
+    zstd when large), each with its key and absolute expiry, and a
+    `<session>:summary` hash. Every read is one pipeline, so one round trip:
+    LRANGE (+ HGETALL and PTTL of the summary); expired entries are skipped.
+    Every command touches one key, so it also runs on Redis Cluster.
+
+    Sessions written before this layout (a `<session>:memories` list of
+    `<session>:<doc_id>` strings) are still read, with a second round trip,
+    until they expire.
+    """
+
+    def __init__(self, client=None):
+        if client is None:
+            from db.redis_client import get_redis
+            client = get_redis()
+        self.r = client
+
+    @staticmethod
+    def _turns_key(session_id: str) -> str:
+        return f"{session_id}:turns"
+
+    @staticmethod
+    def _list_key(session_id: str) -> str:
+        return f"{session_id}:memories"  # legacy layout
+
+    @staticmethod
+    def _summary_key(session_id: str) -> str:
+        return f"{session_id}:summary"
+
+    def add_memories(self, session_id: str, memories: List[Memory], ttl: int, max_items: int):
+        turns_key = self._turns_key(session_id)
+        expires = time.time() + ttl
+        items = [
+            codec.encode({"key": _doc_key(session_id, doc_id), "text": text, "metadata": metadata, "expires": expires})
+            for doc_id, text, metadata in memories
+        ]
+        pipe = self.r.pipeline(transaction=False)
+        pipe.lpush(turns_key, *items)
+        pipe.ltrim(turns_key, 0, max_items - 1)
+        pipe.expire(turns_key, ttl)
+        pipe.execute()
+
+    def _read(self, session_id: str, start: int, stop: int, with_summary: bool) -> Tuple[List[TimedMemory], list]:
+        """The range of memories, plus [summary hash, summary PTTL] when asked; one round trip."""
+        pipe = self.r.pipeline(transaction=False)
+        pipe.lrange(self._turns_key(session_id), start, stop)
+        pipe.exists(self._list_key(session_id))
+        if with_summary:
+            pipe.hgetall(self._summary_key(session_id))
+            pipe.pttl(self._summary_key(session_id))
+        raw_turns, legacy, *summary = pipe.execute()
+        if legacy:
+            raw_turns = self.r.lrange(self._turns_key(session_id), 0, -1)
+            memories = _slice(self._turns(raw_turns) + self._legacy(session_id), start, stop)
+        else:
+            memories = self._turns(raw_turns)
+        return memories, summary
+
+    @staticmethod
+    def _turns(raw_turns: list) -> List[TimedMemory]:
+        now = time.time()
+        memories = []
+        for raw in raw_turns:
+            data = codec.decode(raw)
+            if data["expires"] > now:
+                memories.append((data["key"], data["text"], data["metadata"], data["expires"] - now))
+        return memories
+
+    def _legacy(self, session_id: str) -> List[TimedMemory]:
+        doc_ids = self.r.lrange(self._list_key(session_id), 0, -1)
+        pipe = self.r.pipeline(transaction=False)
+        for doc_id in doc_ids:
+            pipe.get(doc_id)
+            pipe.pttl(doc_id)
+        replies = pipe.execute() if doc_ids else []
+        memories = []
+        for doc_id, raw, pttl in zip(doc_ids, replies[0::2], replies[1::2]):
+            if raw:  # documents can expire before the list does
+                data = codec.decode(raw)
+                memories.append((doc_id.decode("utf-8"), data["text"], data["metadata"], self._remaining(pttl)))
+        return memories
+
+    @staticmethod
+    def _remaining(pttl: int) -> Optional[float]:
+        # -1: no expiry, -2: already gone
+        return pttl / 1000 if pttl >= 0 else None
+
+    @staticmethod
+    def _decode_summary(raw: dict) -> Dict[str, str]:
+        return {k.decode("utf-8"): v.decode("utf-8") for k, v in raw.items()}
+
+    def list_memories(self, session_id: str, start: int = 0, stop: int = -1) -> List[Memory]:
+        memories, _ = self._read(session_id, start, stop, with_summary=False)
+        return [(key, text, meta) for key, text, meta, _ in memories]
+
+    def snapshot(self, session_id: str) -> Tuple[List[TimedMemory], Dict[str, str], Optional[float]]:
+        memories, (raw_summary, summary_pttl) = self._read(session_id, 0, -1, with_summary=True)
+        return memories, self._decode_summary(raw_summary), self._remaining(summary_pttl)
+
+    def get_summary(self, session_id: str) -> Dict[str, str]:
+        return self._decode_summary(self.r.hgetall(self._summary_key(session_id)))
+
+    def set_summary(self, session_id: str, text: str, folded_until: str, ttl: int):
+        pipe = self.r.pipeline(transaction=True)
+        pipe.hset(self._summary_key(session_id), mapping={"text": text, "folded_until": folded_until})
+        pipe.expire(self._summary_key(session_id), ttl)
+        pipe.execute()
+
+    def clear_session(self, session_id: str):
+        list_key = self._list_key(session_id)
+        pipe = self.r.pipeline(transaction=False)
+        for key in (*self.r.lrange(list_key, 0, -1), list_key, self._turns_key(session_id), self._summary_key(session_id)):
+            pipe.unlink(key)
+        pipe.execute()
+
+
+# -------------------
+# In-process
+# -------------------
+@dataclass
+class _Session:
+    items: List[Tuple[str, str, dict, float]] = field(default_factory=list)  # newest first, with expiry
+    summary: Dict[str, str] = field(default_factory=dict)
+    summary_expires: float = 0.0
+    n_entries: int = 0
+    nbytes: int = 0
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+def _size(text: str, metadata: dict) -> int:
+    return len(text.encode("utf-8")) + len(json.dumps(metadata, default=str))
+
+
+class InMemoryBackend(MemoryBackend):
+    """
+    Process-local memory with the same semantics as Redis (TTL, trimming).
+    Used on its own for local/dev/test (MEMORY_BACKEND=memory) and as the LRU
+    tier of CachedMemoryBackend, where `max_entries`/`max_bytes` bound it and
+    least recently used sessions are evicted whole.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.entries = 0
+        self.nbytes = 0
+
+    def _session(self, session_id: str, create: bool = False) -> Optional[_Session]:
+        session = self._sessions.get(session_id)
+        if session is None and create:
+            session = self._sessions[session_id] = _Session()
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def _account(self, session: _Session, items: list):
+        session.items = items
+        nbytes = sum(_size(text, meta) for _, text, meta, _ in items)
+        nbytes += sum(len(v) for v in session.summary.values())
+        self.entries += len(items) - session.n_entries
+        self.nbytes += nbytes - session.nbytes
+        session.n_entries, session.nbytes = len(items), nbytes
+
+    def _evict(self, keep: Optional[str] = None):
+        while self._sessions and (
+            (self.max_entries is not None and self.entries > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._sessions))
+            if oldest == keep and len(self._sessions) == 1:
+                break
+            self._drop(oldest)
+
+    def _drop(self, session_id: str):
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self.entries -= session.n_entries
+            self.nbytes -= session.nbytes
+
+    def has(self, session_id: str, max_age: Optional[float] = None) -> bool:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            return max_age is None or time.monotonic() - session.loaded_at < max_age
+
+    def load(self, session_id: str, memories: List[TimedMemory], summary: Dict[str, str],
+             summary_ttl: Optional[float], ttl: int):
+        """
+        Replace a session with a snapshot read from another backend. Entries
+        keep their remaining TTL there; `ttl` stands in where it is unknown.
+        """
+        now = time.time()
+        with self._lock:
+            self._drop(session_id)
+            session = self._session(session_id, create=True)
+            session.summary = dict(summary)
+            session.summary_expires = now + (ttl if summary_ttl is None else summary_ttl) if summary else 0.0
+            self._account(session, [
+                (key, text, meta, now + (ttl if remaining is None else remaining))
+                for key, text, meta, remaining in memories
+            ])
+            self._evict(keep=session_id)
+
+    def add_memories(self, session_id: str, memories: List[Memory], ttl: int, max_items: int):
+        expires = time.time() + ttl
+        new = [(_doc_key(session_id, doc_id), text, meta, expires) for doc_id, text, meta in reversed(memories)]
+        with self._lock:
+            session = self._session(session_id, create=True)
+            self._account(session, (new + session.items)[:max_items])
+            self._evict(keep=session_id)
+
+    def list_memories(self, session_id: str, start: int = 0, stop: int = -1) -> List[Memory]:
+        now = time.time()
+        with self._lock:
+            session = self._session(session_id)
+            if session is None:
+                return []
+            live = [item for item in session.items if item[3] > now]
+            if len(live) != len(session.items):
+                self._account(session, live)
+            return [(key, text, meta) for key, text, meta, _ in _slice(live, start, stop)]
+
+    def get_summary(self, session_id: str) -> Dict[str, str]:
+        with self._lock:
+            session = self._session(session_id)
+            if session is None or session.summary_expires <= time.time():
+                return {}
+            return dict(session.summary)
+
+    def set_summary(self, session_id: str, text: str, folded_until: str, ttl: int):
+        with self._lock:
+            session = self._session(session_id, create=True)
+            session.summary = {"text": text, "folded_until": folded_until}
+            session.summary_expires = time.time() + ttl
+            self._account(session, session.items)
+            self._evict(keep=session_id)
+
+    def clear_session(self, session_id: str):
+        with self._lock:
+            self._drop(session_id)
+
+
+# -------------------
+# Two-tier
+# -------------------
+class CachedMemoryBackend(MemoryBackend):
+    """
+    Write-through in-process LRU in front of another backend (Redis).
+
+    A session is read from the backing store once, then served locally and
+    kept current by this process's own writes; it is re-read after `max_age`
+    seconds so writes from other processes show up eventually. Loaded entries
+    keep the TTL they have left in the backing store. Backing-store errors are
+    logged and treated like a cold cache, so a Redis outage degrades memory to
+    this process instead of failing the request; after one, the backing store
+    is left alone for `retry_after` seconds rather than costing every call a
+    connect timeout.
+    """
+
+    def __init__(self, inner: MemoryBackend, max_entries: int = MEMORY_LRU_MAX_ENTRIES,
+                 max_bytes: int = MEMORY_LRU_MAX_BYTES, max_age: float = MEMORY_LRU_TTL, ttl: int = MEMORY_TTL,
+                 retry_after: float = MEMORY_REMOTE_RETRY):
+        self.inner = inner
+        self.local = InMemoryBackend(max_entries=max_entries, max_bytes=max_bytes)
+        self.max_age = max_age
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self.local_hits = 0
+        self.remote_reads = 0
+        self.remote_errors = 0
+        self.remote_skipped = 0
+
+    def _remote(self, action: str, call, default=None):
+        if time.monotonic() < self._down_until:
+            self.remote_skipped += 1
+            return default
+        try:
+            return call()
+        except Exception as e:
+            self.remote_errors += 1
+            self._down_until = time.monotonic() + self.retry_after
+            print(f"Memory backend {action} failed, using local memory only for {self.retry_after:g}s: {e}")
+            return default
+
+    def _ensure_loaded(self, session_id: str):
+        if self.local.has(session_id, self.max_age):
+            self.local_hits += 1
+            return
+        self.remote_reads += 1
+        snapshot = self._remote("read", lambda: self.inner.snapshot(session_id))
+        if snapshot is None:
+            if not self.local.has(session_id):
+                self.local.load(session_id, [], {}, None, self.ttl)
+            return
+        self.local.load(session_id, *snapshot, self.ttl)
+
+    def add_memories(self, session_id: str, memories: List[Memory], ttl: int, max_items: int):
+        self._remote("write", lambda: self.inner.add_memories(session_id, memories, ttl, max_items))
+        if self.local.has(session_id):
+            self.local.add_memories(session_id, memories, ttl, max_items)
+
+    def list_memories(self, session_id: str, start: int = 0, stop: int = -1) -> List[Memory]:
+        self._ensure_loaded(session_id)
+        return self.local.list_memories(session_id, start, stop)
+
+    def get_summary(self, session_id: str) -> Dict[str, str]:
+        self._ensure_loaded(session_id)
+        return self.local.get_summary(session_id)
+
+    def set_summary(self, session_id: str, text: str, folded_until: str, ttl: int):
+        self._remote("write", lambda: self.inner.set_summary(session_id, text, folded_until, ttl))
+        if self.local.has(session_id):
+            self.local.set_summary(session_id, text, folded_until, ttl)
+
+    def clear_session(self, session_id: str):
+        self.local.clear_session(session_id)
+        self._remote("clear", lambda: self.inner.clear_session(session_id))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "local_hits": self.local_hits,
+            "remote_reads": self.remote_reads,
+            "remote_errors": self.remote_errors,
+            "remote_skipped": self.remote_skipped,
+            "sessions": len(self.local._sessions),
+            "entries": self.local.entries,
+            "bytes": self.local.nbytes,
+        }
+
+
+def create_memory_backend(kind: str = MEMORY_BACKEND) -> MemoryBackend:
+    if kind == "memory":
+        return InMemoryBackend()
+    if kind == "redis":
+        redis_backend = RedisMemoryBackend()
+        if MEMORY_LRU_TTL <= 0:
+            return redis_backend
+        return CachedMemoryBackend(redis_backend)
+    raise ValueError(f"Unknown MEMORY_BACKEND {kind!r}; expected 'redis' or 'memory'")
@@ -0,0 +1,153 @@
+# db/memory_compaction.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+from config.setting import MEMORY_CONTEXT_TOKENS, MEMORY_RECENT_TURNS, MEMORY_TURN_TOKENS, MEMORY_SUMMARY_TOKENS
+from db.memory_store import list_memories, get_summary, set_summary
+from utils.tokens import count_tokens, truncate_to_tokens, fit_to_budget
+
+SUMMARY_PROMPT = """You maintain a running summary of a travel-planning conversation.
+Fold the new turns into the existing summary. Keep every concrete fact the traveller
+gave or agreed to (places, dates, budget, travellers, preferences, bookings, decisions)
+and drop pleasantries and long agent explanations. Write at most {max_words} words of
+plain text, no headings.
+
+Existing summary:
+{summary}
+
+New turns (oldest first):
+{turns}
+
+Updated summary:"""
+
+
+def _llm_summarize(summary: str, turns: List[str], max_tokens: int) -> str:
+    from model import get_llm
+    prompt = SUMMARY_PROMPT.format(
+        max_words=int(max_tokens * 0.75), summary=summary or "(none yet)", turns="\n\n".join(turns),
+    )
+    return str(get_llm("summary").call([{"role": "user", "content": prompt}])).strip()
+
+_SUMMARY_HEADER = "Summary of earlier conversation:\n"
+_RELEVANT_HEADER = "Relevant earlier turns:\n"
+_RECENT_HEADER = "Recent turns (oldest first):\n"
+_SECTION_SEPARATOR = "\n\n"
+
+
+class MemoryCompactor:
+    """
+    Keeps prompts small as a conversation grows.
+
+    The newest `recent_turns` turns are injected verbatim; older turns are
+    folded into a running per-session summary by a background worker
+    (`schedule`), never on the request path. `build_context` assembles
+    recent turns, the summary and any semantically recalled turns, capped
+    at `context_tokens` tiktoken tokens, in that order of priority.
+    """
+
+    def __init__(self, recent_turns: int = MEMORY_RECENT_TURNS, context_tokens: int = MEMORY_CONTEXT_TOKENS,
+                 turn_tokens: int = MEMORY_TURN_TOKENS, summary_tokens: int = MEMORY_SUMMARY_TOKENS,
+                 summarize: Optional[Callable[[str, List[str], int], str]] = None):
+        self.recent_turns = recent_turns
+        self.context_tokens = context_tokens
+        self.turn_tokens = turn_tokens
+        self.summary_tokens = summary_tokens
+        self._summarize = summarize or _llm_summarize
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-compaction")
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self.last_context_tokens = 0
+
+    # -------------------
+    # Request path
+    # -------------------
+    def build_context(self, session_id: str, relevant: Sequence[str] = ()) -> str:
+        """Past context for a prompt, at most `context_tokens` tokens."""
+        recent = list_memories(session_id, 0, self.recent_turns - 1) if self.recent_turns > 0 else []
+        recent_texts = [truncate_to_tokens(text, self.turn_tokens) for _, text, _ in recent]  # newest first
+        summary = get_summary(session_id).get("text", "")
+        seen = {text for _, text, _ in recent}
+        relevant = [truncate_to_tokens(text, self.turn_tokens) for text in relevant if text not in seen]
+
+        # Section headers and the blank lines between sections come out of the same budget
+        budget = self.context_tokens
+        used = 0
+
+        def fit(parts: List[str], header: str) -> List[str]:
+            nonlocal used
+            overhead = count_tokens(header) + (count_tokens(_SECTION_SEPARATOR) if used else 0)
+            kept, cost = fit_to_budget(parts, budget - used - overhead) if parts else ([], 0)
+            if kept:
+                used += cost + overhead
+            return kept
+
+        kept_recent = fit(recent_texts, _RECENT_HEADER)
+        kept_summary = fit([summary] if summary else [], _SUMMARY_HEADER)
+        kept_relevant = fit(relevant, _RELEVANT_HEADER)
+
+        sections = []
+        if kept_summary:
+            sections.append(_SUMMARY_HEADER + kept_summary[0])
+        if kept_relevant:
+            sections.append(_RELEVANT_HEADER + "\n".join(kept_relevant))
+        if kept_recent:
+            sections.append(_RECENT_HEADER + "\n".join(reversed(kept_recent)))
+        context = _SECTION_SEPARATOR.join(sections)
+        if count_tokens(context) > budget:
+            # Tokens can merge differently across joins; never hand back more than the cap
+            context = truncate_to_tokens(context, budget)
+        self.last_context_tokens = count_tokens(context)
+        return context
+
+    # -------------------
+    # Background compaction
+    # -------------------
+    def schedule(self, session_id: str):
+        """Fold turns that left the recent window into the summary, off the request path."""
+        with self._lock:
+            if session_id in self._pending:
+                return
+            self._pending.add(session_id)
+        self._pool.submit(self._compact_safely, session_id)
+
+    def _compact_safely(self, session_id: str):
+        try:
+            self.compact(session_id)
+        except Exception as e:
+            print(f"Memory compaction failed for {session_id}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(session_id)
+
+    def compact(self, session_id: str) -> bool:
+        """Summarise older, not yet folded turns. Returns True if the summary changed."""
+        older = list_memories(session_id, self.recent_turns, -1)  # newest first
+        state = get_summary(session_id)
+        folded_until = state.get("folded_until", "")
+        new_turns = [
+            (meta.get("timestamp", ""), text) for _, text, meta in older
+            if not folded_until or meta.get("timestamp", "") > folded_until
+        ]
+        if not new_turns:
+            return False
+        new_turns.reverse()  # oldest first
+
+        turns = [truncate_to_tokens(text, self.turn_tokens) for _, text in new_turns]
+        summary = self._summarize(state.get("text", ""), turns, self.summary_tokens)
+        newest = max((ts for ts, _ in new_turns), default="") or folded_until
+        set_summary(session_id, truncate_to_tokens(summary, self.summary_tokens), newest)
+        return True
+
+
+_compactor: Optional[MemoryCompactor] = None
+_compactor_lock = threading.Lock()
+
+
+def get_memory_compactor() -> MemoryCompactor:
+    global _compactor
+    if _compactor is None:
+        with _compactor_lock:
+            if _compactor is None:
+                _compactor = MemoryCompactor()
+    return _compactor
@@ -1,42 +1,72 @@
 # db/memory_store.py
-import redis
-import json
-
-# Connect to Redis
-r = redis.Redis(host="localhost", port=6379, db=0, decode_responses=True)
-
-def add_memory(session_id: str, doc_id: str, text: str, metadata: dict, ttl: int = 3600):
-    """Store memory for a specific session in Redis with TTL (auto-delete)."""
-    key = f"{session_id}:{doc_id}"
-    data = {
-        "text": text,
-        "metadata": metadata
-    }
-    r.setex(key, ttl, json.dumps(data))  # auto-delete after ttl
-    r.lpush(f"{session_id}:memories", key)
-    r.expire(f"{session_id}:memories", ttl)  # expire the list too
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.setting import MEMORY_TTL, MEMORY_MAX_ITEMS
+from db.memory_backend import MemoryBackend, create_memory_backend
+
+# (doc_id, text, metadata)
+Memory = Tuple[str, str, dict]
+
+_backend: Optional[MemoryBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_memory_backend() -> MemoryBackend:
+    """Backend chosen by MEMORY_BACKEND, created on first use (nothing connects at import)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_memory_backend()
+    return _backend
+
+
+def set_memory_backend(backend: MemoryBackend):
+    """Swap the backend, e.g. InMemoryBackend() for local runs and experiments."""
+    global _backend
+    _backend = backend
+
 
+def add_memories(session_id: str, memories: Iterable[Memory], ttl: int = MEMORY_TTL,
+                 max_items: int = MEMORY_MAX_ITEMS):
+    """
+    Store a batch of memories for a session in one round trip.
+    Each document expires after `ttl`; the session keeps the newest `max_items`.
+    """
+    memories = list(memories)
+    if memories:
+        get_memory_backend().add_memories(session_id, memories, ttl, max_items)
 
 
+def add_memory(session_id: str, doc_id: str, text: str, metadata: dict, ttl: int = MEMORY_TTL):
+    """Store memory for a specific session with TTL (auto-delete)."""
+    add_memories(session_id, [(doc_id, text, metadata)], ttl=ttl)
+
 
 def query_memory(session_id: str, top_k: int = 3):
     """Retrieve last `top_k` memories for a session."""
-    doc_ids = r.lrange(f"{session_id}:memories", 0, top_k - 1)
-    documents, metadatas = [], []
+    memories = list_memories(session_id, 0, top_k - 1) if top_k > 0 else []
+    return {
+        "documents": [[text for _, text, _ in memories]],
+        "metadatas": [[metadata for _, _, metadata in memories]],
+    }
+
+
+def list_memories(session_id: str, start: int = 0, stop: int = -1) -> List[Tuple[str, str, dict]]:
+    """(key, text, metadata) for a range of the session's memories, newest first; expired ones are skipped."""
+    return get_memory_backend().list_memories(session_id, start, stop)
 
-    for doc_id in doc_ids:
-        raw = r.get(doc_id)
-        if raw:
-            data = json.loads(raw)
-            documents.append(data["text"])
-            metadatas.append(data["metadata"])
 
-    return {"documents": [documents], "metadatas": [metadatas]}
+def get_summary(session_id: str) -> Dict[str, str]:
+    """Running summary of a session's older turns: {"text", "folded_until"} (empty if none)."""
+    return get_memory_backend().get_summary(session_id)
+
+
+def set_summary(session_id: str, text: str, folded_until: str, ttl: int = MEMORY_TTL):
+    get_memory_backend().set_summary(session_id, text, folded_until, ttl)
+
 
 def clear_session(session_id: str):
     """Delete all memory for a session manually."""
-    doc_ids = r.lrange(f"{session_id}:memories", 0, -1)
-    for doc_id in doc_ids:
-        r.delete(doc_id)
-    r.delete(f"{session_id}:memories")
-
+    get_memory_backend().clear_session(session_id)
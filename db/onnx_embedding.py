@@ -0,0 +1,191 @@
+# db/onnx_embedding.py
+import os
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from config.setting import EMBEDDING_MODEL, ONNX_MODEL_DIR, ONNX_MODEL_FILE, ONNX_THREADS, ONNX_MAX_LENGTH
+
+HF_REPO_ID = f"sentence-transformers/{EMBEDDING_MODEL}"
+TOKENIZER_FILE = "tokenizer.json"
+
+# Every ONNX vector must have cosine similarity >= 1 - COSINE_TOLERANCE with the
+# PyTorch vector for the same text (checked by `python -m db.onnx_embedding bench`).
+COSINE_TOLERANCE = 0.02
+
+
+class ModelNotDownloaded(FileNotFoundError):
+    """The ONNX model files are not in ONNX_MODEL_DIR; they are never fetched on the request path."""
+
+
+def missing_files(model_dir: str = ONNX_MODEL_DIR, model_file: str = ONNX_MODEL_FILE) -> List[str]:
+    return [path for path in (os.path.join(model_dir, model_file), os.path.join(model_dir, TOKENIZER_FILE))
+            if not os.path.exists(path)]
+
+
+def download_model(model_dir: str = ONNX_MODEL_DIR, model_file: str = ONNX_MODEL_FILE) -> str:
+    """
+    Fetch the quantized ONNX export and fast tokenizer of all-MiniLM-L6-v2 from
+    the Hugging Face Hub; a setup step: `python -m db.onnx_embedding download`.
+    """
+    from huggingface_hub import hf_hub_download
+    for filename in (model_file, TOKENIZER_FILE):
+        hf_hub_download(repo_id=HF_REPO_ID, filename=filename, local_dir=model_dir)
+    return os.path.join(model_dir, model_file)
+
+
+class OnnxMiniLM:
+    """
+    all-MiniLM-L6-v2 on ONNX Runtime (CPU) with the Rust `tokenizers` fast tokenizer.
+    Mirrors the sentence-transformers pipeline: mean pooling over the attention
+    mask followed by L2 normalisation, so vectors match the PyTorch path within
+    COSINE_TOLERANCE. The model files must already be in `model_dir`
+    (see `download_model`); ModelNotDownloaded is raised otherwise.
+    """
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, model_file: str = ONNX_MODEL_FILE,
+                 threads: int = ONNX_THREADS, max_length: int = ONNX_MAX_LENGTH):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        missing = missing_files(model_dir, model_file)
+        if missing:
+            raise ModelNotDownloaded(
+                f"ONNX embedding model not found ({', '.join(missing)}). Run `python -m db.onnx_embedding download` "
+                f"(or set ONNX_MODEL_DIR to a directory holding {model_file} and {TOKENIZER_FILE}), "
+                f"or use EMBEDDING_BACKEND=huggingface."
+            )
+        model_path = os.path.join(model_dir, model_file)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        with self._lock:  # the tokenizer's padding/truncation state is shared
+            encodings = self.tokenizer.encode_batch(list(texts))
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        hidden = self.session.run(None, feeds)[0]  # (batch, seq, dim)
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+# -------------------
+# Benchmark
+# -------------------
+BENCH_TEXTS = [
+    "Plan a 5 day trip from Delhi to Manali in December",
+    "Q: what's the weather in Goa next week?\nA: Expect warm, humid days around 31°C with little rain.",
+    "Cheap hotels near the beach in Varkala under 3000 rupees a night",
+    "How do I get from Bengaluru to Coorg by road and how long does it take?",
+    "Day 2: morning at Amber Fort, lunch in the old city, evening at Nahargarh for sunset.",
+    "We are 4 people travelling by train, budget ₹50k, looking for a relaxed itinerary",
+    "Best time of year to visit Leh Ladakh and what permits are required",
+    "Q: suggest a budget split\nA: Transport 30%, stay 35%, food 20%, activities 15%.",
+]
+
+
+def _measure(backend: str, out_path: str, repeats: int = 20) -> dict:
+    """Run in a fresh process so peak RSS belongs to one backend only."""
+    import resource
+    import time
+
+    if backend == "onnx" and missing_files():
+        download_model()  # the benchmark is a setup-time command; not timed
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if backend == "onnx":
+        encode = OnnxMiniLM().embed_documents
+    else:
+        from langchain.embeddings import HuggingFaceEmbeddings
+        encode = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL).embed_documents
+    load_s = time.perf_counter() - start
+    encode(BENCH_TEXTS[:1])  # warm-up
+
+    latencies = []
+    for _ in range(repeats):
+        for text in BENCH_TEXTS:
+            t0 = time.perf_counter()
+            encode([text])
+            latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+
+    batch = BENCH_TEXTS * 4  # 32 texts
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        vectors = encode(batch)
+    throughput = repeats * len(batch) / (time.perf_counter() - t0)
+
+    np.save(out_path, np.asarray(vectors[: len(BENCH_TEXTS)], dtype=np.float32))
+    return {
+        "backend": backend,
+        "load_s": round(load_s, 2),
+        "p50_ms": round(1000 * latencies[len(latencies) // 2], 2),
+        "p95_ms": round(1000 * latencies[int(len(latencies) * 0.95)], 2),
+        "texts_per_s": round(throughput, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "rss_growth_mb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024, 1),
+    }
+
+
+def bench(backends: Optional[List[str]] = None):
+    import json
+    import subprocess
+    import sys
+    import tempfile
+
+    backends = backends or ["huggingface", "onnx"]
+    vectors = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            out_path = os.path.join(tmp, f"{backend}.npy")
+            proc = subprocess.run(
+                [sys.executable, "-m", "db.onnx_embedding", "_measure", backend, out_path],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{backend}: failed\n{proc.stderr.strip()}")
+                continue
+            print(json.dumps(json.loads(proc.stdout.strip().splitlines()[-1])))
+            vectors[backend] = np.load(out_path)
+
+    if {"huggingface", "onnx"} <= set(vectors):
+        cosines = (vectors["huggingface"] * vectors["onnx"]).sum(axis=1)
+        ok = cosines.min() >= 1 - COSINE_TOLERANCE
+        print(f"cosine(onnx, huggingface): min {cosines.min():.4f}, mean {cosines.mean():.4f} "
+              f"-> {'within' if ok else 'OUTSIDE'} tolerance {COSINE_TOLERANCE}")
+
+
+if __name__ == "__main__":
+    # python -m db.onnx_embedding download | bench [backend ...]
+    import json
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "bench"
+    if command == "download":
+        print(download_model())
+    elif command == "_measure":
+        print(json.dumps(_measure(sys.argv[2], sys.argv[3])))
+    else:
+        bench(sys.argv[2:] or None)
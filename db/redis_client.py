@@ -0,0 +1,42 @@
+# db/redis_client.py
+import threading
+from typing import Dict
+
+from config.setting import (
+    REDIS_URL, REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD, REDIS_MAX_CONNECTIONS,
+    REDIS_CONNECT_TIMEOUT, REDIS_SOCKET_TIMEOUT, REDIS_HEALTH_CHECK_INTERVAL,
+)
+
+_pools: Dict[bool, object] = {}
+_lock = threading.Lock()
+
+
+def _pool(decode_responses: bool):
+    import redis
+    options = dict(
+        max_connections=REDIS_MAX_CONNECTIONS,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        retry_on_timeout=True,
+        decode_responses=decode_responses,
+    )
+    if REDIS_URL:
+        return redis.ConnectionPool.from_url(REDIS_URL, **options)
+    return redis.ConnectionPool(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD, **options)
+
+
+def get_redis(decode_responses: bool = False):
+    """
+    Redis client on the process-wide connection pool for this decode mode.
+    Nothing connects until the first command, so callers can create clients at
+    import time even when Redis is down.
+    """
+    import redis
+    pool = _pools.get(decode_responses)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(decode_responses)
+            if pool is None:
+                pool = _pools[decode_responses] = _pool(decode_responses)
+    return redis.Redis(connection_pool=pool)
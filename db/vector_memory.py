@@ -0,0 +1,287 @@
+# db/vector_memory.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config.setting import (
+    CHROMA_DB_DIR, MEMORY_TTL, MEMORY_MAX_ITEMS, MEMORY_MIN_SIMILARITY, MEMORY_LOADED_SESSIONS, TOP_K,
+)
+
+MEMORY_DIR = os.path.join(CHROMA_DB_DIR, "memory")
+
+# (doc_id, text, metadata)
+Memory = Tuple[str, str, dict]
+
+
+class _SessionIndex:
+    """Unit-normalised vectors of one session plus their documents and expiry times."""
+
+    def __init__(self, dim: int = 0):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.expires = np.zeros(0, dtype=np.float64)
+        self.doc_ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def keep(self, mask: np.ndarray):
+        self.vectors = self.vectors[mask]
+        self.expires = self.expires[mask]
+        idx = np.flatnonzero(mask)
+        self.doc_ids = [self.doc_ids[i] for i in idx]
+        self.texts = [self.texts[i] for i in idx]
+        self.metadatas = [self.metadatas[i] for i in idx]
+
+    def evict_expired(self, now: float) -> bool:
+        alive = self.expires > now
+        if alive.all():
+            return False
+        self.keep(alive)
+        return True
+
+    def append(self, vectors: np.ndarray, expires_at: float, memories: List[Memory]):
+        if len(self) == 0:
+            self.vectors = vectors
+        else:
+            self.vectors = np.vstack([self.vectors, vectors])
+        self.expires = np.concatenate([self.expires, np.full(len(memories), expires_at)])
+        for doc_id, text, metadata in memories:
+            self.doc_ids.append(doc_id)
+            self.texts.append(text)
+            self.metadatas.append(metadata)
+
+    def trim(self, max_items: int):
+        if len(self) > max_items:
+            mask = np.zeros(len(self), dtype=bool)
+            mask[-max_items:] = True  # newest entries are at the end
+            self.keep(mask)
+
+
+class VectorMemory:
+    """
+    Semantic conversation memory: each stored Q/A is embedded with
+    MiniLMEmbedder and kept in a per-session NumPy index, persisted as one
+    .npz file per session under CHROMA_DB_DIR/memory.
+
+    `query` returns the top-k memories by cosine similarity (same shape as
+    db.memory_store.query_memory, plus "distances"). Entries expire after
+    their TTL and are evicted on the next read or write of their session;
+    a session whose entries have all expired is deleted from disk.
+    The in-memory index is updated at once; its .npz file is rewritten by a
+    background worker, several changes to a session in one write (`flush`
+    waits for pending writes).
+    """
+
+    def __init__(self, root: str = MEMORY_DIR, ttl: int = MEMORY_TTL, max_items: int = MEMORY_MAX_ITEMS,
+                 min_similarity: float = MEMORY_MIN_SIMILARITY, loaded_sessions: int = MEMORY_LOADED_SESSIONS,
+                 embedder_factory: Optional[Callable[[], Any]] = None):
+        self.root = root
+        self.ttl = ttl
+        self.max_items = max_items
+        self.min_similarity = min_similarity
+        self.loaded_sessions = loaded_sessions
+        self._embedder_factory = embedder_factory
+        self._embedder = None
+        self._sessions: "OrderedDict[str, _SessionIndex]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Sessions changed since their last write; held here until written even if evicted from _sessions
+        self._dirty: Dict[str, _SessionIndex] = {}
+        self._io_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-memory")
+        os.makedirs(self.root, exist_ok=True)
+
+    # -------------------
+    # Embedding
+    # -------------------
+    def _get_embedder(self):
+        if self._embedder is None:
+            with self._lock:
+                if self._embedder is None:
+                    if self._embedder_factory is None:
+                        from db.embedding import MiniLMEmbedder
+                        self._embedder_factory = MiniLMEmbedder
+                    self._embedder = self._embedder_factory()
+        return self._embedder
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    # -------------------
+    # Persistence
+    # -------------------
+    def _path(self, session_id: str) -> str:
+        digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{digest}.npz")
+
+    def _load(self, session_id: str) -> _SessionIndex:
+        index = self._sessions.get(session_id)
+        if index is not None:
+            self._sessions.move_to_end(session_id)
+            return index
+        index = self._dirty.get(session_id)  # evicted before its pending write; newer than the file
+        if index is not None:
+            self._sessions[session_id] = index
+            return index
+
+        index = _SessionIndex()
+        path = self._path(session_id)
+        if os.path.exists(path):
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    docs = json.loads(str(data["docs"]))
+                    index.vectors = data["vectors"].astype(np.float32)
+                    index.expires = data["expires"].astype(np.float64)
+                index.doc_ids = [d["id"] for d in docs]
+                index.texts = [d["text"] for d in docs]
+                index.metadatas = [d["metadata"] for d in docs]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Discarding unreadable memory index for {session_id}: {e}")
+                index = _SessionIndex()
+
+        self._sessions[session_id] = index
+        while len(self._sessions) > self.loaded_sessions:
+            self._sessions.popitem(last=False)
+        return index
+
+    def _save(self, session_id: str, index: _SessionIndex):
+        """Queue a write of the session's index; call with `_lock` held."""
+        pending = session_id in self._dirty
+        self._dirty[session_id] = index
+        if not pending:
+            self._writer.submit(self._write, session_id)
+
+    def _write(self, session_id: str):
+        with self._io_lock:
+            with self._lock:
+                index = self._dirty.pop(session_id, None)
+                if index is None:
+                    return  # cleared meanwhile
+                # Arrays are replaced, never modified in place; the lists are appended to
+                vectors, expires = index.vectors, index.expires
+                docs = [
+                    {"id": d, "text": t, "metadata": m}
+                    for d, t, m in zip(index.doc_ids, index.texts, index.metadatas)
+                ]
+            path = self._path(session_id)
+            try:
+                if not docs:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    return
+                tmp = f"{path}.tmp.npz"
+                np.savez(tmp, vectors=vectors, expires=expires, docs=np.array(json.dumps(docs, default=str)))
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"Could not persist memory index for {session_id}: {e}")
+
+    def flush(self):
+        """Wait until every queued index write is on disk."""
+        self._writer.submit(lambda: None).result()
+
+    def _evict(self, session_id: str, index: _SessionIndex):
+        if index.evict_expired(time.time()):
+            self._save(session_id, index)
+
+    # -------------------
+    # API
+    # -------------------
+    def add_many(self, session_id: str, memories: Iterable[Memory], ttl: Optional[int] = None):
+        """Embed and store a batch of memories for a session."""
+        memories = list(memories)
+        if not memories:
+            return
+        vectors = self._normalize(self._get_embedder().embed_texts([text for _, text, _ in memories]))
+        expires_at = time.time() + (ttl or self.ttl)
+        with self._lock:
+            index = self._load(session_id)
+            index.evict_expired(time.time())
+            if len(index) and index.vectors.shape[1] != vectors.shape[1]:
+                index = self._sessions[session_id] = _SessionIndex()  # embedding model changed
+            index.append(vectors, expires_at, memories)
+            index.trim(self.max_items)
+            self._save(session_id, index)
+
+    def add(self, session_id: str, doc_id: str, text: str, metadata: dict, ttl: Optional[int] = None):
+        self.add_many(session_id, [(doc_id, text, metadata)], ttl=ttl)
+
+    def query(self, session_id: str, text: str, top_k: int = TOP_K,
+              min_similarity: Optional[float] = None) -> Dict[str, List[List[Any]]]:
+        """Top-k live memories of a session by cosine similarity to `text`, most similar first."""
+        empty = {"documents": [[]], "metadatas": [[]], "distances": [[]]}
+        with self._lock:
+            index = self._load(session_id)
+            self._evict(session_id, index)
+            if len(index) == 0 or top_k <= 0:
+                return empty
+            vectors, texts, metadatas = index.vectors, list(index.texts), list(index.metadatas)
+
+        query = self._normalize(self._get_embedder().embed_text(text))[0]
+        if query.shape[0] != vectors.shape[1]:
+            return empty
+        sims = vectors @ query
+        k = min(top_k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        cutoff = self.min_similarity if min_similarity is None else min_similarity
+        top = [i for i in top if sims[i] >= cutoff]
+        return {
+            "documents": [[texts[i] for i in top]],
+            "metadatas": [[metadatas[i] for i in top]],
+            "distances": [[float(1.0 - sims[i]) for i in top]],
+        }
+
+    def clear(self, session_id: str):
+        with self._io_lock, self._lock:
+            self._sessions.pop(session_id, None)
+            self._dirty.pop(session_id, None)
+            path = self._path(session_id)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def sweep(self) -> int:
+        """Delete persisted sessions whose entries have all expired; returns how many were removed."""
+        removed = 0
+        now = time.time()
+        with self._io_lock, self._lock:
+            for name in os.listdir(self.root):
+                if not name.endswith(".npz") or ".tmp" in name:
+                    continue
+                path = os.path.join(self.root, name)
+                try:
+                    with np.load(path, allow_pickle=False) as data:
+                        live = bool((data["expires"] > now).any())
+                except (OSError, ValueError, KeyError):
+                    continue
+                if not live:
+                    os.remove(path)
+                    removed += 1
+            for session_id in [s for s in self._sessions
+                               if s not in self._dirty and not os.path.exists(self._path(s))]:
+                self._sessions.pop(session_id)
+        return removed
+
+
+_memory: Optional[VectorMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_vector_memory() -> VectorMemory:
+    """Process-wide VectorMemory, created on first use."""
+    global _memory
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                _memory = VectorMemory()
+    return _memory
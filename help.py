@@ -1,11 +1,9 @@
-import redis
+# help.py
+# Clear every cached LLM/search/route/embedding result without touching
+# conversation memory or flushing the (shared) database.
+# For sessions, users, prefixes and dry runs see: python -m db.maintenance --help
+from db.maintenance import purge_cache
 
-r = redis.Redis(host="localhost", port=6379, db=0)
-
-# delete all cache keys with prefix
-for key in r.scan_iter("cache:*"):
-    r.delete(key)
-
-# OR flush entire DB
+for report in purge_cache():
+    print(report)
 print("deleted")
-r.flushdb()
\ No newline at end of file
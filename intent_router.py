@@ -0,0 +1,196 @@
+# intent_router.py
+import math
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence
+
+from config.setting import INTENT_EMBEDDING_FALLBACK, INTENT_AMBIGUITY_MARGIN, INTENT_MIN_SIMILARITY
+
+# Example phrasings per intent for the embedding fallback
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    "overview": ["tell me about Goa", "what is there to see in Paris", "give me details about Jaipur"],
+    "weather": ["what will the weather be like", "is it going to rain during my trip", "how hot is it in May"],
+    "transport": ["how do I get from Delhi to Agra", "best way to travel between the cities", "trains or flights to Leh"],
+    "hotels": ["where should I stay", "recommend some hotels", "good areas to book accommodation"],
+    "budget": ["how much will the trip cost", "keep it cheap", "estimate my expenses"],
+    "itinerary": ["make a day by day plan", "build my itinerary", "what should I do each day"],
+    "full_planning": ["plan everything for me", "organise the complete trip", "handle the whole trip end to end"],
+}
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class IntentRouter:
+    """
+    Scores every intent against a user message in one regex pass.
+
+    All patterns are compiled once into a single alternation (longest first,
+    so "plan everything" wins over "plan"); each match adds the pattern's word
+    count to its intent's score. When the best score is tied or nothing
+    matches, an embedding-similarity classifier over INTENT_EXAMPLES breaks
+    the tie, falling back to the patterns' declaration order (or `default`
+    when nothing matched). The classifier abstains below `min_similarity`,
+    and until `warm_in_background` has loaded the model, so the request
+    path never waits for it.
+    """
+
+    def __init__(self, intent_patterns: Dict[str, List[str]], default: str = "overview",
+                 embedder_factory: Optional[Callable[[], object]] = None,
+                 use_embeddings: bool = INTENT_EMBEDDING_FALLBACK,
+                 ambiguity_margin: float = INTENT_AMBIGUITY_MARGIN,
+                 min_similarity: float = INTENT_MIN_SIMILARITY):
+        self.intents = list(intent_patterns)
+        self.default = default
+        self.ambiguity_margin = ambiguity_margin
+        self.min_similarity = min_similarity
+        self.use_embeddings = use_embeddings
+        self._embedder_factory = embedder_factory
+        self._embedder = None
+        self._prototypes: Optional[Dict[str, List[List[float]]]] = None
+        self._embed_lock = threading.Lock()
+        self._warming: Optional[threading.Thread] = None
+
+        alternatives = []
+        self._groups: Dict[str, tuple] = {}  # group name -> (intent, weight)
+        for intent, patterns in intent_patterns.items():
+            for pattern in patterns:
+                group = f"g{len(alternatives)}"
+                self._groups[group] = (intent, float(len(pattern.split())))
+                alternatives.append((pattern, group))
+        alternatives.sort(key=lambda item: len(item[0]), reverse=True)
+        # Leading word boundary only: "hotel" matches "hotels" but "rain" no longer matches "train"
+        self._matcher = re.compile("|".join(rf"\b(?P<{g}>{p})" for p, g in alternatives), re.IGNORECASE)
+        self._embed = lru_cache(maxsize=1024)(self._embed_uncached)
+
+    # -------------------
+    # Pattern scoring
+    # -------------------
+    def scores(self, text: str) -> Dict[str, float]:
+        """Score of every intent with at least one matching pattern."""
+        scores: Dict[str, float] = {}
+        groups = self._groups
+        for m in self._matcher.finditer(text):
+            intent, weight = groups[m.lastgroup]
+            scores[intent] = scores.get(intent, 0.0) + weight
+        return scores
+
+    def classify(self, text: str) -> str:
+        scores = self.scores(text)
+        if len(scores) == 1:
+            return next(iter(scores))
+
+        if scores:
+            best = max(scores.values())
+            candidates = [i for i in self.intents if best - scores.get(i, -math.inf) < self.ambiguity_margin]
+            if len(candidates) == 1:
+                return candidates[0]
+        else:
+            candidates = self.intents
+
+        choice = self._classify_by_embedding(text, candidates)
+        if choice is not None:
+            return choice
+        return candidates[0] if scores else self.default
+
+    def classify_many(self, texts: Sequence[str]) -> List[str]:
+        return [self.classify(text) for text in texts]
+
+    # -------------------
+    # Embedding fallback
+    # -------------------
+    def _get_embedder(self):
+        if self._embedder is None:
+            with self._embed_lock:
+                if self._embedder is None:
+                    if self._embedder_factory is None:
+                        from db.embedding import MiniLMEmbedder
+                        self._embedder_factory = MiniLMEmbedder
+                    self._embedder = self._embedder_factory()
+        return self._embedder
+
+    def _embed_uncached(self, text: str):
+        return tuple(self._get_embedder().embed_text(text))
+
+    def warm(self):
+        """Load the embedding model and embed INTENT_EXAMPLES; blocking."""
+        try:
+            self._prototypes = {
+                intent: [self._embed(example) for example in INTENT_EXAMPLES.get(intent, [])]
+                for intent in self.intents
+            }
+        except Exception as e:
+            # Missing model/dependency: keep routing on patterns alone
+            print(f"Intent embedding fallback disabled: {e}")
+            self.use_embeddings = False
+
+    def warm_in_background(self):
+        """Start `warm` on a daemon thread, once."""
+        if not self.use_embeddings:
+            return
+        with self._embed_lock:
+            if self._warming is None:
+                self._warming = threading.Thread(target=self.warm, name="intent-embedder", daemon=True)
+                self._warming.start()
+
+    def _classify_by_embedding(self, text: str, candidates: List[str]) -> Optional[str]:
+        if not self.use_embeddings:
+            return None
+        if self._prototypes is None:
+            # Never load the model on the request path
+            self.warm_in_background()
+            return None
+        try:
+            vector = self._embed(text.lower())
+        except Exception as e:
+            print(f"Intent embedding fallback disabled: {e}")
+            self.use_embeddings = False
+            return None
+
+        best_intent, best_sim = None, -1.0
+        for intent in candidates:
+            for prototype in self._prototypes.get(intent, []):
+                sim = _cosine(vector, prototype)
+                if sim > best_sim:
+                    best_intent, best_sim = intent, sim
+        return best_intent if best_sim >= self.min_similarity else None
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: compiled router vs the previous per-call regex loop
+    import timeit
+    from orchestration import ConversationalOrchestrator
+
+    patterns = ConversationalOrchestrator.INTENT_PATTERNS
+    corpus = [
+        "Tell me about Manali",
+        "What's the weather in Goa from 10-12-2025 to 15-12-2025?",
+        "How to reach Leh from Delhi by train",
+        "Where to stay in Jaipur under 3000 a night",
+        "What will the whole trip cost?",
+        "Give me a day by day itinerary",
+        "Plan everything for a full trip to Kerala",
+        "plan a budget trip",
+    ] * 125
+
+    def legacy(text: str) -> str:
+        lowered = text.lower()
+        for intent, pats in patterns.items():
+            for pattern in pats:
+                if re.search(pattern, lowered):
+                    return intent
+        return "overview"
+
+    router = IntentRouter(patterns, use_embeddings=False)
+    n = 20
+    old = timeit.timeit(lambda: [legacy(t) for t in corpus], number=n)
+    new = timeit.timeit(lambda: router.classify_many(corpus), number=n)
+    per_call = 1e6 / (n * len(corpus))
+    print(f"legacy loop:     {old * per_call:.2f} µs/message")
+    print(f"compiled router: {new * per_call:.2f} µs/message")
+    for text in corpus[:8]:
+        print(f"  {legacy(text):>13} -> {router.classify(text):<13} | {text}")
@@ -0,0 +1,357 @@
+# llm_routing.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from config.setting import (
+    LLM_TIERS, LLM_ROUTES, LLM_TEMPERATURE, LLM_LATENCY_BUDGETS, LLM_COST_BUDGETS, LLM_STATS_WINDOW,
+)
+from streaming import StreamRelay, discard_stream, stream_to
+from utils.tokens import count_tokens
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """One model the router can pick. Prices are USD per million tokens, used for cost estimates only."""
+    name: str
+    model: str
+    input_usd_per_mtok: float
+    output_usd_per_mtok: float
+    max_prompt_tokens: Optional[int] = None  # larger prompts skip this tier
+
+    def estimate_usd(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.input_usd_per_mtok + completion_tokens * self.output_usd_per_mtok) / 1e6
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    Tiers to try for one kind of task, in order. Each tier gets
+    `latency_budget_s` before the call falls back to the next one; tiers whose
+    estimated cost exceeds `cost_budget_usd` are skipped.
+    """
+    tiers: Tuple[str, ...]
+    latency_budget_s: float = 60.0
+    cost_budget_usd: Optional[float] = None
+    expected_output_tokens: int = 800  # cost estimate until the route has stats
+
+
+# Price and prompt-size limits per tier name; models come from LLM_TIERS
+TIER_LIMITS: Dict[str, Dict[str, Any]] = {
+    "fast": {"input_usd_per_mtok": 0.075, "output_usd_per_mtok": 0.30, "max_prompt_tokens": 6000},
+    "standard": {"input_usd_per_mtok": 0.10, "output_usd_per_mtok": 0.40},
+    "large": {"input_usd_per_mtok": 0.30, "output_usd_per_mtok": 2.50},
+}
+
+TIERS: Dict[str, ModelTier] = {
+    name: ModelTier(name, model, **TIER_LIMITS.get(name, {"input_usd_per_mtok": 0.0, "output_usd_per_mtok": 0.0}))
+    for name, model in LLM_TIERS.items()
+}
+
+# Route name (the task template name; "summary" for memory compaction) -> Route
+ROUTES: Dict[str, Route] = {
+    "travel": Route(("fast", "standard"), latency_budget_s=60),
+    "weather": Route(("fast", "standard"), latency_budget_s=45),
+    "transport": Route(("standard", "fast"), latency_budget_s=60),
+    "hotel": Route(("standard", "fast"), latency_budget_s=60),
+    "budget": Route(("standard", "fast"), latency_budget_s=60),
+    "itinerary": Route(("large", "standard"), latency_budget_s=150, expected_output_tokens=2500),
+    "summary": Route(("fast", "standard"), latency_budget_s=30, expected_output_tokens=400),
+    "default": Route(("standard", "fast"), latency_budget_s=60),
+}
+
+
+def route_for(name: str) -> Route:
+    """The route for `name` with any LLM_ROUTES / LLM_*_BUDGETS overrides applied."""
+    base = ROUTES.get(name, ROUTES["default"])
+    tiers = tuple(t for t in LLM_ROUTES.get(name, base.tiers) if t in TIERS) or tuple(TIERS)
+    return Route(
+        tiers=tiers,
+        latency_budget_s=LLM_LATENCY_BUDGETS.get(name, base.latency_budget_s),
+        cost_budget_usd=LLM_COST_BUDGETS.get(name, base.cost_budget_usd),
+        expected_output_tokens=base.expected_output_tokens,
+    )
+
+
+# -------------------
+# Statistics
+# -------------------
+class TierStats:
+    """Latency, token and cost counters for one (route, tier); token counts are cl100k estimates."""
+
+    def __init__(self, window: int = LLM_STATS_WINDOW):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.over_budget = 0  # succeeded, but slower than the route's latency budget
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latencies: "deque[float]" = deque(maxlen=window)
+
+    def mean_completion_tokens(self) -> Optional[float]:
+        succeeded = self.calls - self.errors
+        return self.completion_tokens / succeeded if succeeded > 0 else None
+
+
+_stats: Dict[Tuple[str, str], TierStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(route: str, tier: ModelTier, seconds: float, prompt_tokens: int, completion_tokens: int = 0,
+            error: bool = False, timeout: bool = False, over_budget: bool = False):
+    with _stats_lock:
+        stats = _stats.get((route, tier.name))
+        if stats is None:
+            stats = _stats[(route, tier.name)] = TierStats()
+        stats.calls += 1
+        stats.errors += error
+        stats.timeouts += timeout
+        stats.over_budget += over_budget
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        stats.cost_usd += tier.estimate_usd(prompt_tokens, completion_tokens)
+        stats.latencies.append(seconds)
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def routing_stats(by: str = "route") -> Dict[str, Dict[str, Any]]:
+    """
+    Per "route/tier" (by="route") or per tier across routes (by="tier"):
+    calls, errors, timeouts, over_budget, tokens, estimated cost and latency
+    percentiles over the last LLM_STATS_WINDOW calls.
+    """
+    groups: Dict[str, List[TierStats]] = {}
+    with _stats_lock:
+        for (route, tier), stats in _stats.items():
+            groups.setdefault(f"{route}/{tier}" if by == "route" else tier, []).append(stats)
+        out = {}
+        for key, items in sorted(groups.items()):
+            latencies = [s for stats in items for s in stats.latencies]
+            calls = sum(s.calls for s in items)
+            out[key] = {
+                "calls": calls,
+                "errors": sum(s.errors for s in items),
+                "timeouts": sum(s.timeouts for s in items),
+                "over_budget": sum(s.over_budget for s in items),
+                "prompt_tokens": sum(s.prompt_tokens for s in items),
+                "completion_tokens": sum(s.completion_tokens for s in items),
+                "cost_usd": round(sum(s.cost_usd for s in items), 6),
+                "p50_s": round(_percentile(latencies, 0.5) or 0, 3),
+                "p95_s": round(_percentile(latencies, 0.95) or 0, 3),
+            }
+        return out
+
+
+def reset_routing_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _is_timeout(error: Optional[BaseException]) -> bool:
+    # litellm.Timeout, openai.APITimeoutError, TimeoutError, possibly wrapped by crewai
+    for _ in range(5):
+        if error is None:
+            return False
+        if isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower():
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _prompt_text(messages: Union[str, List[Dict[str, Any]]]) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(m.get("content") or "") for m in messages)
+
+
+# -------------------
+# Routed LLM
+# -------------------
+class RoutedLLM(BaseLLM):
+    """
+    A CrewAI LLM that picks a model tier per call for one route.
+
+    Tiers that cannot take the prompt (`max_prompt_tokens`) or would exceed
+    the route's cost budget are skipped. The first remaining tier is called
+    with the route's latency budget as a wall-clock deadline; on a timeout
+    the call is retried on the next tier. Every attempt is recorded in
+    `routing_stats`.
+
+    The deadline is kept here, not by litellm: its `timeout` is per read
+    while streaming, and CrewAI returns the partial text of a stream that
+    fails after its first chunk. Each attempt runs on its own thread and is
+    abandoned at the deadline; its streamed tokens stop being forwarded and
+    its answer is never returned (or cached).
+
+    `model` and `api_key` are the route's first tier's, so CrewAI code that
+    calls litellm itself with them (the output_pydantic converter) gets a real
+    model; `name` is the route label.
+    """
+
+    def __init__(self, route: str, spec: Optional[Route] = None, **client_kwargs):
+        self.route = route
+        self.spec = spec or route_for(route)
+        self.client_kwargs = client_kwargs
+        self._clients: Dict[str, BaseLLM] = {}
+        self._lock = threading.Lock()
+        super().__init__(model=TIERS[self.spec.tiers[0]].model, temperature=LLM_TEMPERATURE)
+        self.name = f"routed/{route}:{'>'.join(self.spec.tiers)}"
+        self.api_key = client_kwargs.get("api_key")
+        self.base_url = client_kwargs.get("base_url")
+
+    def _client(self, tier: ModelTier) -> BaseLLM:
+        client = self._clients.get(tier.name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(tier.name)
+                if client is None:
+                    from crewai import LLM
+                    client = self._clients[tier.name] = LLM(
+                        model=tier.model,
+                        temperature=self.temperature,
+                        timeout=self.spec.latency_budget_s,
+                        **self.client_kwargs,
+                    )
+        return client
+
+    def plan(self, prompt_tokens: int) -> List[ModelTier]:
+        """Tiers to try for a prompt of this size, in order."""
+        tiers = [TIERS[name] for name in self.spec.tiers]
+        fitting = [t for t in tiers if t.max_prompt_tokens is None or prompt_tokens <= t.max_prompt_tokens] or tiers
+        if self.spec.cost_budget_usd is None:
+            return fitting
+
+        def estimate(tier: ModelTier) -> float:
+            with _stats_lock:
+                stats = _stats.get((self.route, tier.name))
+                expected = stats.mean_completion_tokens() if stats else None
+            return tier.estimate_usd(prompt_tokens, int(expected or self.spec.expected_output_tokens))
+
+        affordable = [t for t in fitting if estimate(t) <= self.spec.cost_budget_usd]
+        return affordable or [min(fitting, key=estimate)]
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        prompt_tokens = count_tokens(_prompt_text(messages))
+        plan = self.plan(prompt_tokens)
+        for attempt, tier in enumerate(plan):
+            client = self._client(tier)
+            client.stop = list(self.stop or [])  # set by the agent executor on this wrapper
+            relay = StreamRelay()
+            start = time.perf_counter()
+            try:
+                response = self._call_with_deadline(client, relay, messages, dict(
+                    tools=tools, callbacks=callbacks, available_functions=available_functions,
+                    from_task=from_task, from_agent=from_agent,
+                ))
+            except Exception as e:
+                relay.cut()
+                elapsed = time.perf_counter() - start
+                timed_out = _is_timeout(e)
+                _record(self.route, tier, elapsed, prompt_tokens, error=True, timeout=timed_out)
+                if not timed_out or attempt == len(plan) - 1:
+                    raise
+                fallback = plan[attempt + 1]
+                print(f"LLM route {self.route}: {tier.name} timed out after {elapsed:.1f}s, falling back to {fallback.name}")
+                # Tokens of the abandoned answer may already be on screen; the retry starts a new one
+                discard_stream(f"The {tier.name} model is slow, retrying with the {fallback.name} model…")
+                continue
+            elapsed = time.perf_counter() - start
+            _record(self.route, tier, elapsed, prompt_tokens, count_tokens(str(response)),
+                    over_budget=elapsed > self.spec.latency_budget_s)
+            return response
+
+    def _call_with_deadline(self, client: BaseLLM, relay: StreamRelay, messages, kwargs: Dict[str, Any]):
+        """`client.call` on a worker thread; TimeoutError once the route's latency budget has passed."""
+        future: Future = Future()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                # Chunk events fire on the calling thread; relay them to this thread's stream
+                with stream_to(relay) if relay.sink is not None else nullcontext():
+                    future.set_result(client.call(messages, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"llm-{self.route}", daemon=True).start()
+        try:
+            return future.result(timeout=self.spec.latency_budget_s)
+        except FutureTimeout:
+            raise TimeoutError(
+                f"{client.model} did not finish within the {self.spec.latency_budget_s}s latency budget"
+            ) from None
+
+    def supports_function_calling(self) -> bool:
+        return all(self._client(TIERS[name]).supports_function_calling() for name in self.spec.tiers)
+
+    def supports_stop_words(self) -> bool:
+        return all(self._client(TIERS[name]).supports_stop_words() for name in self.spec.tiers)
+
+    def get_context_window_size(self) -> int:
+        return min(self._client(TIERS[name]).get_context_window_size() for name in self.spec.tiers)
+
+
+def tier_models(routes: Optional[Sequence[str]] = None) -> Dict[str, List[str]]:
+    """The routing table as route -> [model, ...], for logging at startup."""
+    return {name: [TIERS[t].model for t in route_for(name).tiers] for name in (routes or ROUTES)}
+
+
+if __name__ == "__main__":
+    # Tier selection and timeout fallback with stubbed clients, no API calls:
+    #   CREWAI_DISABLE_TELEMETRY=true python llm_routing.py
+    class StubClient(BaseLLM):
+        def __init__(self, model: str, latency: float, timeout: float):
+            super().__init__(model=model)
+            self.latency, self.timeout = latency, timeout
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+            if self.latency > self.timeout:
+                time.sleep(self.timeout)
+                raise TimeoutError(f"{self.model} did not answer within {self.timeout}s")
+            time.sleep(self.latency)
+            return "Final Answer: " + "sunny and 31°C " * 20
+
+        def supports_function_calling(self) -> bool:
+            return True
+
+    for name, models in tier_models().items():
+        print(f"{name:>10}: {' > '.join(models)}")
+
+    weather = RoutedLLM("weather", Route(("fast", "standard"), latency_budget_s=0.05))
+    weather._clients = {"fast": StubClient("fast", 0.01, 0.05), "standard": StubClient("standard", 0.03, 0.05)}
+    itinerary = RoutedLLM("itinerary", Route(("large", "standard"), latency_budget_s=0.05))
+    itinerary._clients = {"large": StubClient("large", 0.2, 0.05), "standard": StubClient("standard", 0.03, 0.05)}
+
+    short_prompt = "Weather in Jaipur from 2025-11-01 to 2025-11-04?"
+    long_prompt = "Earlier conversation. " * 3000  # past the fast tier's max_prompt_tokens
+    for _ in range(5):
+        weather.call(short_prompt)
+        weather.call(long_prompt)
+        itinerary.call(short_prompt)  # large tier always times out -> standard
+
+    print(f"weather plan, short prompt: {[t.name for t in weather.plan(count_tokens(short_prompt))]}")
+    print(f"weather plan, long prompt:  {[t.name for t in weather.plan(count_tokens(long_prompt))]}")
+    for by in ("route", "tier"):
+        for key, row in routing_stats(by).items():
+            print(f"{key:>18}: {row}")
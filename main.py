@@ -18,16 +18,9 @@ orchestrator = st.session_state.orchestrator
 user_input = st.text_input("Ask me about your trip:")
 
 if user_input:
-    # Process user input through orchestrator
-    result = orchestrator.process_user_input(user_input)
-
-    response_data = result.get("response")
-    response_text = (
-        response_data.get("raw") if isinstance(response_data, dict) else str(response_data)
-    )
-
-    # Show assistant response
-    st.markdown(f"**Assistant:** {response_text}")
+    # Process user input through orchestrator, rendering the answer as it streams in
+    st.markdown("**Assistant:**")
+    st.write_stream(orchestrator.process_user_input_stream(user_input))
 
     # Show current trip context
     st.markdown("### 📌 Current Trip Context")
@@ -1,16 +1,41 @@
 # model.py
 import os
+import threading
 from dotenv import load_dotenv
-from crewai import LLM
 
 load_dotenv()
 
 # Load your Gemini API key
 api_key = os.getenv("GEMINI_API_KEY")
 
-# CrewAI LLM wrapper for Google Gemini
-llm = LLM(
-    model="gemini/gemini-2.0-flash",
-    api_key=api_key,
-    temperature=0.7,  
-)
+_llms = {}
+_llm_lock = threading.Lock()
+
+
+def get_llm(route: str = "default"):
+    """
+    The process-wide CrewAI LLM for `route` (a task template name such as
+    "weather" or "itinerary"): a RoutedLLM that picks a Gemini model tier per
+    call, see llm_routing.py. Built on first use so importing this module
+    does not pull in crewai/litellm.
+    """
+    llm = _llms.get(route)
+    if llm is None:
+        with _llm_lock:
+            llm = _llms.get(route)
+            if llm is None:
+                from llm_routing import RoutedLLM
+                llm = _llms[route] = RoutedLLM(
+                    route,
+                    api_key=api_key,
+                    # Stream tokens so the UI can render answers as they are generated
+                    stream=os.getenv("LLM_STREAM", "true").lower() == "true",
+                )
+    return llm
+
+
+def __getattr__(name):
+    # `from model import llm` keeps working, lazily
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,12 @@
 # orchestration.py
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
-import re
+from functools import partial
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+import queue
+import threading
+import time
 
 # Import your existing task functions
 from tasks.travel_task import run_travel_research
@@ -10,9 +15,135 @@ from tasks.transport_task import run_transport_advice
 from tasks.hotel_task import run_hotel_recommendation
 from tasks.budget_task import run_budget_optimizer
 from tasks.itinerary_task import run_itinerary_builder
+from tasks.context_assembly import AssembledContext, assemble as assemble_context
+from tasks.schemas import to_context as structured_context
+from db.cache import hash_key
 
 # Redis memory
-from db.memory_store import add_memory, query_memory
+from db.memory_store import add_memory
+from db.memory_compaction import get_memory_compactor
+from db.vector_memory import get_vector_memory
+
+from config.setting import AGENT_MAX_WORKERS, AGENT_NODE_TIMEOUT, TOP_K, PREFETCH_ENABLED, PREFETCH_AGENTS
+from streaming import stream_to, emit_progress
+from prefetch import get_prefetch_scheduler
+from intent_router import IntentRouter
+from slot_extractor import SlotExtractor
+
+
+# -------------------
+# Dependency Graph Executor
+# -------------------
+@dataclass
+class AgentNode:
+    """A single agent run in the dependency graph."""
+    name: str
+    func: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+
+@dataclass
+class NodeResult:
+    """Outcome of an AgentNode: status is one of ok, error, timeout, skipped."""
+    name: str
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+class DependencyGraphExecutor:
+    """
+    Runs AgentNodes concurrently on a bounded thread pool.
+    A node starts as soon as all of its dependencies succeeded; nodes whose
+    dependencies failed or timed out are skipped instead of run.
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, max_workers: int = AGENT_MAX_WORKERS, default_timeout: Optional[float] = AGENT_NODE_TIMEOUT):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+
+    def run(self, nodes: List[AgentNode], on_done: Optional[Callable[[NodeResult], None]] = None) -> Dict[str, NodeResult]:
+        """
+        Run all nodes and return their results by name.
+        `on_done` is called on the calling thread as each node finishes.
+        """
+        names = {node.name for node in nodes}
+        for node in nodes:
+            missing = [d for d in node.depends_on if d not in names]
+            if missing:
+                raise ValueError(f"Node '{node.name}' depends on unknown node(s): {missing}")
+
+        results: Dict[str, NodeResult] = {}
+        started_at: Dict[str, float] = {}
+        running: Dict[Future, AgentNode] = {}
+        pending = list(nodes)
+
+        def finish(result: NodeResult):
+            results[result.name] = result
+            if on_done is not None:
+                on_done(result)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent")
+        try:
+            while pending or running:
+                for node in list(pending):
+                    finished = [results[d] for d in node.depends_on if d in results]
+                    if any(r.status != "ok" for r in finished):
+                        finish(NodeResult(node.name, "skipped", error="dependency did not complete"))
+                        pending.remove(node)
+                    elif len(finished) == len(node.depends_on):
+                        running[pool.submit(self._timed, node, started_at)] = node
+                        pending.remove(node)
+
+                if not running:
+                    # Remaining nodes can never become ready (dependency cycle)
+                    for node in pending:
+                        finish(NodeResult(node.name, "skipped", error="dependency cycle"))
+                    break
+
+                done, _ = wait(running, timeout=self._wait_timeout(running, started_at), return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    finish(future.result())
+
+                now = time.perf_counter()
+                for future, node in list(running.items()):
+                    timeout = self._timeout_for(node)
+                    start = started_at.get(node.name)
+                    if timeout is not None and start is not None and now - start >= timeout:
+                        # The worker thread cannot be interrupted; abandon it and move on
+                        running.pop(future)
+                        finish(NodeResult(node.name, "timeout", error=f"timed out after {timeout}s", elapsed=now - start))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def _timeout_for(self, node: AgentNode) -> Optional[float]:
+        return node.timeout if node.timeout is not None else self.default_timeout
+
+    def _wait_timeout(self, running: Dict[Future, AgentNode], started_at: Dict[str, float]) -> float:
+        now = time.perf_counter()
+        remaining = [self.POLL_INTERVAL]
+        for node in running.values():
+            timeout = self._timeout_for(node)
+            if timeout is not None and node.name in started_at:
+                remaining.append(started_at[node.name] + timeout - now)
+        return max(0.0, min(remaining))
+
+    @staticmethod
+    def _timed(node: AgentNode, started_at: Dict[str, float]) -> NodeResult:
+        start = time.perf_counter()
+        started_at[node.name] = start
+        try:
+            value = node.func()
+            return NodeResult(node.name, "ok", value=value, elapsed=time.perf_counter() - start)
+        except Exception as e:
+            return NodeResult(node.name, "error", error=str(e), elapsed=time.perf_counter() - start)
 
 
 class ConversationalOrchestrator:
@@ -28,6 +159,39 @@ class ConversationalOrchestrator:
         "full_planning": [r"plan everything", r"complete planning", r"full trip"]
     }
 
+    # Context slots each specialist agent reads; an output is reused until one of these changes
+    AGENT_SLOTS = {
+        "travel_research": ("origin", "destination", "start_date", "end_date", "travelers", "budget_total", "budget_currency"),
+        "weather_advice": ("destination", "start_date", "end_date"),
+        "transport_advice": ("origin", "destination", "start_date", "end_date", "travel_mode_preference", "travelers"),
+        "hotel_recommendation": ("destination", "start_date", "end_date", "travelers", "budget_total", "budget_currency"),
+        "budget_optimizer": ("destination", "start_date", "end_date", "travelers", "budget_total", "budget_currency"),
+    }
+
+    # Specialist agent answering each single-agent intent
+    INTENT_AGENTS = {
+        "overview": "travel_research",
+        "weather": "weather_advice",
+        "transport": "transport_advice",
+        "hotels": "hotel_recommendation",
+        "budget": "budget_optimizer",
+    }
+
+    # Words a follow-up can use without asking for anything a prefetched answer doesn't cover
+    FOLLOW_UP_FILLER = frozenset(
+        "a an the and or of for in on at to from by with about what whats what's how which "
+        "is are was be it its this that there me my us our we i you your can could would will "
+        "please show tell give get find suggest recommend some any good best like also now then "
+        "trip travel travelling traveling people person persons adults do does there's okay ok "
+        "thanks so just options option".split()
+    )
+
+    # Compiled once per process from INTENT_PATTERNS
+    _router: Optional[IntentRouter] = None
+    _router_lock = threading.Lock()
+    # Stateless, shares one precompiled pattern across sessions
+    slot_extractor = SlotExtractor()
+
     def __init__(self, user_id: str = "default_user"):
         self.user_id = user_id
         self.context: Dict[str, Any] = {
@@ -37,71 +201,51 @@ class ConversationalOrchestrator:
             "end_date": None,
             "travel_mode_preference": None,
             "budget_total": None,
+            "budget_currency": None,
             "travelers": 1
         }
         self.agent_outputs: Dict[str, Any] = {}
         self.conversation_history: list[Dict[str, str]] = []
+        self.executor = DependencyGraphExecutor()
+        self.node_timings: Dict[str, float] = {}
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_changed_slots: set[str] = set()
+        self.last_context_report: Optional[AssembledContext] = None
+        # Memory recalled for the current turn; a separate task input, runs given one skip the response cache
+        self.recalled = ""
+        # Fingerprint of the AGENT_SLOTS values each stored output was computed from
+        self.output_fingerprints: Dict[str, str] = {}
+        self.last_invalidated: List[str] = []
+        self.prefetched: set[str] = set()
+        self.prefetcher = get_prefetch_scheduler()
+        self._prefetch_session = f"{user_id}:{id(self):x}"
+        self._outputs_lock = threading.Lock()
+        # Tokens of itinerary runs in progress; nodes abandoned by a finished run may not write outputs
+        self._live_runs: set = set()
+        self.router()
 
     # -------------------
     # Context Parsing
     # -------------------
     def parse_user_prompt(self, user_prompt: str) -> Dict[str, Any]:
-        ctx = self.context.copy()
-        s = user_prompt.lower()
-
-        # Extract origin and destination
-        m = re.search(r"from\s+([a-z\s\-]+)\s+to\s+([a-z\s\-]+)", s)
-        if m:
-            ctx["origin"] = m.group(1).strip().title()
-            ctx["destination"] = m.group(2).strip().title()
-
-        # Extract dates
-        m = re.search(r"(\d{1,2}[/-]\d{1,2}[/-]\d{4})\s*(?:to|-)\s*(\d{1,2}[/-]\d{1,2}[/-]\d{4})", s)
-        if m:
-            def normalize_date(d: str):
-                d = d.replace("/", "-")
-                for fmt in ("%d-%m-%Y", "%d/%m/%Y"):
-                    try:
-                        return datetime.strptime(d, fmt).strftime("%Y-%m-%d")
-                    except:
-                        continue
-                return None
-            ctx["start_date"] = normalize_date(m.group(1))
-            ctx["end_date"] = normalize_date(m.group(2))
-
-        # Travel mode
-        if "car" in s:
-            ctx["travel_mode_preference"] = "car"
-        elif "flight" in s or "plane" in s:
-            ctx["travel_mode_preference"] = "flight"
-        elif "train" in s:
-            ctx["travel_mode_preference"] = "train"
-
-        # Budget
-        m = re.search(r"budget.*?(\d+)", s)
-        if m:
-            try:
-                ctx["budget_total"] = int(m.group(1))
-            except:
-                pass
-
-        # Travelers
-        m = re.search(r"(?:we are|travelling)\s*(\d+)\s*person", s)
-        if m:
-            ctx["travelers"] = int(m.group(1))
-
-        return ctx
+        """Slots mentioned in the prompt that differ from the current context."""
+        return self.slot_extractor.extract(user_prompt, self.context)
 
     # -------------------
     # Intent Classification
     # -------------------
+    @classmethod
+    def router(cls) -> IntentRouter:
+        if cls._router is None:
+            with cls._router_lock:
+                if cls._router is None:
+                    cls._router = IntentRouter(cls.INTENT_PATTERNS, default="overview")
+                    # Load the embedding tie-breaker off the request path
+                    cls._router.warm_in_background()
+        return cls._router
+
     def classify_intent(self, user_input: str) -> str:
-        user_input_lower = user_input.lower()
-        for intent, patterns in self.INTENT_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, user_input_lower):
-                    return intent
-        return "overview"
+        return self.router().classify(user_input)
 
     # -------------------
     # Formatting Output
@@ -115,121 +259,292 @@ class ConversationalOrchestrator:
     # -------------------
     # Agent Executors
     # -------------------
-    def run_travel_research_agent(self, prompt: str):
-        out = run_travel_research(prompt, self.context)
-        self.agent_outputs["travel_research"] = self.format_output(out)
-        return out
+    def slots_for(self, agent_key: str) -> Dict[str, Any]:
+        """The context slots an agent reads, with their current values."""
+        return {slot: self.context.get(slot) for slot in self.AGENT_SLOTS[agent_key]}
 
-    def run_weather_agent(self, prompt: str):
-        ctx = {
-            "destination": self.context.get("destination"),
-            "start_date": self.context.get("start_date"),
-            "end_date": self.context.get("end_date")
-        }
-        out = run_weather_advice(prompt, ctx)
-        self.agent_outputs["weather_advice"] = self.format_output(out)
-        return out
+    def fingerprint(self, agent_key: str, slots: Optional[Dict[str, Any]] = None) -> str:
+        return hash_key(agent_key, slots if slots is not None else self.slots_for(agent_key))
 
-    def run_transport_agent(self, prompt: str):
-        ctx = {
-            "origin": self.context.get("origin"),
-            "destination": self.context.get("destination"),
-            "travel_mode_preference": self.context.get("travel_mode_preference")
-        }
-        out = run_transport_advice(prompt, ctx)
-        self.agent_outputs["transport_advice"] = self.format_output(out)
+    def _record(self, agent_key: str, out: Any, slots: Dict[str, Any], prefetch: bool = False, run: Any = None) -> Any:
+        """
+        Store an agent's output with the fingerprint of the slots it ran on.
+        An output whose slots changed while it ran, or that belongs to an
+        itinerary `run` that already finished without it, is returned but not kept.
+        """
+        fingerprint = self.fingerprint(agent_key, slots)
+        with self._outputs_lock:
+            if fingerprint != self.fingerprint(agent_key):
+                return out
+            if run is not None and run not in self._live_runs:
+                print(f"{agent_key}: discarding result that arrived after its itinerary run timed it out")
+                return out
+            if prefetch and agent_key in self.agent_outputs and agent_key not in self.prefetched:
+                # The user's own question was answered meanwhile; keep that answer
+                return out
+            self.output_fingerprints[agent_key] = fingerprint
+            if prefetch:
+                self.prefetched.add(agent_key)
+            else:
+                self.prefetched.discard(agent_key)
+            self.agent_outputs[agent_key] = self.format_output(out)
         return out
 
-    def run_hotel_agent(self, prompt: str):
-        ctx = {
-            "destination": self.context.get("destination"),
-            "budget_total": self.context.get("budget_total")
-        }
-        out = run_hotel_recommendation(prompt, ctx)
-        self.agent_outputs["hotel_recommendation"] = self.format_output(out)
-        return out
+    def _run_agent(self, agent_key: str, task: Callable[..., Any], prompt: str, prefetch: bool, run: Any):
+        ctx = self.slots_for(agent_key)
+        # Prefetches answer the generic prefetch prompt, recalled memory is for the user's own turn
+        out = task(prompt, ctx, memory="" if prefetch else self.recalled)
+        return self._record(agent_key, out, ctx, prefetch, run)
+
+    def run_travel_research_agent(self, prompt: str, prefetch: bool = False, run: Any = None):
+        return self._run_agent("travel_research", run_travel_research, prompt, prefetch, run)
+
+    def run_weather_agent(self, prompt: str, prefetch: bool = False, run: Any = None):
+        return self._run_agent("weather_advice", run_weather_advice, prompt, prefetch, run)
 
-    def run_budget_agent(self, prompt: str):
-        ctx = {
-            "budget_total": self.context.get("budget_total")
+    def run_transport_agent(self, prompt: str, prefetch: bool = False, run: Any = None):
+        return self._run_agent("transport_advice", run_transport_advice, prompt, prefetch, run)
+
+    def run_hotel_agent(self, prompt: str, prefetch: bool = False, run: Any = None):
+        return self._run_agent("hotel_recommendation", run_hotel_recommendation, prompt, prefetch, run)
+
+    def run_budget_agent(self, prompt: str, prefetch: bool = False, run: Any = None):
+        return self._run_agent("budget_optimizer", run_budget_optimizer, prompt, prefetch, run)
+
+    def specialist_agents(self) -> Dict[str, Callable[..., Any]]:
+        """Independent agents, which also feed the itinerary builder."""
+        return {
+            "travel_research": self.run_travel_research_agent,
+            "weather_advice": self.run_weather_agent,
+            "transport_advice": self.run_transport_agent,
+            "hotel_recommendation": self.run_hotel_agent,
+            "budget_optimizer": self.run_budget_agent,
         }
-        out = run_budget_optimizer(prompt, ctx)
-        self.agent_outputs["budget_optimizer"] = self.format_output(out)
-        return out
+
+    def adds_detail(self, prompt: str) -> bool:
+        """
+        Whether `prompt` asks for more than the current slots, intent words and
+        filler say, e.g. "hotels near Baga beach with a pool" rather than "and hotels?".
+        """
+        known = set(self.FOLLOW_UP_FILLER)
+        for patterns in self.INTENT_PATTERNS.values():
+            for pattern in patterns:
+                known.update(pattern.split())
+        for value in self.context.values():
+            if isinstance(value, str):
+                known.update(value.lower().split())
+        return any(
+            word not in known and word.rstrip("s") not in known
+            for word in self.slot_extractor.remainder(prompt)
+        )
+
+    def run_specialist(self, agent_key: str, prompt: str, run: Any = None):
+        """
+        Foreground run of a specialist agent. A prefetched result for the
+        current slot values is used instead, waiting for it if it is still
+        running, unless the user's question adds detail the generic prefetch
+        prompt didn't ask for. `run` is the itinerary run token when called as
+        a dependency graph node; those always take the prefetched result.
+        """
+        if run is None and self.adds_detail(prompt):
+            self.prefetcher.cancel(self._prefetch_session, [agent_key])
+            return self.specialist_agents()[agent_key](prompt, run=run)
+        job = self.prefetcher.claim(self._prefetch_session, agent_key, self.fingerprint(agent_key))
+        if job is not None:
+            try:
+                job.result(timeout=AGENT_NODE_TIMEOUT)
+            except Exception as e:
+                print(f"Prefetched {agent_key} unavailable, running it now: {e}")
+        with self._outputs_lock:
+            # Invalidation removes prefetched outputs whose slots changed, so any left are current
+            if agent_key in self.prefetched and agent_key in self.agent_outputs:
+                self.prefetched.discard(agent_key)
+                print(f"{agent_key}: served from prefetch")
+                return self.agent_outputs[agent_key]
+        return self.specialist_agents()[agent_key](prompt, run=run)
 
     def run_itinerary_agent(self, prompt: str):
         """
         Runs the itinerary agent.
         If dependencies (research, weather, transport, hotels, budget) are missing,
-        it will automatically run those agents before building the itinerary.
+        they are run concurrently before building the itinerary. A dependency that
+        fails or times out is left out of the itinerary context instead of aborting it.
         """
 
-        # Required agents in dependency order
-        required_agents = {
-            "travel_research": self.run_travel_research,
-            "weather_advice": self.run_weather_advice,
-            "transport_advice": self.run_transport_advice,
-            "hotel_recommendation": self.run_hotel_recommendation,
-            "budget_optimizer": self.run_budget_optimizer,
-        }
-
-        # Check and run missing agents
-        for agent_key, agent_func in required_agents.items():
-            if agent_key not in self.agent_outputs or not self.agent_outputs[agent_key].get("raw"):
-                print(f"Running missing agent: {agent_key}")
-                self.agent_outputs[agent_key] = self.format_output(agent_func(prompt))
-
-        # Now collect context
-        ctx = {
-            "research": self.agent_outputs["travel_research"]["raw"],
-            "weather": self.agent_outputs["weather_advice"]["raw"],
-            "transport": self.agent_outputs["transport_advice"]["raw"],
-            "hotels": self.agent_outputs["hotel_recommendation"]["raw"],
-            "budget": self.agent_outputs["budget_optimizer"]["raw"],
-        }
+        # Run missing agents as a dependency graph; ones still being prefetched are awaited, not rerun
+        run = object()
+        nodes = [
+            AgentNode(agent_key, partial(self.run_specialist, agent_key, prompt, run))
+            for agent_key in self.specialist_agents()
+            if agent_key not in self.agent_outputs or not self.agent_outputs[agent_key].get("raw")
+        ]
+        if nodes:
+            print(f"Running missing agents: {', '.join(node.name for node in nodes)}")
+            with self._outputs_lock:
+                self._live_runs.add(run)
+            try:
+                results = self.executor.run(nodes, on_done=self._report_node)
+            finally:
+                # Timed-out nodes keep running on abandoned threads; their late results are dropped
+                with self._outputs_lock:
+                    self._live_runs.discard(run)
+            self.node_timings = {name: res.elapsed for name, res in results.items()}
+
+        # Now collect context: the compact form of structured outputs, raw text otherwise
+        def output_of(agent_key: str, schema: str) -> Any:
+            out = self.agent_outputs.get(agent_key, {})
+            return structured_context(schema, out.get("structured")) or out.get("raw") or "Not available."
+
+        # Keep only the salient parts of each output, within the per-section token budgets
+        assembled = assemble_context({
+            "research": output_of("travel_research", "travel"),
+            "weather": output_of("weather_advice", "weather"),
+            "transport": output_of("transport_advice", "transport"),
+            "hotels": output_of("hotel_recommendation", "hotel"),
+            "budget": output_of("budget_optimizer", "budget"),
+        })
+        self.last_context_report = assembled
+        print(assembled.report())
 
         try:
-            out = run_itinerary_builder(prompt, ctx)
+            out = run_itinerary_builder(prompt, assembled.sections, memory=self.recalled)
         except ValueError:
             print("CrewAI interpolation error, using fallback.")
             out = {"raw": "Sorry, could not generate full itinerary, but here's what I have."}
 
-        self.agent_outputs["itinerary"] = self.format_output(out)
+        with self._outputs_lock:
+            self.agent_outputs["itinerary"] = self.format_output(out)
         return out
 
 
+    # -------------------
+    # Speculative prefetch
+    # -------------------
+    def prefetch_prompt(self) -> str:
+        """A self-contained request for the current trip, for agents run ahead of the user asking."""
+        ctx = self.context
+        prompt = f"Trip to {ctx['destination']}"
+        if ctx.get("origin"):
+            prompt += f" from {ctx['origin']}"
+        prompt += f", {ctx['start_date']}" + (f" to {ctx['end_date']}" if ctx.get("end_date") else "")
+        prompt += f", {ctx.get('travelers') or 1} traveller(s)"
+        if ctx.get("budget_total"):
+            prompt += f", budget {ctx.get('budget_currency') or ''} {ctx['budget_total']}".replace("  ", " ")
+        if ctx.get("travel_mode_preference"):
+            prompt += f", preferring {ctx['travel_mode_preference']}"
+        return prompt + "."
+
+    def schedule_prefetch(self, exclude: Tuple[str, ...] = ()) -> List[str]:
+        """
+        Queue low-priority background runs of the agents a follow-up question
+        is likely to need, once destination and dates are known.
+        """
+        if not PREFETCH_ENABLED or not (self.context.get("destination") and self.context.get("start_date")):
+            return []
+        agents = self.specialist_agents()
+        prompt = self.prefetch_prompt()
+        scheduled = []
+        for agent_key in PREFETCH_AGENTS:
+            if agent_key in exclude or agent_key not in agents or agent_key in self.agent_outputs:
+                continue
+            func = partial(agents[agent_key], prompt, prefetch=True)
+            self.prefetcher.submit(self._prefetch_session, agent_key, self.fingerprint(agent_key), func)
+            scheduled.append(agent_key)
+        return scheduled
+
+    # -------------------
+    # Invalidation
+    # -------------------
+    def invalidate(self, changed_slots) -> List[str]:
+        """
+        Drop the outputs, and cancel the queued prefetches, of agents that
+        read one of `changed_slots` and whose slot fingerprint no longer
+        matches. Everything else stays reusable.
+        """
+        changed_slots = set(changed_slots)
+        affected = [key for key, slots in self.AGENT_SLOTS.items() if changed_slots & set(slots)]
+        stale = []
+        with self._outputs_lock:
+            for agent_key in affected:
+                recorded = self.output_fingerprints.get(agent_key)
+                if recorded is not None and recorded != self.fingerprint(agent_key):
+                    self.agent_outputs.pop(agent_key, None)
+                    self.output_fingerprints.pop(agent_key, None)
+                    self.prefetched.discard(agent_key)
+                    stale.append(agent_key)
+            if changed_slots:
+                # Built from every specialist output, so never reused once any slot moved
+                self.agent_outputs.pop("itinerary", None)
+        self.prefetcher.cancel(self._prefetch_session, affected)
+        self.last_invalidated = stale
+        return stale
+
+    @staticmethod
+    def _report_node(res: NodeResult):
+        line = f"{res.name}: {res.status} in {res.elapsed:.2f}s" + (f" ({res.error})" if res.error else "")
+        print(f"  {line}")
+        emit_progress(line)
+
+    # -------------------
+    # Memory
+    # -------------------
+    def recall(self, user_input: str, top_k: int = TOP_K) -> str:
+        """
+        Past context for the prompt: the session's running summary, the most
+        similar earlier Q/A and the latest turns, capped at MEMORY_CONTEXT_TOKENS.
+        """
+        relevant: List[str] = []
+        try:
+            relevant = get_vector_memory().query(self.user_id, user_input, top_k=top_k)["documents"][0]
+        except Exception as e:
+            print(f"Semantic memory unavailable, using recent history only: {e}")
+        try:
+            return get_memory_compactor().build_context(self.user_id, relevant)
+        except Exception as e:
+            print(f"Could not load session memory: {e}")
+            return "\n".join(relevant)
+
+    def remember(self, doc_id: str, text: str, metadata: Dict[str, Any]):
+        try:
+            add_memory(session_id=self.user_id, doc_id=doc_id, text=text, metadata=metadata)
+        except Exception as e:
+            print(f"Could not store memory {doc_id}: {e}")
+        try:
+            get_vector_memory().add(self.user_id, doc_id, text, metadata)
+        except Exception as e:
+            print(f"Could not index memory {doc_id}: {e}")
+        # Older turns are folded into the session summary in the background
+        get_memory_compactor().schedule(self.user_id)
+
     # -------------------
     # Orchestration
     # -------------------
     def process_user_input(self, user_input: str) -> Dict[str, Any]:
-        # Retrieve past memory from Redis
-        memory_results = query_memory(user_input, top_k=3)
-        past_context = ""
-        if memory_results and memory_results.get("documents"):
-            past_context = "\n".join(memory_results["documents"][0])
+        # Retrieve relevant past memory for this session
+        self.recalled = self.recall(user_input)
 
         # Update context
-        new_ctx = self.parse_user_prompt(user_input)
-        self.context.update({k: v for k, v in new_ctx.items() if v is not None})
+        changed = self.parse_user_prompt(user_input)
+        self.context.update(changed)
+        self.last_changed_slots = set(changed)
+        if changed:
+            stale = self.invalidate(changed)
+            if stale:
+                print(f"Context changed ({', '.join(changed)}): recomputing {', '.join(stale)}")
 
         # Classify intent
         intent = self.classify_intent(user_input)
 
-        # Run relevant agent
-        if intent == "overview":
-            response = self.run_travel_research_agent(user_input + "\nContext:\n" + past_context)
-        elif intent == "weather":
-            response = self.run_weather_agent(user_input + "\nContext:\n" + past_context)
-        elif intent == "transport":
-            response = self.run_transport_agent(user_input + "\nContext:\n" + past_context)
-        elif intent == "hotels":
-            response = self.run_hotel_agent(user_input + "\nContext:\n" + past_context)
-        elif intent == "budget":
-            response = self.run_budget_agent(user_input + "\nContext:\n" + past_context)
-        elif intent in ["itinerary", "full_planning"]:
-            response = self.run_itinerary_agent(user_input + "\nContext:\n" + past_context)
-        else:
-            response = self.run_travel_research_agent(user_input + "\nContext:\n" + past_context)
+        # Run relevant agent; background prefetches hold off meanwhile
+        agent_key = self.INTENT_AGENTS.get(intent, "travel_research")
+        with self.prefetcher.foreground():
+            if intent in ["itinerary", "full_planning"]:
+                response = self.run_itinerary_agent(user_input)
+            else:
+                response = self.run_specialist(agent_key, user_input)
+
+        # Warm up the agents the next question is likely to need
+        self.schedule_prefetch(exclude=(agent_key,))
 
         # Store conversation memory in Redis
         memory_metadata = {
@@ -238,11 +553,12 @@ class ConversationalOrchestrator:
             "timestamp": datetime.now().isoformat()
         }
         doc_id = f"{self.user_id}_{datetime.now().timestamp()}"
-        memory_text = f"Q: {user_input}\nA: {str(response)}"
-        add_memory(session_id=self.user_id,doc_id=doc_id, text=memory_text, metadata=memory_metadata)
+        answer = str(self.format_output(response).get("raw", ""))
+        memory_text = f"Q: {user_input}\nA: {answer}"
+        self.remember(doc_id, memory_text, memory_metadata)
 
         # Update local conversation history
-        self.conversation_history.append({"user": user_input, "assistant": str(response)})
+        self.conversation_history.append({"user": user_input, "assistant": answer})
 
         return {
             "intent": intent,
@@ -250,6 +566,60 @@ class ConversationalOrchestrator:
             "context": self.context
         }
 
+    def process_user_input_stream(self, user_input: str) -> Iterator[str]:
+        """
+        Streaming variant of `process_user_input`.
+        Yields the final answer as the LLM produces it (plus progress lines while
+        itinerary dependencies run). The full result, with memory already
+        persisted, is available as `self.last_result` once the stream is exhausted.
+        Structured answers stream their lead prose field (e.g. the summary) and
+        the rest of the rendered answer is yielded once parsed. If nothing was
+        streamed (e.g. a cached response) the whole answer is yielded at the end.
+        When a model tier times out mid-answer, the partial answer is ruled off
+        and the fallback tier's answer follows it.
+        """
+        _done = object()
+        chunks: "queue.Queue" = queue.Queue()
+        outcome: Dict[str, Any] = {}
+
+        def worker():
+            with stream_to(lambda kind, text: chunks.put((kind, text))):
+                try:
+                    outcome["result"] = self.process_user_input(user_input)
+                except Exception as e:
+                    outcome["error"] = e
+                finally:
+                    chunks.put(_done)
+
+        threading.Thread(target=worker, name="stream-worker", daemon=True).start()
+
+        streamed = ""
+        while True:
+            item = chunks.get()
+            if item is _done:
+                break
+            kind, text = item
+            if kind == "token":
+                streamed += text
+                yield text
+            elif kind == "discard" and streamed:
+                # The stream cannot be taken back: rule off the abandoned partial answer
+                streamed = ""
+                yield f"\n\n---\n\n_{text}_\n\n"
+            else:
+                yield f"_{text}_\n\n"
+
+        if "error" in outcome:
+            raise outcome["error"]
+        self.last_result = outcome["result"]
+        response = self.last_result["response"]
+        raw = str(response.get("raw", ""))
+        if not streamed:
+            yield raw
+        elif "structured" in response:
+            # Only the schema's lead prose field was streamed; the sections follow once parsed
+            yield raw[len(streamed):] if raw.startswith(streamed) else "\n\n" + raw
+
     # -------------------
     # Context Summary
     # -------------------
@@ -0,0 +1,170 @@
+# prefetch.py
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from config.setting import PREFETCH_MAX_WORKERS, PREFETCH_MAX_FOREGROUND
+
+
+class PrefetchJob:
+    """A speculative agent run for one session, on inputs identified by `fingerprint`."""
+
+    def __init__(self, session: str, name: str, fingerprint: str):
+        self.session = session
+        self.name = name
+        self.fingerprint = fingerprint
+        self.future: Optional[Future] = None
+        self.started = threading.Event()
+        self.cancelled = False
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self.future.result(timeout)
+
+
+class PrefetchScheduler:
+    """
+    Runs speculative agent runs at low priority on a small pool of its own.
+
+    - At most `max_workers` background runs execute at once, process-wide.
+    - A queued run only starts while fewer than `max_foreground` foreground
+      requests (see `foreground`) are in flight, so prefetch never competes
+      with a user waiting for an answer.
+    - Jobs are tagged with a fingerprint of the inputs they run on; `cancel`
+      drops a session's queued jobs whose inputs changed. A run that has
+      already started cannot be interrupted, its caller discards the stale result.
+    - A foreground request that needs a job's result `claim`s it: a job
+      that has not started yet is cancelled so the caller runs the agent
+      itself, a started one is handed over to be awaited.
+    """
+
+    def __init__(self, max_workers: int = PREFETCH_MAX_WORKERS, max_foreground: int = PREFETCH_MAX_FOREGROUND):
+        self.max_foreground = max_foreground
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._jobs: Dict[Tuple[str, str], PrefetchJob] = {}
+        self._foreground = 0
+        self._cond = threading.Condition()
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.claimed = 0
+
+    # -------------------
+    # Foreground priority
+    # -------------------
+    @contextmanager
+    def foreground(self):
+        """Mark a user-facing request as in flight; background runs wait for it."""
+        with self._cond:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._foreground -= 1
+                self._cond.notify_all()
+
+    def _may_start(self, job: PrefetchJob) -> bool:
+        return job.cancelled or self._foreground < self.max_foreground
+
+    # -------------------
+    # Scheduling
+    # -------------------
+    def submit(self, session: str, name: str, fingerprint: str, func: Callable[[], Any]) -> PrefetchJob:
+        """Queue `func` unless the same agent is already queued or running on the same inputs."""
+        key = (session, name)
+        with self._cond:
+            current = self._jobs.get(key)
+            if current is not None and current.fingerprint == fingerprint and not current.cancelled:
+                return current
+            if current is not None and not current.started.is_set():
+                current.cancelled = True
+                current.future.cancel()
+            job = self._jobs[key] = PrefetchJob(session, name, fingerprint)
+            job.future = self._pool.submit(self._run, job, func)
+            self.submitted += 1
+        return job
+
+    def _run(self, job: PrefetchJob, func: Callable[[], Any]) -> Any:
+        with self._cond:
+            self._cond.wait_for(lambda: self._may_start(job))
+            if job.cancelled:
+                self._forget(job)
+                return None
+            job.started.set()
+        try:
+            return func()
+        except Exception as e:
+            print(f"Prefetch of {job.name} failed: {e}")
+            raise
+        finally:
+            with self._cond:
+                self.completed += 1
+                self._forget(job)
+
+    def _forget(self, job: PrefetchJob):
+        if self._jobs.get((job.session, job.name)) is job:
+            del self._jobs[(job.session, job.name)]
+
+    def cancel(self, session: str, names: Optional[Iterable[str]] = None) -> int:
+        """
+        Cancel a session's queued jobs, only those for `names` if given; started
+        ones run to completion. Returns the number cancelled.
+        """
+        names = None if names is None else set(names)
+        count = 0
+        with self._cond:
+            for key, job in list(self._jobs.items()):
+                if key[0] != session or (names is not None and key[1] not in names):
+                    continue
+                if not job.started.is_set():
+                    job.cancelled = True
+                    job.future.cancel()
+                    count += 1
+                del self._jobs[key]
+            self.cancelled += count
+            self._cond.notify_all()
+        return count
+
+    def claim(self, session: str, name: str, fingerprint: str) -> Optional[PrefetchJob]:
+        """The started job for this agent on these inputs to wait on; None if the caller should run the agent itself."""
+        with self._cond:
+            job = self._jobs.get((session, name))
+            if job is None or job.fingerprint != fingerprint or job.cancelled:
+                return None
+            if not job.started.is_set():
+                job.cancelled = True
+                job.future.cancel()
+                self._forget(job)
+                self._cond.notify_all()
+                return None
+            self.claimed += 1
+            return job
+
+    def pending(self, session: str) -> Dict[str, str]:
+        with self._cond:
+            return {name: job.fingerprint for (s, name), job in self._jobs.items() if s == session}
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "claimed": self.claimed,
+                "queued_or_running": len(self._jobs),
+                "foreground": self._foreground,
+            }
+
+
+_scheduler: Optional[PrefetchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_prefetch_scheduler() -> PrefetchScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = PrefetchScheduler()
+    return _scheduler
@@ -0,0 +1,387 @@
+# slot_extractor.py
+import re
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# -------------------
+# Vocabulary
+# -------------------
+MONTHS = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+CURRENCIES = {
+    "₹": "INR", "inr": "INR", "rs": "INR", "rs.": "INR", "rupee": "INR", "rupees": "INR",
+    "$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD",
+    "€": "EUR", "eur": "EUR", "euro": "EUR", "euros": "EUR",
+    "£": "GBP", "gbp": "GBP", "pound": "GBP", "pounds": "GBP",
+}
+MULTIPLIERS = {
+    "k": 1_000, "thousand": 1_000,
+    "l": 100_000, "lac": 100_000, "lacs": 100_000, "lakh": 100_000, "lakhs": 100_000,
+    "m": 1_000_000, "mn": 1_000_000, "million": 1_000_000,
+    "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000,
+}
+MODES = {
+    "car": "car", "drive": "car", "driving": "car", "road trip": "car", "self drive": "car",
+    "flight": "flight", "flights": "flight", "fly": "flight", "flying": "flight", "plane": "flight",
+    "train": "train", "trains": "train", "rail": "train",
+    "bus": "bus", "buses": "bus",
+}
+
+# Words that end a place name ("from Delhi to Goa for 5 days" -> "Delhi", "Goa"),
+# including relative days and a month followed by a day ("to Mumbai tomorrow", "Kyoto March 3").
+# None of them, nor a month, can start one ("visit in may", "go to the beach", "visit my friends")
+_STOP = (
+    r"(?:to|from|on|for|between|with|by|in|under|during|next|this|starting|and|via|at|around|"
+    r"within|budget|we|i|leaving|departing|travell?ing|returning|of|till|until|near|nearby|"
+    r"before|after|over|into|about|"
+    r"the|a|an|some|any|all|every|each|that|these|those|there|here|"
+    r"my|our|your|his|her|their|its|it|me|us|you|them|"
+    r"today|tonight|tomorrow|yesterday|weekend|day|days|week|weeks|month|"
+    r"(?:mon|tues|wednes|thurs|fri|satur|sun)day)"
+)
+_PLACE = (
+    rf"(?!(?:{_STOP}|{MONTHS})\b)[^\W\d_]+"
+    rf"(?:[ \t'’.-]+(?!{_STOP}\b|{MONTHS}\.?\s+\d)[^\W\d_]+){{0,4}}"
+)
+_NUM = r"\d[\d,]*(?:\.\d+)?(?![\d]|[.,]\d)"
+_DATE = (
+    rf"(?:\d{{4}}-\d{{1,2}}-\d{{1,2}}"
+    rf"|\d{{1,2}}[/.-]\d{{1,2}}[/.-]\d{{2,4}}"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+{MONTHS}\.?(?:,?\s+\d{{4}})?"
+    rf"|{MONTHS}\.?\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s+\d{{4}})?)"
+)
+_CUR_SYMBOL = r"[₹$€£]"
+_CUR_WORD = r"(?:inr|rs\.?|rupees?|usd|dollars?|eur|euros?|gbp|pounds?)"
+_MULT = r"(?:k|thousand|lakhs?|lacs?|l|mn|million|m|crores?|cr)"
+_COUNT = rf"(?:\d+|{'|'.join(NUMBER_WORDS)})"
+_PEOPLE = {"people", "persons", "person", "pax", "adults", "travelers", "travellers", "guests", "friends", "of"}
+_PER_UNIT = r"(?!\s*(?:per|a|an|/)\s*(?:night|day|person|head))"
+
+# Pattern for each slot kind, matched only where one of its trigger words starts
+_SLOT_PATTERNS: Dict[str, str] = {
+    "route": rf"from\s+(?P<origin>{_PLACE})\s+to\s+(?P<destination>{_PLACE})",
+    "dest_only": (
+        rf"(?:(?:trip|travel(?:l?ing)?|going|go|fly(?:ing)?|heading|vacation|holiday)"
+        rf"(?:\s+for\s+(?P<dest_count>{_COUNT})(?:\s+(?P<dest_unit>[a-z]+))?)?\s+(?:to|in)"
+        rf"|(?:flights?|trains?|bus(?:es)?|driv(?:e|ing))\s+to"
+        rf"|(?:weather|climate|forecast|hotels?|stays?|staying)(?:\s+like)?\s+(?:in|at)"
+        rf"|(?:visit(?:ing)?|explor(?:e|ing))(?:\s+(?:to|in))?)\s+(?P<dest_name>{_PLACE})"
+    ),
+    "dates": rf"(?P<date_from>{_DATE})(?:\s*(?:to|-|–|until|till|through|and)\s*(?P<date_to>{_DATE}))?",
+    "budget_sym": rf"(?P<sym>{_CUR_SYMBOL})\s*(?P<sym_amount>{_NUM})\s*(?P<sym_mult>{_MULT}\b)?{_PER_UNIT}",
+    "budget_word": rf"(?P<word_amount>{_NUM})\s*(?P<word_mult>{_MULT}\b)?\s*(?P<cur_word>{_CUR_WORD})(?!\w){_PER_UNIT}",
+    "budget_plain": (
+        rf"budget\b[^\d₹$€£]{{0,20}}?(?P<plain_sym>{_CUR_SYMBOL})?\s*(?P<plain_amount>{_NUM})"
+        rf"\s*(?P<plain_mult>{_MULT}\b)?(?:\s*(?P<plain_cur>{_CUR_WORD})(?!\w))?{_PER_UNIT}"
+    ),
+    "travelers_count": rf"(?P<count>{_COUNT})\s+(?:people|persons?|pax|adults|travell?ers|guests|friends|of\s+us)\b",
+    "travelers_group": rf"(?:we\s+are|we're|travell?ing|group\s+of|party\s+of|family\s+of)\s+(?P<group_count>{_COUNT})\b",
+    "travelers_partner": r"my\s+(?:wife|husband|partner)\b",
+    "road_trip": r"road\s+trip\b",
+}
+# Kinds decided by the trigger word alone
+_WORD_KINDS = ("mode", "travelers_solo", "travelers_couple")
+
+_TRIGGER_KINDS: Dict[str, tuple] = {}
+
+
+def _trigger(kind: str, *words: str):
+    for word in words:
+        _TRIGGER_KINDS[word] = _TRIGGER_KINDS.get(word, ()) + (kind,)
+
+
+_trigger("mode", *(mode for mode in MODES if " " not in mode))
+_trigger("route", "from")
+_trigger("dest_only", "trip", "travel", "traveling", "travelling", "going", "go", "fly", "flying",
+         "heading", "vacation", "holiday", "visit", "visiting", "explore", "exploring",
+         "flight", "flights", "train", "trains", "bus", "buses", "drive", "driving",
+         "weather", "climate", "forecast", "hotel", "hotels", "stay", "stays", "staying")
+_trigger("dates", *"jan january feb february mar march apr april may jun june jul july aug august "
+                   "sep sept september oct october nov november dec december".split())
+_trigger("budget_plain", "budget")
+_trigger("travelers_count", *NUMBER_WORDS)
+_trigger("travelers_group", "we", "we're", "traveling", "travelling", "group", "party", "family")
+_trigger("travelers_solo", "solo")
+_trigger("travelers_couple", "couple", "honeymoon")
+_trigger("travelers_partner", "my")
+_trigger("road_trip", "road")
+
+
+@lru_cache(maxsize=None)
+def _compile(kinds: tuple) -> Tuple[tuple, Optional["re.Pattern"]]:
+    """Word-decided kinds, and one alternation (a named group per kind) for the rest."""
+    branches = [rf"(?P<{kind}>{_SLOT_PATTERNS[kind]})" for kind in kinds if kind in _SLOT_PATTERNS]
+    return tuple(k for k in kinds if k in _WORD_KINDS), re.compile("|".join(branches)) if branches else None
+
+
+# Word (lower-cased, surrounding punctuation stripped) -> (word kinds, pattern to match there)
+_TRIGGERS = {word: _compile(kinds) for word, kinds in _TRIGGER_KINDS.items()}
+# Words starting with a digit or a currency symbol
+_LEADING = {
+    **dict.fromkeys("0123456789", _compile(("dates", "budget_word", "travelers_count"))),
+    **dict.fromkeys("₹$€£", _compile(("budget_sym",))),
+}
+_PUNCT = "\"'()[],.!?;:"
+
+_DATE_FORMATS = (
+    "%Y-%m-%d", "%d-%m-%Y", "%d-%m-%y",
+    "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y",
+)
+_SHAPE_DIGITS = re.compile(r"\d")
+_SHAPE_WORDS = re.compile(r"[a-z]+")
+_shape_formats: Dict[str, Optional[str]] = {}
+
+
+def _shape(cleaned: str) -> str:
+    """'10 march 2025' -> '99 B 9999'; full month names and abbreviations need different formats."""
+    shape = _SHAPE_DIGITS.sub("9", cleaned)
+    return _SHAPE_WORDS.sub(lambda m: "B" if len(m.group()) > 3 else "b", shape)
+
+
+def _detect_format(shape: str, sample: str) -> Optional[str]:
+    """Format for a date shape, detected once per shape and reused for every later date like it."""
+    if shape in _shape_formats:
+        return _shape_formats[shape]
+    fmt = None
+    for candidate in _DATE_FORMATS:
+        try:
+            datetime.strptime(sample, candidate)
+            fmt = candidate
+            break
+        except ValueError:
+            continue
+    if fmt is not None and len(_shape_formats) < 256:
+        _shape_formats[shape] = fmt
+    return fmt
+
+
+def _clean_date(token: str) -> str:
+    token = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", token.strip().lower())
+    token = token.replace(",", " ").replace(".", " " if re.search(r"[a-z]", token) else "-")
+    token = token.replace("/", "-").replace("sept", "sep")
+    return " ".join(token.split())
+
+
+@lru_cache(maxsize=1024)
+def _normalize_date(token: str, today: date) -> Optional[str]:
+    cleaned = _clean_date(token)
+    has_year = bool(re.search(r"\d{4}|\d{1,2}-\d{1,2}-\d{2}$", cleaned))
+    if not has_year:
+        cleaned = f"{cleaned} {today.year}"
+
+    fmt = _detect_format(_shape(cleaned), cleaned)
+    if fmt is None:
+        return None
+    try:
+        parsed = datetime.strptime(cleaned, fmt).date()
+    except ValueError:
+        # Right shape, impossible date (e.g. 31-02-2025)
+        return None
+    if not has_year and parsed < today:
+        parsed = parsed.replace(year=parsed.year + 1)
+    return parsed.strftime("%Y-%m-%d")
+
+
+_today_cache = (0.0, date.min)
+
+
+def _today() -> date:
+    """date.today(), re-read at most once a minute (it consults the local timezone on every call)."""
+    global _today_cache
+    now = time.time()
+    if now - _today_cache[0] >= 60:
+        _today_cache = (now, date.fromtimestamp(now))
+    return _today_cache[1]
+
+
+def normalize_date(token: str, today: Optional[date] = None) -> Optional[str]:
+    """Normalise a date token to YYYY-MM-DD (day-first for numeric dates, as before)."""
+    return _normalize_date(token.lower(), today or _today())
+
+
+def _amount(value: str, multiplier: Optional[str]) -> int:
+    amount = float(value.replace(",", ""))
+    if multiplier:
+        amount *= MULTIPLIERS.get(multiplier.lower(), 1)
+    return int(round(amount))
+
+
+def _count(value: str) -> int:
+    return NUMBER_WORDS[value] if value in NUMBER_WORDS else int(value)
+
+
+def _place(value: str) -> str:
+    return value.strip(" .'’-").title()
+
+
+class SlotExtractor:
+    """
+    Extracts trip slots (origin, destination, dates, travel mode, budget with
+    currency, traveler count) in a single pass over the message's words.
+    Only words that can start a slot (a trigger word, a digit or a currency
+    symbol) try the small precompiled pattern for that slot, anchored there;
+    text a match consumed is not scanned again. `extract` returns only the
+    slots whose value differs from the current context, so callers can tell
+    what actually changed; `remainder` returns the words no slot was read from.
+    """
+
+    def extract_all(self, text: str, today: Optional[date] = None, spans: Optional[list] = None) -> Dict[str, Any]:
+        """All slots in `text`; the (start, end) offsets they were read from are appended to `spans` if given."""
+        slots: Dict[str, Any] = {}
+        # Single spaces between words, so each word's offset is a running sum
+        text = " ".join(text.lower().split())
+        start = consumed = 0
+        for word in text.split(" "):
+            at = start
+            start += len(word) + 1
+            if at < consumed:
+                continue
+            trigger = _TRIGGERS.get(word) or _LEADING.get(word[0])
+            if trigger is None:
+                key = word.strip(_PUNCT)
+                if key == word or not key:
+                    continue
+                trigger = _TRIGGERS.get(key) or _LEADING.get(key[0])
+                if trigger is None:
+                    continue
+                at += word.index(key)
+                word = key
+            word_kinds, pattern = trigger
+            for kind in word_kinds:
+                self._apply(slots, kind, word, None, today)
+            if word_kinds and spans is not None:
+                spans.append((at, at + len(word)))
+            m = pattern.match(text, at) if pattern is not None else None
+            if m is not None:
+                self._apply(slots, m.lastgroup, word, m, today)
+                consumed = m.end()
+                if spans is not None:
+                    spans.append((at, consumed))
+        return slots
+
+    def remainder(self, text: str) -> List[str]:
+        """Lowercased words of `text` outside every slot match, punctuation stripped."""
+        spans: list = []
+        self.extract_all(text, spans=spans)
+        text = " ".join(text.lower().split())
+        words, start = [], 0
+        for word in text.split(" "):
+            at = start
+            start += len(word) + 1
+            word = word.strip(_PUNCT)
+            if word and not any(lo <= at < hi for lo, hi in spans):
+                words.append(word)
+        return words
+
+    @staticmethod
+    def _apply(slots: Dict[str, Any], kind: str, word: str, m: Optional["re.Match"], today: Optional[date]):
+        if kind == "route":
+            slots["origin"] = _place(m.group("origin"))
+            slots["destination"] = _place(m.group("destination"))
+        elif kind == "dest_only":
+            slots.setdefault("destination", _place(m.group("dest_name")))
+            # "trip for 2 to Goa", "trip for 4 people to Goa", but not "trip for 5 days to Goa"
+            if m.group("dest_count") and (m.group("dest_unit") or "people") in _PEOPLE:
+                slots.setdefault("travelers", _count(m.group("dest_count")))
+        elif kind == "dates":
+            today = today or _today()
+            start = _normalize_date(m.group("date_from"), today)
+            end = _normalize_date(m.group("date_to"), today) if m.group("date_to") else None
+            if start:
+                slots["start_date"] = start
+            if end:
+                slots["end_date"] = end
+        elif kind == "budget_sym":
+            slots["budget_total"] = _amount(m.group("sym_amount"), m.group("sym_mult"))
+            slots["budget_currency"] = CURRENCIES[m.group("sym")]
+        elif kind == "budget_word":
+            slots["budget_total"] = _amount(m.group("word_amount"), m.group("word_mult"))
+            slots["budget_currency"] = CURRENCIES[m.group("cur_word")]
+        elif kind == "budget_plain":
+            slots["budget_total"] = _amount(m.group("plain_amount"), m.group("plain_mult"))
+            currency = m.group("plain_sym") or m.group("plain_cur")
+            if currency:
+                slots["budget_currency"] = CURRENCIES[currency]
+        elif kind == "travelers_count":
+            slots["travelers"] = _count(m.group("count"))
+        elif kind == "travelers_group":
+            slots["travelers"] = _count(m.group("group_count"))
+        elif kind == "travelers_solo":
+            slots.setdefault("travelers", 1)
+        elif kind in ("travelers_couple", "travelers_partner"):
+            slots.setdefault("travelers", 2)
+        elif kind == "mode":
+            slots.setdefault("travel_mode_preference", MODES[word])
+        elif kind == "road_trip":
+            slots.setdefault("travel_mode_preference", "car")
+
+    def extract(self, text: str, current: Optional[Dict[str, Any]] = None, today: Optional[date] = None) -> Dict[str, Any]:
+        """Slots mentioned in `text` whose value differs from `current`."""
+        current = current or {}
+        return {k: v for k, v in self.extract_all(text, today).items() if current.get(k) != v}
+
+
+CORPUS = [
+    "Plan a trip from Delhi to Goa from 10/12/2025 to 15/12/2025",
+    "We are 4 people travelling by train",
+    "budget is ₹50k for the whole trip",
+    "from São Paulo to Rio de Janeiro on 2025-11-02",
+    "2 people, flying from Mumbai to Leh Ladakh between 3rd March and 8th March",
+    "What's the weather like in Manali?",
+    "Keep it under 2 lakh rupees",
+    "family of five going to Kerala from 2025-12-20 to 2025-12-27",
+    "hotels in Jaipur under $200 per night",
+    "self drive from Bengaluru to Coorg, budget 15000",
+    "honeymoon trip to Bali, budget of 3,000 USD",
+    "how do I reach Agra",
+]
+
+
+if __name__ == "__main__":
+    # Benchmark over a corpus of user utterances: single pass vs the previous regex sequence
+    import timeit
+
+    def legacy(text: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        ctx = context.copy()
+        s = text.lower()
+        m = re.search(r"from\s+([a-z\s\-]+)\s+to\s+([a-z\s\-]+)", s)
+        if m:
+            ctx["origin"], ctx["destination"] = m.group(1).strip().title(), m.group(2).strip().title()
+        m = re.search(r"(\d{1,2}[/-]\d{1,2}[/-]\d{4})\s*(?:to|-)\s*(\d{1,2}[/-]\d{1,2}[/-]\d{4})", s)
+        if m:
+            ctx["start_date"] = datetime.strptime(m.group(1).replace("/", "-"), "%d-%m-%Y").strftime("%Y-%m-%d")
+            ctx["end_date"] = datetime.strptime(m.group(2).replace("/", "-"), "%d-%m-%Y").strftime("%Y-%m-%d")
+        if "car" in s:
+            ctx["travel_mode_preference"] = "car"
+        elif "flight" in s or "plane" in s:
+            ctx["travel_mode_preference"] = "flight"
+        elif "train" in s:
+            ctx["travel_mode_preference"] = "train"
+        m = re.search(r"budget.*?(\d+)", s)
+        if m:
+            ctx["budget_total"] = int(m.group(1))
+        m = re.search(r"(?:we are|travelling)\s*(\d+)\s*person", s)
+        if m:
+            ctx["travelers"] = int(m.group(1))
+        return ctx
+
+    extractor = SlotExtractor()
+    context: Dict[str, Any] = dict.fromkeys(
+        ("origin", "destination", "start_date", "end_date", "travel_mode_preference", "budget_total", "budget_currency")
+    )
+    context["travelers"] = 1
+    for utterance in CORPUS:
+        print(f"{utterance!r}\n    old -> {legacy(utterance, {})}\n    new -> {extractor.extract_all(utterance)}")
+
+    corpus = CORPUS * 100
+    n = 10
+    per_call = 1e6 / (n * len(corpus))
+    old = min(timeit.repeat(lambda: [legacy(u, context) for u in corpus], number=n, repeat=5))
+    new = min(timeit.repeat(lambda: [extractor.extract(u, context) for u in corpus], number=n, repeat=5))
+    print(f"\nlegacy regex sequence: {old * per_call:.1f} µs/utterance")
+    print(f"single-pass extractor: {new * per_call:.1f} µs/utterance")
@@ -0,0 +1,180 @@
+# streaming.py
+import json
+import re
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+# Sink receives (kind, text) where kind is "token", "progress" or "discard"
+# ("discard": tokens sent so far belong to an abandoned answer, text says why)
+Sink = Callable[[str, str], None]
+
+_local = threading.local()
+_registered = False
+_register_lock = threading.Lock()
+
+
+class _FinalAnswerFilter:
+    """
+    Drops the ReAct preamble (Thought / Action / Observation) of one LLM call
+    and passes through only what follows "Final Answer:".
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.passing = False
+
+    def feed(self, chunk: str) -> str:
+        if self.passing:
+            return chunk
+        self.buffer += chunk
+        idx = self.buffer.find(FINAL_ANSWER_MARKER)
+        if idx == -1:
+            return ""
+        self.passing = True
+        out = self.buffer[idx + len(FINAL_ANSWER_MARKER):].lstrip()
+        self.buffer = ""
+        return out
+
+
+class _Muted:
+    """Schema-constrained answers are JSON; they are rendered once parsed instead of streamed."""
+
+    def feed(self, chunk: str) -> str:
+        return ""
+
+
+_STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*')
+_DECODER = json.JSONDecoder(strict=False)  # LLMs put raw newlines inside strings
+
+
+class _JsonFieldFilter:
+    """
+    Streams one string field (e.g. `summary`) of a JSON final answer as its
+    characters arrive, unescaped; the rest of the answer is rendered once parsed.
+    """
+
+    def __init__(self, field: str):
+        self.answer = _FinalAnswerFilter()
+        self.key = re.compile(rf'"{re.escape(field)}"\s*:\s*"')
+        self.buffer = ""
+        self.started = False
+        self.done = False
+        self.sent = 0
+
+    def feed(self, chunk: str) -> str:
+        if self.done:
+            return ""
+        self.buffer += self.answer.feed(chunk)
+        if not self.started:
+            m = self.key.search(self.buffer)
+            if m is None:
+                return ""
+            self.started, self.buffer = True, self.buffer[m.end():]
+        body = _STRING_BODY.match(self.buffer)
+        self.done = self.buffer[body.end():body.end() + 1] == '"'
+        text = self._decode(body.group())
+        out, self.sent = text[self.sent:], max(self.sent, len(text))
+        return out
+
+    @staticmethod
+    def _decode(body: str) -> str:
+        # The value may end in a partial escape (e.g. "\u00"); decode up to the last complete one
+        for cut in range(min(len(body), 12) + 1):
+            try:
+                text = _DECODER.decode(f'"{body[:len(body) - cut]}"')
+            except ValueError:
+                continue
+            # Hold back half of a surrogate pair until the other half arrives
+            return text[:-1] if text and "\ud800" <= text[-1] <= "\udbff" else text
+        return ""
+
+
+def _on_call_started(source, event):
+    if getattr(_local, "sink", None) is not None:
+        structured = getattr(getattr(event, "from_task", None), "output_pydantic", None)
+        if structured is None:
+            _local.filter = _FinalAnswerFilter()
+        else:
+            field = getattr(structured, "STREAM_FIELD", None)
+            _local.filter = _JsonFieldFilter(field) if field else _Muted()
+
+
+def _on_chunk(source, event):
+    sink: Optional[Sink] = getattr(_local, "sink", None)
+    if sink is None:
+        return
+    text_filter = getattr(_local, "filter", None)
+    if text_filter is None:
+        text_filter = _local.filter = _FinalAnswerFilter()
+    text = text_filter.feed(event.chunk or "")
+    if text:
+        sink("token", text)
+
+
+def _register_handlers():
+    global _registered
+    if _registered:
+        return
+    with _register_lock:
+        if _registered:
+            return
+        from crewai.utilities.events import crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent
+        crewai_event_bus.register_handler(LLMCallStartedEvent, _on_call_started)
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_chunk)
+        _registered = True
+
+
+@contextmanager
+def stream_to(sink: Sink):
+    """
+    Forward LLM stream chunks emitted on the current thread to `sink`.
+    CrewAI emits chunk events synchronously on the thread running the LLM
+    call, so concurrent sessions on other threads never see each other's tokens.
+    """
+    _register_handlers()
+    previous_sink = getattr(_local, "sink", None)
+    previous_filter = getattr(_local, "filter", None)
+    _local.sink, _local.filter = sink, None
+    try:
+        yield
+    finally:
+        _local.sink, _local.filter = previous_sink, previous_filter
+
+
+class StreamRelay:
+    """
+    Forwards stream events of work moved to another thread to the sink of the
+    thread that created the relay, until `cut()`; later events are dropped.
+    """
+
+    def __init__(self):
+        self.sink: Optional[Sink] = getattr(_local, "sink", None)
+        self._lock = threading.Lock()
+        self._cut = False
+
+    def __call__(self, kind: str, text: str):
+        with self._lock:
+            if not self._cut and self.sink is not None:
+                self.sink(kind, text)
+
+    def cut(self):
+        with self._lock:
+            self._cut = True
+
+
+def emit_progress(message: str):
+    """Send a progress line to the current thread's stream, if any."""
+    sink: Optional[Sink] = getattr(_local, "sink", None)
+    if sink is not None:
+        sink("progress", message)
+
+
+def discard_stream(reason: str):
+    """Tell the current thread's stream that the answer streamed so far is abandoned and a new one follows."""
+    sink: Optional[Sink] = getattr(_local, "sink", None)
+    if sink is not None:
+        _local.filter = None
+        sink("discard", reason)
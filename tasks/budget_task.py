@@ -1,9 +1,29 @@
 # tasks/budget_task.py
-from crewai import Task, Crew
-from agents.budget_optimizer_agent import budget_optimizer
-import json
+from tasks.registry import TaskTemplate, get_task_registry
+from agents.registry import get_agent
+from tasks.schemas import BudgetPlan, structured_result
+
+TEMPLATE = TaskTemplate(
+    name="budget",
+    agent=lambda: get_agent("budget_optimizer"),
+    description=(
+        "You are a Budget Optimizer. "
+        "Main request: {user_prompt}. "
+        "Additional context: {context}. "
+        "Earlier conversation, for reference only: {memory}. "
+        "Use the provided context (transport_estimates, hotel_options, meal_estimate, activities) "
+        "along with the user prompt to create a cost-optimized trip plan. "
+        "Fill in: currency, total_estimate, per_day (daily costs in order), "
+        "line_items (transport, accommodation, food, activities, misc), "
+        "suggested_savings and alternatives (cheaper options).\n"
+    ),
+    expected_output="A cost breakdown with line items matching the BudgetPlan schema.",
+    output_pydantic=BudgetPlan,
+)
+crew_pool = get_task_registry().register(TEMPLATE)
 
-def run_budget_optimizer(user_prompt: str, context: dict):
+
+def run_budget_optimizer(user_prompt: str, context: dict, memory: str = "", bypass_cache: bool = False, refresh_cache: bool = False):
     """
     Runs the Budget Optimizer agent with user input and context.
     
@@ -12,51 +32,18 @@ def run_budget_optimizer(user_prompt: str, context: dict):
             (e.g., "Optimize trip for 7 days under $2000").
         context (dict): Prior task outputs 
             (e.g., transport_estimates, hotel_options, meal_estimate, activities).
+        memory (str): Recalled conversation; a run with it skips the response cache.
+        bypass_cache (bool): Skip the LLM response cache for this call.
+        refresh_cache (bool): Re-run the crew and overwrite any cached response.
     
     Returns:
         dict: {
-            "raw": Raw Crew output,
-            "structured": JSON-like structured output (if parsing succeeds)
+            "raw": The answer rendered as markdown (the crew output if it did not match the schema),
+            "structured": The BudgetPlan fields, or None
         }
     """
-    description = (
-        "You are a Budget Optimizer. "
-        "Main request: {user_prompt}. "
-        "Additional context: {context}. "
-        "Use the provided context (transport_estimates, hotel_options, meal_estimate, activities) "
-        "along with the user prompt to create a cost-optimized trip plan. "
-        "Return strictly paragrapgh format with the following information:\n"
-        "- total_estimate\n"
-        "- per_day_breakdown (list of daily costs)\n"
-        "- per_component_costs (transport, hotel, meals, activities)\n"
-        "- suggested_savings (list)\n"
-        "- alternatives (list of cheaper options)\n"
-    )
-
-    task = Task(
-        description=description,
-        agent=budget_optimizer,
-        expected_output="A valid paragraph format with trip budget optimization details"
-    )
-
-    crew = Crew(
-        agents=[budget_optimizer],
-        tasks=[task],
-        verbose=False
-    )
-
-
     context_str = ", ".join(f"{k}: {v}" for k, v in context.items()) if context else ""
-    inputs = {"user_prompt": str(user_prompt), "context": context_str}
-
-    result = crew.kickoff(inputs=inputs)
-
-
-    structured = None
-    if isinstance(result, str):
-        try:
-            structured = json.loads(result)
-        except Exception:
-            structured = None
+    inputs = {"user_prompt": str(user_prompt), "context": context_str, "memory": memory or "none"}
 
-    return {"raw": result, "structured": structured}
+    result = crew_pool.kickoff(inputs, bypass=bypass_cache, refresh=refresh_cache)
+    return structured_result(result, BudgetPlan)
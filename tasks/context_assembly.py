@@ -0,0 +1,163 @@
+# tasks/context_assembly.py
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config.setting import ITINERARY_SECTION_TOKENS, ITINERARY_SECTION_BUDGETS
+from utils.tokens import count_tokens, truncate_to_tokens
+
+# -------------------
+# Salience patterns
+# -------------------
+_PRICE = r"(?:[₹$€£]\s?\d[\d,.]*\s?(?:k|lakh)?|\b\d[\d,.]*\s?(?:inr|rs\.?|rupees|usd|eur)\b)"
+_DATE = (
+    r"(?:\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}[/-]\d{1,2}(?:[/-]\d{2,4})?\b|\bday\s+\d+\b"
+    r"|\b(?:mon|tues|wednes|thurs|fri|satur|sun)day\b"
+    r"|\b\d{1,2}(?:st|nd|rd|th)?\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b"
+    r"|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}\b)"
+)
+_DURATION = r"\b\d+(?:\.\d+)?\s?(?:h|hrs?|hours?|mins?|minutes?)\b"
+_DISTANCE = r"\b\d[\d,.]*\s?(?:km|kilometers?|kilometres?|miles?)\b"
+_TEMPERATURE = r"-?\d+(?:\.\d+)?\s?°\s?[cf]?|\b\d+(?:\.\d+)?\s?(?:degrees|deg)\b"
+_PLACE_WORDS = (
+    r"\b(?:fort|palace|temple|mahal|museum|beach|lake|market|bazaar|park|garden|church|mosque|monastery"
+    r"|falls|waterfall|valley|peak|trek|cave|island|ghat|square|cathedral|old town|viewpoint|national park)\b"
+)
+_WEATHER_WORDS = r"\b(?:rain|showers?|storm|sunny|clear|cloudy|humid|humidity|snow|fog|wind|monsoon|uv)\b|\d+\s?%"
+_MODE_WORDS = r"\b(?:train|flight|bus|car|taxi|cab|drive|metro|ferry|airport|station|route|via)\b"
+_STAY_WORDS = r"\b(?:hotel|resort|inn|hostel|homestay|villa|guest ?house|lodge|suites?|per night|/night|rating|stars?|★)\b"
+_BUDGET_WORDS = r"\b(?:total|budget|per person|per day|accommodation|food|transport|activities|misc|savings?)\b|\d+\s?%"
+
+# Section -> [(pattern, weight)]; a line's salience is the weighted count of matches
+SECTION_PATTERNS: Dict[str, List[Tuple[str, float]]] = {
+    "research": [(_PLACE_WORDS, 2.0), (_PRICE, 1.0), (r"\b(?:timings?|open|closed|entry|ticket)\b", 1.0)],
+    "weather": [(_DATE, 2.0), (_TEMPERATURE, 2.0), (_WEATHER_WORDS, 1.0)],
+    "transport": [(_DURATION, 2.0), (_DISTANCE, 1.5), (_MODE_WORDS, 1.0), (_PRICE, 1.0)],
+    "hotels": [(_STAY_WORDS, 2.0), (_PRICE, 2.0), (r"\b\d(?:\.\d)?\s?/\s?(?:5|10)\b", 1.0)],
+    "budget": [(_PRICE, 2.0), (_BUDGET_WORDS, 1.0)],
+}
+_COMPILED = {
+    section: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in patterns]
+    for section, patterns in SECTION_PATTERNS.items()
+}
+# Proper-noun runs ("Amber Fort", "Hawa Mahal") are salient in every section
+_PROPER_NOUNS = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b")
+
+_REACT_NOISE = re.compile(r"^\s*(?:thought|action|action input|observation)\s*:", re.IGNORECASE)
+# Leading bullets and rules; a "-" only when whitespace follows, so "-3°C" keeps its sign
+_DECORATION = re.compile(r"^(?:[\s>*#•=|]|-+(?=\s|$))+|[*_`#|]+")
+# Sentence ends, except after abbreviations that precede a number or name ("Rs. 500", "St. Mary's")
+_ABBREVIATIONS = ("rs", "approx", "st", "mt", "dr", "mr", "mrs", "ms", "no", "nos", "vs", "e.g", "i.e", "ft")
+_LINE_SPLIT = re.compile(
+    r"\n+|(?<=[.!?])"
+    + "".join(rf"(?<!\b(?i:{re.escape(abbr)})\.)" for abbr in _ABBREVIATIONS)
+    + r"\s+(?=[A-Z0-9])"
+)
+MAX_LINE_TOKENS = 60
+
+
+@dataclass
+class AssembledContext:
+    sections: Dict[str, str]
+    original_tokens: Dict[str, int] = field(default_factory=dict)
+    assembled_tokens: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def tokens_before(self) -> int:
+        return sum(self.original_tokens.values())
+
+    @property
+    def tokens_after(self) -> int:
+        return sum(self.assembled_tokens.values())
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def report(self) -> str:
+        parts = ", ".join(
+            f"{name} {self.original_tokens[name]}->{self.assembled_tokens[name]}" for name in self.sections
+        )
+        return (f"itinerary context: {self.tokens_before} -> {self.tokens_after} tokens "
+                f"({self.tokens_saved} saved; {parts})")
+
+
+def _clean_lines(text: str) -> List[str]:
+    lines, seen = [], set()
+    for line in _LINE_SPLIT.split(text):
+        if _REACT_NOISE.match(line):
+            continue
+        line = " ".join(_DECORATION.sub(" ", line).split()).replace(" :", ":")
+        # Braces would be read as task placeholders by CrewAI's interpolation
+        line = line.replace("{", "(").replace("}", ")")
+        key = line.casefold()
+        if len(line) < 3 or key in seen:
+            continue
+        seen.add(key)
+        lines.append(truncate_to_tokens(line, MAX_LINE_TOKENS))
+    return lines
+
+
+def _salience(section: str, line: str) -> float:
+    score = sum(weight * len(pattern.findall(line)) for pattern, weight in _COMPILED.get(section, []))
+    return score + 0.5 * len(_PROPER_NOUNS.findall(line))
+
+
+def extract_salient(section: str, text: str, budget: int) -> str:
+    """
+    The most informative lines of `text` for `section`, kept in their original
+    order and fitted into `budget` tokens. Text already within budget is only
+    cleaned; text with nothing salient falls back to its opening lines.
+    """
+    text = str(text or "").strip()
+    if not text:
+        return ""
+    lines = _clean_lines(text)
+    cleaned = "\n".join(lines)
+    if count_tokens(cleaned) <= budget:
+        return cleaned
+
+    scored = [(i, _salience(section, line), count_tokens(line) + 1) for i, line in enumerate(lines)]
+    ranked = sorted((s for s in scored if s[1] > 0), key=lambda s: (-s[1] / s[2], s[0]))
+    if not ranked:
+        ranked = scored  # nothing matched: keep the opening lines
+
+    chosen, used = [], 0
+    for index, _, cost in ranked:
+        if used + cost > budget:
+            continue
+        chosen.append(index)
+        used += cost
+    if not chosen:
+        return truncate_to_tokens(cleaned, budget)
+    return "\n".join(lines[i] for i in sorted(chosen))
+
+
+def assemble(sections: Dict[str, str], budgets: Optional[Dict[str, int]] = None,
+             default_budget: int = ITINERARY_SECTION_TOKENS) -> AssembledContext:
+    """Fit every section into its token budget and measure the saving."""
+    budgets = {**ITINERARY_SECTION_BUDGETS, **(budgets or {})}
+    result = AssembledContext(sections={})
+    for name, text in sections.items():
+        text = str(text or "")
+        extracted = extract_salient(name, text, budgets.get(name, default_budget)) or text
+        result.sections[name] = extracted
+        result.original_tokens[name] = count_tokens(text)
+        result.assembled_tokens[name] = count_tokens(extracted)
+    return result
+
+
+if __name__ == "__main__":
+    # Demo on a synthetic, verbose agent output
+    research = (
+        "Thought: I should search for attractions.\nAction: Google Serper Search\n"
+        + "Jaipur, the Pink City, is famous for its rich history and vibrant culture. " * 20
+        + "\n- **Amber Fort**: open 8am-5:30pm, entry ₹200.\n- Hawa Mahal: best at sunrise, entry ₹50.\n"
+        + "- City Palace museum, entry ₹300.\n- Nahargarh Fort for sunset views.\n"
+        + "Many travellers enjoy exploring the local cuisine and culture of the region. " * 20
+    )
+    weather = "\n".join(f"Day {d}: 2025-12-{9 + d}, sunny, 24°C / 11°C, 0% rain. Pleasant weather overall." for d in range(1, 6))
+    assembled = assemble({"research": research, "weather": weather}, budgets={"research": 80, "weather": 60})
+    for name, text in assembled.sections.items():
+        print(f"--- {name}\n{text}")
+    print(assembled.report())
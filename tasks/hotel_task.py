@@ -1,39 +1,36 @@
 # tasks/hotel_task.py
-from crewai import Task, Crew
-from agents.hotel_recommendation_agent import hotel_recommender
+from tasks.registry import TaskTemplate, get_task_registry
+from agents.registry import get_agent
+from tasks.schemas import HotelOptions, structured_result
 
-def run_hotel_recommendation(user_prompt: str, context: dict):
-    """
-    Runs the Hotel Recommender agent.
-    Context expected keys: destination, budget_per_night or total_budget, 
-    travelers, neighborhoods_of_interest
-    Returns raw + structured (if parsed later).
-    """
-    description = (
+TEMPLATE = TaskTemplate(
+    name="hotel",
+    agent=lambda: get_agent("hotel_recommender"),
+    description=(
         "Recommend hotels/alternatives in destination within given budget and near attractions/neighborhoods. "
         "Main request: {user_prompt}. "
         "Additional context: {context}. "
-        "Output should be paragrapgh structure and include grouped suggestions "
-        "by budget (budget/mid/luxury), with name, brief notes, approximate price, "
-        "and booking tips."
-    )
-
-    task = Task(
-        description=description,
-        agent=hotel_recommender,
-        expected_output="A valid paragraph format with Hotel recommendations grouped by budget"
-    )
+        "Earlier conversation, for reference only: {memory}. "
+        "Fill in options across price bands (budget/mid/luxury), each with name, area, "
+        "price_per_night, currency and brief notes, plus booking_tips and sources."
+    ),
+    expected_output="Hotel options with price bands matching the HotelOptions schema.",
+    output_pydantic=HotelOptions,
+)
+crew_pool = get_task_registry().register(TEMPLATE)
 
-    crew = Crew(
-        agents=[hotel_recommender],
-        tasks=[task],
-        verbose=False,
-    )
 
+def run_hotel_recommendation(user_prompt: str, context: dict, memory: str = "", bypass_cache: bool = False, refresh_cache: bool = False):
+    """
+    Runs the Hotel Recommender agent.
+    Context expected keys: destination, budget_per_night or total_budget, 
+    travelers, neighborhoods_of_interest
+    `memory` (recalled conversation) is part of the prompt; a run with it skips the response cache.
+    Returns the rendered answer ("raw") and the HotelOptions fields ("structured").
+    """
     # stringify context for safe interpolation
     context_str = ", ".join(f"{k}: {v}" for k, v in context.items())
-    inputs = {"user_prompt": user_prompt, "context": context_str}
-
-    result = crew.kickoff(inputs=inputs)
+    inputs = {"user_prompt": user_prompt, "context": context_str, "memory": memory or "none"}
 
-    return {"raw": result, "structured": None}
+    result = crew_pool.kickoff(inputs, bypass=bypass_cache, refresh=refresh_cache)
+    return structured_result(result, HotelOptions)
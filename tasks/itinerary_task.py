@@ -1,47 +1,50 @@
 # tasks/itinerary_task.py
-from crewai import Task, Crew
-from agents.itinerary_builder import itinerary_planner
+from tasks.registry import TaskTemplate, get_task_registry
+from agents.registry import get_agent
 
-def run_itinerary_builder(user_prompt: str, context: dict):
-    """
-    Runs the Itinerary Builder agent.
-    Context should include aggregated outputs from: travel_research, weather, transport, hotels, budget.
-    The itinerary builder will create a day-by-day plan and return it in paragraph format (not JSON).
-    """
-    description = f"""
+SECTIONS = ("research", "weather", "transport", "hotels", "budget")
+
+TEMPLATE = TaskTemplate(
+    name="itinerary",
+    agent=lambda: get_agent("itinerary_planner"),
+    description="""
     You are creating a day-by-day travel itinerary.
 
     User Request:
     {user_prompt}
 
+    Earlier Conversation (for reference only):
+    {memory}
+
     Supporting Context:
-    - Travel Research: {context.get("research")}
-    - Weather: {context.get("weather")}
-    - Transport: {context.get("transport")}
-    - Hotels: {context.get("hotels")}
-    - Budget: {context.get("budget")}
+    - Travel Research: {research}
+    - Weather: {weather}
+    - Transport: {transport}
+    - Hotels: {hotels}
+    - Budget: {budget}
 
     Instructions:
     Write the complete itinerary in a natural, narrative style.
     Each day should be written in paragraph format, like a travel blog or guidebook.
     Do NOT use JSON, bullet points, or lists.
     Just write flowing text with transitions.
-    """
+    """,
+    expected_output="A detailed day-by-day itinerary written as natural language paragraphs only",
+)
+crew_pool = get_task_registry().register(TEMPLATE)
 
-    task = Task(
-        description=description,
-        agent=itinerary_planner,
-        expected_output="A detailed day-by-day itinerary written as natural language paragraphs only"
-    )
 
-    crew = Crew(
-        agents=[itinerary_planner],
-        tasks=[task],
-        verbose=False
-    )
-
-    inputs = {"user_prompt": user_prompt, **context}
-    result = crew.kickoff(inputs=inputs)
+def run_itinerary_builder(user_prompt: str, context: dict, memory: str = "", bypass_cache: bool = False, refresh_cache: bool = False):
+    """
+    Runs the Itinerary Builder agent.
+    Context should include aggregated outputs from: travel_research, weather, transport, hotels, budget.
+    The itinerary builder will create a day-by-day plan and return it in paragraph format (not JSON).
+    `memory` (recalled conversation) is part of the prompt; a run with it skips the response cache.
+    """
+    # Sections are filled in as task inputs, so every missing one still renders
+    sections = {name: str(context.get(name)) for name in SECTIONS}
+    inputs = {"user_prompt": user_prompt, **context, **sections, "memory": memory or "none"}
+    result = crew_pool.kickoff(inputs, bypass=bypass_cache, refresh=refresh_cache)
 
     if isinstance(result, dict):
         # safely return "final_output" if present
@@ -50,4 +53,3 @@ def run_itinerary_builder(user_prompt: str, context: dict):
         return str(result.final_output)
     else:
         return str(result)
-
@@ -0,0 +1,186 @@
+# tasks/registry.py
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional
+
+from config.setting import CREW_POOL_MAX_IDLE
+from db.cache import cached_kickoff
+
+if TYPE_CHECKING:
+    from crewai import Agent, Crew
+
+
+@dataclass(frozen=True)
+class TaskTemplate:
+    """
+    Everything needed to build a single-task crew. `description` uses
+    `{placeholders}` that are filled from the kickoff inputs on every run,
+    so one template serves all requests. With `output_pydantic` the answer
+    is constrained to that schema (see tasks/schemas.py).
+    """
+    name: str
+    agent: Callable[[], "Agent"]
+    description: str
+    expected_output: str
+    output_pydantic: Optional[type] = None
+
+
+class CrewPool:
+    """
+    Idle, prebuilt crews for one template.
+
+    A Crew (and its agent executor) is mutated by `kickoff`, so a crew is only
+    ever used by one request at a time: `lease` hands out an idle crew or
+    builds a new one, and takes it back afterwards. Every pooled crew has its
+    own copy of the agent; tools and the LLM client are shared. At most
+    `max_idle` crews are kept, extra ones built under load are dropped.
+    """
+
+    def __init__(self, template: TaskTemplate, max_idle: int = CREW_POOL_MAX_IDLE):
+        self.template = template
+        self.max_idle = max_idle
+        self._idle: "deque[Crew]" = deque()
+        self._lock = threading.Lock()
+        self.built = 0
+        self.reused = 0
+
+    def _build(self) -> "Crew":
+        # crewai is imported on first build, not when task modules are imported
+        from crewai import Crew, Task
+        agent = self.template.agent().copy()
+        task = Task(
+            description=self.template.description,
+            expected_output=self.template.expected_output,
+            agent=agent,
+            output_pydantic=self.template.output_pydantic,
+        )
+        with self._lock:
+            self.built += 1
+        return Crew(agents=[agent], tasks=[task], verbose=False)
+
+    def warm(self, count: int = 1):
+        """Build crews ahead of time, e.g. at startup, up to `max_idle`."""
+        crews = [self._build() for _ in range(min(count, self.max_idle) - len(self._idle))]
+        with self._lock:
+            self._idle.extend(crews)
+
+    @contextmanager
+    def lease(self):
+        with self._lock:
+            crew = self._idle.pop() if self._idle else None
+            if crew is not None:
+                self.reused += 1
+        if crew is None:
+            crew = self._build()
+        try:
+            yield crew
+        finally:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(crew)
+
+    def kickoff(self, inputs: Dict[str, Any], bypass: bool = False, refresh: bool = False):
+        """Run the template with per-request `inputs` through the LLM response cache."""
+        with self.lease() as crew:
+            return cached_kickoff(crew, inputs, self.template.name, bypass=bypass, refresh=refresh)
+
+    def stats(self) -> Dict[str, int]:
+        return {"built": self.built, "reused": self.reused, "idle": len(self._idle)}
+
+
+class TaskRegistry:
+    """Task templates by name, each with its own pool of prebuilt crews."""
+
+    def __init__(self, max_idle: int = CREW_POOL_MAX_IDLE):
+        self.max_idle = max_idle
+        self._pools: Dict[str, CrewPool] = {}
+        self._lock = threading.Lock()
+
+    def register(self, template: TaskTemplate) -> CrewPool:
+        with self._lock:
+            pool = self._pools.get(template.name)
+            if pool is None or pool.template != template:
+                pool = self._pools[template.name] = CrewPool(template, self.max_idle)
+            return pool
+
+    def pool(self, name: str) -> CrewPool:
+        try:
+            return self._pools[name]
+        except KeyError:
+            raise KeyError(f"No task template registered as {name!r}") from None
+
+    def kickoff(self, name: str, inputs: Dict[str, Any], bypass: bool = False, refresh: bool = False):
+        return self.pool(name).kickoff(inputs, bypass=bypass, refresh=refresh)
+
+    def warm(self, names: Optional[Iterable[str]] = None, count: int = 1):
+        for name in names or list(self._pools):
+            self.pool(name).warm(count)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+
+_registry: Optional[TaskRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_task_registry() -> TaskRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TaskRegistry()
+    return _registry
+
+
+if __name__ == "__main__":
+    # Per-call overhead of building Task + Crew on every call vs. leasing a
+    # prebuilt crew, with the LLM stubbed out and the response cache bypassed:
+    #   CREWAI_DISABLE_TELEMETRY=true python -m tasks.registry
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from crewai import Agent, Crew, Task
+    from crewai.llms.base_llm import BaseLLM
+
+    class StubLLM(BaseLLM):
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+            return "Thought: I now know the final answer\nFinal Answer: ok"
+
+    prototype = Agent(role="Travel Researcher", goal="Research {query}", backstory="Benchmark agent.",
+                      llm=StubLLM(model="stub"), verbose=False)
+    template = TaskTemplate(
+        name="bench",
+        agent=lambda: prototype,
+        description="Research attractions for {query}. Additional context: {context}.",
+        expected_output="A paragraph.",
+    )
+
+    def per_call(inputs):
+        agent = prototype.copy()
+        task = Task(description=template.description, expected_output=template.expected_output, agent=agent)
+        crew = Crew(agents=[agent], tasks=[task], verbose=False)
+        return cached_kickoff(crew, inputs, "bench", bypass=True)
+
+    registry = TaskRegistry()
+    pool = registry.register(template)
+
+    def pooled(inputs):
+        return pool.kickoff(inputs, bypass=True)
+
+    runs = 200
+    inputs = [{"query": f"Trip {i} to Jaipur", "context": "3 days, 2 travellers"} for i in range(runs)]
+    for label, run in (("build per call", per_call), ("prebuilt pool", pooled)):
+        run(inputs[0])  # warm-up
+        start = time.perf_counter()
+        for item in inputs:
+            run(item)
+        sequential = (time.perf_counter() - start) / runs * 1000
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            start = time.perf_counter()
+            outputs = list(executor.map(run, inputs))
+            concurrent = (time.perf_counter() - start) / runs * 1000
+        assert all(str(out) == "ok" for out in outputs)
+        print(f"{label:>15}: {sequential:.2f} ms/call sequential, {concurrent:.2f} ms/call with 5 threads")
+    print("pool:", pool.stats())
@@ -0,0 +1,323 @@
+# tasks/schemas.py
+import json
+import re
+from abc import abstractmethod
+from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple, Type
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+
+def _money(amount: Optional[float], currency: Optional[str]) -> str:
+    if amount is None:
+        return ""
+    return f"{currency + ' ' if currency else ''}{amount:,.0f}"
+
+
+class StructuredOutput(BaseModel):
+    """
+    Base for task output schemas. `sections` lists (heading, lines); the UI
+    renders all of them as markdown, downstream prompts only get the
+    `CONTEXT_SECTIONS` as compact text. `STREAM_FIELD` names the prose field
+    rendered first, streamed while the JSON answer is still being generated.
+    """
+    CONTEXT_SECTIONS: ClassVar[Tuple[str, ...]] = ()
+    STREAM_FIELD: ClassVar[Optional[str]] = None
+
+    @abstractmethod
+    def sections(self) -> List[Tuple[str, List[str]]]:
+        ...
+
+    def to_markdown(self) -> str:
+        blocks = []
+        for heading, lines in self.sections():
+            if not lines:
+                continue
+            if heading:
+                blocks.append(f"**{heading}**\n" + "\n".join(f"- {line}" for line in lines))
+            else:
+                blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+    def to_context(self) -> str:
+        return "\n".join(
+            f"{heading}: " + "; ".join(lines)
+            for heading, lines in self.sections()
+            if heading in self.CONTEXT_SECTIONS and lines
+        )
+
+
+# -------------------
+# Travel research
+# -------------------
+class Attraction(BaseModel):
+    name: str
+    description: str = Field("", description="One sentence on why it is worth visiting")
+    entry_fee: Optional[str] = Field(None, description="e.g. 'INR 200', 'free'")
+    timings: Optional[str] = Field(None, description="Opening hours, e.g. '8am-5:30pm'")
+
+    def line(self) -> str:
+        extras = ", ".join(x for x in (self.timings, self.entry_fee) if x)
+        return f"{self.name}" + (f" ({extras})" if extras else "") + (f": {self.description}" if self.description else "")
+
+
+class TravelResearch(StructuredOutput):
+    CONTEXT_SECTIONS = ("Top attractions", "Hidden gems", "Tips")
+    STREAM_FIELD = "summary"
+
+    summary: str = Field(description="3-5 sentence overview of the destination")
+    top_attractions: List[Attraction] = []
+    hidden_gems: List[Attraction] = []
+    practical_tips: List[str] = []
+    sources: List[str] = Field([], description="URLs")
+
+    def sections(self):
+        return [
+            ("", [self.summary]),
+            ("Top attractions", [a.line() for a in self.top_attractions]),
+            ("Hidden gems", [a.line() for a in self.hidden_gems]),
+            ("Tips", self.practical_tips),
+            ("Sources", self.sources),
+        ]
+
+
+# -------------------
+# Weather
+# -------------------
+class DailyForecast(BaseModel):
+    date: str = Field(description="YYYY-MM-DD")
+    min_temp_c: Optional[float] = None
+    max_temp_c: Optional[float] = None
+    conditions: str = Field("", description="e.g. 'sunny', 'light rain'")
+    precipitation_chance: Optional[int] = Field(None, description="Percent, 0-100")
+    warnings: List[str] = []
+
+    def line(self) -> str:
+        parts = [self.conditions] if self.conditions else []
+        if self.min_temp_c is not None and self.max_temp_c is not None:
+            parts.append(f"{self.min_temp_c:.0f}-{self.max_temp_c:.0f}°C")
+        if self.precipitation_chance is not None:
+            parts.append(f"rain {self.precipitation_chance}%")
+        parts += self.warnings
+        return f"{self.date}: " + ", ".join(parts)
+
+
+class WeatherReport(StructuredOutput):
+    CONTEXT_SECTIONS = ("Forecast", "Safety", "Advice")
+    STREAM_FIELD = "quick_summary"
+
+    quick_summary: str
+    daily_forecasts: List[DailyForecast] = []
+    activity_advice: str = ""
+    travel_safety: Literal["Safe", "Unsafe"] = "Safe"
+    sources: List[str] = Field([], description="URLs")
+
+    @field_validator("travel_safety", mode="before")
+    @classmethod
+    def _safety(cls, value: Any) -> str:
+        return "Unsafe" if str(value).strip().lower().startswith("unsafe") else "Safe"
+
+    def sections(self):
+        return [
+            ("", [self.quick_summary]),
+            ("Forecast", [day.line() for day in self.daily_forecasts]),
+            ("Advice", [self.activity_advice] if self.activity_advice else []),
+            ("Safety", [self.travel_safety]),
+            ("Sources", self.sources),
+        ]
+
+
+# -------------------
+# Transport
+# -------------------
+class TransportLeg(BaseModel):
+    origin: str
+    destination: str
+    mode: str = Field(description="e.g. 'train', 'flight', 'car', 'bus'")
+    duration_min: Optional[float] = None
+    distance_km: Optional[float] = None
+    cost: Optional[float] = Field(None, description="Approximate fare for the group")
+    currency: Optional[str] = None
+    notes: str = ""
+
+    def line(self) -> str:
+        parts = []
+        if self.duration_min is not None:
+            parts.append(f"{self.duration_min:.0f} min")
+        if self.distance_km is not None:
+            parts.append(f"{self.distance_km:.0f} km")
+        if self.cost is not None:
+            parts.append(_money(self.cost, self.currency))
+        line = f"{self.origin} → {self.destination} by {self.mode}"
+        return line + (f": {', '.join(parts)}" if parts else "") + (f" ({self.notes})" if self.notes else "")
+
+
+class TransportPlan(StructuredOutput):
+    CONTEXT_SECTIONS = ("Recommended", "Legs")
+
+    recommended_modes: List[str] = []
+    legs: List[TransportLeg] = []
+    route_notes: str = ""
+    safety_advice: List[str] = []
+    tips: List[str] = Field([], description="Tickets, passes, apps")
+    sources: List[str] = Field([], description="URLs")
+
+    def sections(self):
+        return [
+            ("Recommended", [", ".join(self.recommended_modes)] if self.recommended_modes else []),
+            ("Legs", [leg.line() for leg in self.legs]),
+            ("Route notes", [self.route_notes] if self.route_notes else []),
+            ("Safety", self.safety_advice),
+            ("Tips", self.tips),
+            ("Sources", self.sources),
+        ]
+
+
+# -------------------
+# Hotels
+# -------------------
+_BANDS = {"budget": "budget", "cheap": "budget", "economy": "budget", "hostel": "budget",
+          "mid": "mid", "moderate": "mid", "midrange": "mid", "standard": "mid",
+          "luxury": "luxury", "premium": "luxury", "upscale": "luxury"}
+
+
+class HotelOption(BaseModel):
+    name: str
+    area: str = Field("", description="Neighbourhood or landmark it is close to")
+    price_band: Literal["budget", "mid", "luxury"]
+    price_per_night: Optional[float] = None
+    currency: Optional[str] = None
+    notes: str = ""
+
+    @field_validator("price_band", mode="before")
+    @classmethod
+    def _band(cls, value: Any) -> str:
+        key = re.sub(r"[^a-z]", "", str(value).lower())
+        return next((band for word, band in _BANDS.items() if key.startswith(word)), "mid")
+
+    def line(self) -> str:
+        price = _money(self.price_per_night, self.currency)
+        return (f"[{self.price_band}] {self.name}" + (f", {self.area}" if self.area else "")
+                + (f": {price}/night" if price else "") + (f" ({self.notes})" if self.notes else ""))
+
+
+class HotelOptions(StructuredOutput):
+    CONTEXT_SECTIONS = ("Hotels",)
+
+    options: List[HotelOption] = []
+    booking_tips: List[str] = []
+    sources: List[str] = Field([], description="URLs")
+
+    def sections(self):
+        order = {"budget": 0, "mid": 1, "luxury": 2}
+        return [
+            ("Hotels", [o.line() for o in sorted(self.options, key=lambda o: order[o.price_band])]),
+            ("Booking tips", self.booking_tips),
+            ("Sources", self.sources),
+        ]
+
+
+# -------------------
+# Budget
+# -------------------
+class BudgetLineItem(BaseModel):
+    category: str = Field(description="transport, accommodation, food, activities or misc")
+    description: str = ""
+    amount: float
+    per: Literal["trip", "day", "night", "person"] = "trip"
+
+    @field_validator("per", mode="before")
+    @classmethod
+    def _per(cls, value: Any) -> str:
+        value = str(value or "trip").strip().lower()
+        return value if value in ("trip", "day", "night", "person") else "trip"
+
+
+class BudgetPlan(StructuredOutput):
+    CONTEXT_SECTIONS = ("Budget", "Line items", "Savings")
+
+    currency: str = "INR"
+    total_estimate: float
+    per_day: List[float] = Field([], description="Estimated spend for each day, in order")
+    line_items: List[BudgetLineItem] = []
+    suggested_savings: List[str] = []
+    alternatives: List[str] = Field([], description="Cheaper options")
+
+    def sections(self):
+        total = f"Total {_money(self.total_estimate, self.currency)}"
+        if self.per_day:
+            total += " (per day: " + ", ".join(f"{amount:,.0f}" for amount in self.per_day) + ")"
+        items = [
+            f"{item.category}: {_money(item.amount, self.currency)}"
+            + (f" per {item.per}" if item.per != "trip" else "")
+            + (f" ({item.description})" if item.description else "")
+            for item in self.line_items
+        ]
+        return [
+            ("Budget", [total]),
+            ("Line items", items),
+            ("Savings", self.suggested_savings),
+            ("Alternatives", self.alternatives),
+        ]
+
+
+# Task template name -> output schema
+SCHEMAS: Dict[str, Type[StructuredOutput]] = {
+    "travel": TravelResearch,
+    "weather": WeatherReport,
+    "transport": TransportPlan,
+    "hotel": HotelOptions,
+    "budget": BudgetPlan,
+}
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def parse_output(result: Any, schema: Type[StructuredOutput]) -> Optional[StructuredOutput]:
+    """
+    The schema instance for a crew result: CrewOutput.pydantic when CrewAI
+    validated it, else the cached/JSON dict, else a JSON object in the raw text.
+    """
+    parsed = getattr(result, "pydantic", None)
+    if isinstance(parsed, schema):
+        return parsed
+    candidates = []
+    try:
+        candidates.append(result.to_dict())
+    except Exception:
+        pass
+    match = _JSON_OBJECT.search(str(getattr(result, "raw", result)))
+    if match:
+        try:
+            candidates.append(json.loads(match.group(0)))
+        except ValueError:
+            pass
+    for data in candidates:
+        if data:
+            try:
+                return schema.model_validate(data)
+            except ValidationError:
+                continue
+    return None
+
+
+def structured_result(result: Any, schema: Type[StructuredOutput]) -> Dict[str, Any]:
+    """
+    Task return value: `structured` is the validated dict (None if the output
+    did not match the schema) and `raw` its markdown rendering, or the
+    original output when parsing failed.
+    """
+    parsed = parse_output(result, schema)
+    if parsed is None:
+        return {"raw": result, "structured": None}
+    return {"raw": parsed.to_markdown(), "structured": parsed.model_dump()}
+
+
+def to_context(name: str, structured: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Compact text of a task's structured output for downstream prompts."""
+    schema = SCHEMAS.get(name)
+    if schema is None or not structured:
+        return None
+    try:
+        return schema.model_validate(structured).to_context()
+    except ValidationError:
+        return None
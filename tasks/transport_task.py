@@ -1,38 +1,36 @@
 # tasks/transport_task.py
-from crewai import Task, Crew
-from agents.transport_advisor_agent import transport_advisor
+from tasks.registry import TaskTemplate, get_task_registry
+from agents.registry import get_agent
+from tasks.schemas import TransportPlan, structured_result
 
-def run_transport_advice(user_prompt: str, context: dict):
-    """
-    Runs the Transport Advisor agent.
-    Context should include: origin, destination, travel_mode_preference (e.g. 'car'), travelers count.
-    Returns raw result.
-    """
-    description = (
+TEMPLATE = TaskTemplate(
+    name="transport",
+    agent=lambda: get_agent("transport_advisor"),
+    description=(
         "Recommend transport options for origin -> destination and key local legs. "
         "Consider user's travel_mode_preference and any constraints in context. "
         "Main request: {user_prompt}. "
         "Additional context: {context}. "
-        "Output should include: recommended_mode(s), estimated_times, costs_estimates, in paragrapgh format  "
-        "route_notes, safety_advice, apps/tips, sources."
-    )
-
-    task = Task(
-        description=description,
-        agent=transport_advisor,
-        expected_output="A valid paragraph format with transport advice"
-    )
+        "Earlier conversation, for reference only: {memory}. "
+        "Fill in: recommended_modes, one legs entry per journey with duration_min, distance_km and cost, "
+        "route_notes, safety_advice, tips (apps, passes) and sources."
+    ),
+    expected_output="Transport legs with durations and costs matching the TransportPlan schema.",
+    output_pydantic=TransportPlan,
+)
+crew_pool = get_task_registry().register(TEMPLATE)
 
-    crew = Crew(
-        agents=[transport_advisor],
-        tasks=[task],
-        verbose=False
-    )
 
+def run_transport_advice(user_prompt: str, context: dict, memory: str = "", bypass_cache: bool = False, refresh_cache: bool = False):
+    """
+    Runs the Transport Advisor agent.
+    Context should include: origin, destination, travel_mode_preference (e.g. 'car'), travelers count.
+    `memory` (recalled conversation) is part of the prompt; a run with it skips the response cache.
+    Returns the rendered answer ("raw") and the TransportPlan fields ("structured").
+    """
     # stringify context for safe interpolation
     context_str = ", ".join(f"{k}: {v}" for k, v in context.items())
-    inputs = {"user_prompt": user_prompt, "context": context_str}
-
-    result = crew.kickoff(inputs=inputs)
+    inputs = {"user_prompt": user_prompt, "context": context_str, "memory": memory or "none"}
 
-    return {"raw": result, "structured": None}
+    result = crew_pool.kickoff(inputs, bypass=bypass_cache, refresh=refresh_cache)
+    return structured_result(result, TransportPlan)
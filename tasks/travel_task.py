@@ -1,38 +1,35 @@
 # tasks/travel_task.py
-from crewai import Task, Crew
-from agents.travel_researcher import travel_researcher
+from tasks.registry import TaskTemplate, get_task_registry
+from agents.registry import get_agent
+from tasks.schemas import TravelResearch, structured_result
 
-def run_travel_research(user_prompt: str, context: str):
+TEMPLATE = TaskTemplate(
+    name="travel",
+    agent=lambda: get_agent("travel_researcher"),
+    description=(
+        "Research attractions and local tips for the given trip. "
+        "Main request: {query}. "
+        "Additional context: {context}. "
+        "Earlier conversation, for reference only: {memory}. "
+        "Fill in: summary, top_attractions (with entry fee and timings where known), "
+        "hidden_gems, practical_tips and sources."
+    ),
+    expected_output="Attractions, hidden gems, tips and sources matching the TravelResearch schema.",
+    output_pydantic=TravelResearch,
+)
+crew_pool = get_task_registry().register(TEMPLATE)
+
+
+def run_travel_research(user_prompt: str, context: str, memory: str = "", bypass_cache: bool = False, refresh_cache: bool = False):
     """
     Runs the Travel Researcher agent.
     Args:
         user_prompt: The main query string (e.g., "Plan a 3-day trip to Manali")
         context: Dict with any additional info (e.g., {"theme": "cultural and food experiences"})
+        memory: Recalled conversation; a run with it skips the response cache
     Returns:
-        dict with raw output and placeholder for structured JSON.
+        dict with the rendered answer ("raw") and the TravelResearch fields ("structured").
     """
-    description = (
-        "Research attractions and local tips for the given trip. "
-        "Main request: {query}. "
-        "Additional context: {context}. "
-        "output should be in the paragraph format  "
-        "summary, top_attractions (list), hidden_gems (list), "
-        "practical_tips (list), sources (list)."
-    )
-    
-    task = Task(
-        description=description,
-        agent=travel_researcher,
-        expected_output="A valid paragraph format with listing of attractions, hidden gems, tips and sources."
-    )
-    
-    crew = Crew(
-        agents=[travel_researcher],
-        tasks=[task],
-        verbose=False
-    )
-    
-    inputs = {"query": user_prompt, "context": context}
-    result = crew.kickoff(inputs=inputs)
-    
-    return {"raw": result, "structured": None}
+    inputs = {"query": user_prompt, "context": context, "memory": memory or "none"}
+    result = crew_pool.kickoff(inputs, bypass=bypass_cache, refresh=refresh_cache)
+    return structured_result(result, TravelResearch)
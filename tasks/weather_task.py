@@ -1,20 +1,31 @@
 # tasks/weather_task.py
-from crewai import Task, Crew
-from agents.weather_advisor_agent import weather_advisor
+from tasks.registry import TaskTemplate, get_task_registry
+from agents.registry import get_agent
+from tasks.schemas import WeatherReport, structured_result
 
-def run_weather_advice(user_prompt: str, context: dict):
+TEMPLATE = TaskTemplate(
+    name="weather",
+    agent=lambda: get_agent("weather_advisor"),
+    description=(
+        "Provide weather forecast and explicit safety assessment for given destination and dates. "
+        "Use context.destination, context.start_date, context.end_date.. for {user_prompt} "
+        "Earlier conversation, for reference only: {memory}. "
+        "Fill in: quick_summary, one daily_forecasts entry per trip date, activity_advice, "
+        "travel_safety ('Safe'/'Unsafe') and sources."
+    ),
+    expected_output="Per-date weather and a safety verdict matching the WeatherReport schema.",
+    output_pydantic=WeatherReport,
+)
+crew_pool = get_task_registry().register(TEMPLATE)
+
+
+def run_weather_advice(user_prompt: str, context: dict, memory: str = "", bypass_cache: bool = False, refresh_cache: bool = False):
     """
     Runs the Weather Advisor agent.
     Expects context to contain keys: destination, start_date, end_date
-    Returns raw and structured placeholder.
+    `memory` (recalled conversation) is part of the prompt; a run with it skips the response cache.
+    Returns the rendered answer ("raw") and the WeatherReport fields ("structured").
     """
-    description = (
-        "Provide weather forecast and explicit safety assessment for given destination and dates. "
-        "Use context.destination, context.start_date, context.end_date.. for {user_prompt} "
-        "Output should include: quick_summary, daily_forecasts(list), activity_advice, travel_safety('Safe'/'Unsafe'), sources."
-    )
-    task = Task(description=description, agent=weather_advisor, expected_output="A valid paragraph format with listing Structured weather + safety info")
-    crew = Crew(agents=[weather_advisor], tasks=[task], verbose=False)
-    inputs = {"user_prompt": user_prompt, "context": context}
-    result = crew.kickoff(inputs=inputs)
-    return {"raw": result, "structured": None}
+    inputs = {"user_prompt": user_prompt, "context": context, "memory": memory or "none"}
+    result = crew_pool.kickoff(inputs, bypass=bypass_cache, refresh=refresh_cache)
+    return structured_result(result, WeatherReport)
@@ -0,0 +1,11 @@
+# tests/conftest.py
+import os
+import sys
+
+# No telemetry, no API keys and a fast-failing Redis for modules imported by the tests
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("REDIS_CONNECT_TIMEOUT", "0.2")
+os.environ.setdefault("PREFETCH_ENABLED", "false")
+os.environ.setdefault("GOOGLE_SURPER_API", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+# tests/test_cache.py
+from types import SimpleNamespace as NS
+
+import pytest
+
+from db import cache
+from db.cache import crew_cache_key, cached_kickoff
+
+
+class FakeCrew:
+    def __init__(self):
+        agent = NS(role="Travel Researcher", llm=NS(model="gemini/gemini-2.0-flash"))
+        self.tasks = [NS(agent=agent, description="Research {query}. Earlier: {memory}.", output_pydantic=None)]
+        self.kickoffs = 0
+
+    def kickoff(self, inputs):
+        self.kickoffs += 1
+        return NS(raw=f"answer {self.kickoffs}", to_dict=lambda: {})
+
+
+@pytest.fixture
+def llm_cache(monkeypatch):
+    store = cache.TieredCache("test-llm", ttl=60)
+    store._redis_get = lambda key: cache._MISSING
+    store._redis_set = lambda key, value, ttl: None
+    monkeypatch.setattr(cache, "llm_cache", store)
+    return store
+
+
+def test_key_depends_on_memory():
+    crew = FakeCrew()
+    private = {"query": "what about hotels?", "memory": "Q: I'm Priya, allergic to nuts, flying from Pune"}
+    public = {"query": "what about hotels?", "memory": "none"}
+    assert crew_cache_key(crew, private) != crew_cache_key(crew, public)
+
+
+def test_key_is_stable_and_input_sensitive():
+    crew = FakeCrew()
+    assert crew_cache_key(crew, {"query": "Goa", "memory": ""}) == crew_cache_key(crew, {"memory": "", "query": "Goa"})
+    assert crew_cache_key(crew, {"query": "Goa", "memory": ""}) != crew_cache_key(crew, {"query": "Goa ", "memory": ""})
+
+
+def test_runs_with_memory_are_not_cached(llm_cache):
+    crew = FakeCrew()
+    inputs = {"query": "what about hotels?", "memory": "Q: travelling with my 2 kids"}
+    cached_kickoff(crew, inputs, "hotel")
+    cached_kickoff(crew, inputs, "hotel")
+    assert crew.kickoffs == 2
+    assert llm_cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("memory", ["", "none"])
+def test_runs_without_memory_are_cached(llm_cache, memory):
+    crew = FakeCrew()
+    inputs = {"query": "what about hotels?", "memory": memory}
+    first = cached_kickoff(crew, inputs, "hotel")
+    second = cached_kickoff(crew, inputs, "hotel")
+    assert crew.kickoffs == 1
+    assert str(second) == first.raw
+
+
+class DownRedis:
+    def __init__(self):
+        self.calls = 0
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            self.calls += 1
+            raise ConnectionError("Connection refused")
+        return fail
+
+
+def test_redis_outage_backs_off(monkeypatch):
+    store = cache.TieredCache("test-outage", ttl=60, retry_after=30)
+    store._redis = DownRedis()
+    store.set("a", 1)
+    assert store.get("a") == 1  # still served from the LRU
+    assert store.get("b") is None
+    store.set_many({"c": 3})
+    assert store._redis.calls == 1
+    assert store.stats()["remote_skipped"] == 2
+
+    # Once the window has passed Redis is tried again
+    monkeypatch.setattr(store, "_down_until", 0.0)
+    assert store.get("d") is None
+    assert store._redis.calls == 2
@@ -0,0 +1,35 @@
+# tests/test_codec.py
+import json
+
+import pytest
+
+from db import codec
+
+VALUES = [
+    {"text": "Q: weather in Goa?\nA: Warm and dry, 31°C.", "metadata": {"intent": "weather"}},
+    {"raw": "Day 1: Amber Fort. " * 200, "json_dict": None},
+    ["a", 1, 2.5, None, True],
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_round_trip(value):
+    assert codec.decode(codec.encode(value)) == value
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_reads_legacy_json_bytes_and_str(value):
+    legacy = json.dumps(value)
+    assert codec.decode(legacy.encode("utf-8")) == value
+    assert codec.decode(legacy) == value
+
+
+def test_large_values_are_compressed():
+    raw = codec.encode(VALUES[1])
+    assert raw[:1] == codec.MAGIC and raw[2] & codec.FLAG_ZSTD
+    assert len(raw) < len(json.dumps(VALUES[1]))
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError, match="version"):
+        codec.decode(codec.MAGIC + bytes((99, 0)) + b"")
@@ -0,0 +1,78 @@
+# tests/test_dependency_graph.py
+import threading
+import time
+
+import pytest
+
+from orchestration import AgentNode, DependencyGraphExecutor
+
+
+@pytest.fixture
+def executor():
+    return DependencyGraphExecutor(max_workers=4, default_timeout=2.0)
+
+
+def test_independent_nodes_run_concurrently(executor):
+    barrier = threading.Barrier(3, timeout=1)
+    nodes = [AgentNode(name, barrier.wait) for name in ("research", "weather", "hotels")]
+    results = executor.run(nodes)
+    assert {name: r.status for name, r in results.items()} == {"research": "ok", "weather": "ok", "hotels": "ok"}
+
+
+def test_dependents_wait_for_their_dependencies(executor):
+    order = []
+    nodes = [
+        AgentNode("itinerary", lambda: order.append("itinerary"), depends_on=("weather", "hotels")),
+        AgentNode("weather", lambda: (time.sleep(0.05), order.append("weather"))),
+        AgentNode("hotels", lambda: order.append("hotels")),
+    ]
+    results = executor.run(nodes)
+    assert order[-1] == "itinerary"
+    assert results["itinerary"].status == "ok"
+
+
+def test_timeout_skips_dependents_without_waiting_for_the_node(executor):
+    release = threading.Event()
+    nodes = [
+        AgentNode("weather", release.wait, timeout=0.1),
+        AgentNode("itinerary", lambda: "built", depends_on=("weather",)),
+        AgentNode("hotels", lambda: "ok"),
+    ]
+    start = time.perf_counter()
+    results = executor.run(nodes)
+    release.set()
+    assert time.perf_counter() - start < 1.0
+    assert results["weather"].status == "timeout"
+    assert results["itinerary"].status == "skipped"
+    assert results["hotels"].value == "ok"
+
+
+def test_error_skips_dependents(executor):
+    def fail():
+        raise RuntimeError("ORS down")
+
+    results = executor.run([AgentNode("transport", fail), AgentNode("itinerary", lambda: 1, depends_on=("transport",))])
+    assert results["transport"].status == "error" and "ORS down" in results["transport"].error
+    assert results["itinerary"].status == "skipped"
+
+
+def test_cycle_is_skipped_not_hung(executor):
+    nodes = [
+        AgentNode("a", lambda: 1, depends_on=("b",)),
+        AgentNode("b", lambda: 2, depends_on=("a",)),
+        AgentNode("c", lambda: 3),
+    ]
+    results = executor.run(nodes)
+    assert results["a"].error == results["b"].error == "dependency cycle"
+    assert results["c"].status == "ok"
+
+
+def test_unknown_dependency_is_rejected(executor):
+    with pytest.raises(ValueError, match="unknown"):
+        executor.run([AgentNode("itinerary", lambda: 1, depends_on=("budget",))])
+
+
+def test_on_done_sees_every_node(executor):
+    seen = []
+    executor.run([AgentNode("a", lambda: 1), AgentNode("b", lambda: 2, depends_on=("a",))], on_done=lambda r: seen.append(r.name))
+    assert seen == ["a", "b"]
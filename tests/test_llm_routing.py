@@ -0,0 +1,102 @@
+# tests/test_llm_routing.py
+import time
+
+import litellm
+import pytest
+from litellm.types.utils import Delta, ModelResponse, StreamingChoices
+
+import llm_routing
+from llm_routing import TIERS, Route, RoutedLLM, routing_stats
+from streaming import stream_to
+
+FAST, STANDARD = TIERS["fast"].model, TIERS["standard"].model
+
+
+def _chunk(text: str) -> ModelResponse:
+    return ModelResponse(stream=True, choices=[StreamingChoices(delta=Delta(content=text))])
+
+
+def _stream(texts, stall: float = 0.0, error: Exception = None):
+    for text in texts:
+        yield _chunk(text)
+    time.sleep(stall)
+    if error is not None:
+        raise error
+
+
+def _steady(texts, interval: float):
+    for text in texts:
+        time.sleep(interval)
+        yield _chunk(text)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    llm_routing.reset_routing_stats()
+    yield
+    llm_routing.reset_routing_stats()
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    """Streaming litellm.completion stub: model -> callable returning the chunk iterator."""
+    streams = {}
+    monkeypatch.setattr(litellm, "completion", lambda **params: streams[params["model"]]())
+    return streams
+
+
+def _weather(budget: float) -> RoutedLLM:
+    return RoutedLLM("weather", Route(("fast", "standard"), latency_budget_s=budget), stream=True)
+
+
+def test_reports_primary_tier_model():
+    llm = RoutedLLM("weather", Route(("fast", "standard")), api_key="key")
+    assert llm.model == FAST
+    assert llm.api_key == "key"
+    assert llm.name == "routed/weather:fast>standard"
+
+
+def test_timeout_after_first_chunks_falls_back(completions):
+    timeout = litellm.Timeout("read timed out", model=FAST, llm_provider="gemini")
+    completions[FAST] = lambda: _stream(["Final ", "Answer: ", "partial "], stall=0.5, error=timeout)
+    completions[STANDARD] = lambda: _stream(["Final Answer: ", "full answer"])
+
+    assert _weather(0.2).call("Weather in Goa?") == "Final Answer: full answer"
+    stats = routing_stats()
+    assert stats["weather/fast"]["timeouts"] == 1
+    assert stats["weather/standard"]["errors"] == 0
+
+
+def test_slow_steady_stream_hits_the_deadline(completions):
+    # Each chunk arrives well within litellm's per-read timeout, the whole answer does not
+    completions[FAST] = lambda: _steady(["Final Answer: "] + ["slow "] * 20, interval=0.05)
+    completions[STANDARD] = lambda: _stream(["Final Answer: ", "quick"])
+
+    assert _weather(0.3).call("Weather in Goa?") == "Final Answer: quick"
+    assert routing_stats()["weather/fast"]["timeouts"] == 1
+
+
+def test_abandoned_stream_is_ruled_off(completions):
+    completions[FAST] = lambda: _stream(["Final Answer: ", "partial "], stall=0.5)
+    completions[STANDARD] = lambda: _stream(["Final Answer: ", "full answer"])
+
+    events = []
+    with stream_to(lambda kind, text: events.append((kind, text))):
+        _weather(0.2).call("Weather in Goa?")
+    time.sleep(0.5)  # the abandoned fast stream finishes meanwhile; nothing of it may arrive
+
+    kinds = [kind for kind, _ in events]
+    assert kinds.count("discard") == 1
+    after = "".join(text for kind, text in events[kinds.index("discard") + 1:] if kind == "token")
+    before = "".join(text for kind, text in events[:kinds.index("discard")] if kind == "token")
+    assert after == "full answer"
+    assert before == "partial "
+
+
+def test_last_tier_timeout_raises(completions):
+    completions[FAST] = lambda: _stream(["Final Answer: ", "partial "], stall=0.5)
+    completions[STANDARD] = lambda: _stream(["Final Answer: ", "partial "], stall=0.5)
+
+    with pytest.raises(TimeoutError):
+        _weather(0.2).call("Weather in Goa?")
+    assert routing_stats()["weather/standard"]["timeouts"] == 1
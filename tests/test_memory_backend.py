@@ -0,0 +1,88 @@
+# tests/test_memory_backend.py
+import fakeredis
+import pytest
+
+from db import codec
+from db.memory_backend import CachedMemoryBackend, RedisMemoryBackend
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    """FakeRedis that counts round trips: each command, or each pipeline execute."""
+
+    round_trips = 0
+
+    def execute_command(self, *args, **kwargs):
+        CountingRedis.round_trips += 1
+        return super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def counted(*args, **kwargs):
+            CountingRedis.round_trips += 1
+            return execute(*args, **kwargs)
+
+        pipe.execute = counted
+        return pipe
+
+
+@pytest.fixture
+def redis():
+    client = CountingRedis()
+    client.flushall()
+    return client
+
+
+@pytest.fixture
+def backend(redis):
+    return RedisMemoryBackend(redis)
+
+
+def _trips(redis, call):
+    before = CountingRedis.round_trips
+    result = call()
+    return result, CountingRedis.round_trips - before
+
+
+def test_reads_take_one_round_trip(backend, redis):
+    backend.add_memories("s", [("1", "Q1", {"i": 1}), ("2", "Q2", {"i": 2})], ttl=60, max_items=10)
+    backend.set_summary("s", "Goa, December", "1", ttl=60)
+
+    memories, trips = _trips(redis, lambda: backend.list_memories("s"))
+    assert trips == 1
+    assert memories == [("s:2", "Q2", {"i": 2}), ("s:1", "Q1", {"i": 1})]
+
+    (timed, summary, summary_ttl), trips = _trips(redis, lambda: backend.snapshot("s"))
+    assert trips == 1
+    assert [m[0] for m in timed] == ["s:2", "s:1"] and 59 < timed[0][3] <= 60
+    assert summary == {"text": "Goa, December", "folded_until": "1"} and 59 < summary_ttl <= 60
+
+
+def test_trim_range_and_expiry(backend, redis, monkeypatch):
+    backend.add_memories("s", [(str(i), f"Q{i}", {}) for i in range(5)], ttl=60, max_items=3)
+    assert [key for key, _, _ in backend.list_memories("s")] == ["s:4", "s:3", "s:2"]
+    assert [key for key, _, _ in backend.list_memories("s", 1, 1)] == ["s:3"]
+
+    backend.add_memories("s", [("5", "Q5", {})], ttl=600, max_items=3)
+    real_time = __import__("time").time
+    monkeypatch.setattr("db.memory_backend.time.time", lambda: real_time() + 120)
+    assert [key for key, _, _ in backend.list_memories("s")] == ["s:5"]
+
+
+def test_legacy_sessions_still_read_and_clear(backend, redis):
+    redis.set("s:old", codec.encode({"text": "old Q", "metadata": {}}), ex=60)
+    redis.lpush("s:memories", "s:old")
+    backend.add_memories("s", [("new", "new Q", {})], ttl=60, max_items=10)
+
+    assert [key for key, _, _ in backend.list_memories("s")] == ["s:new", "s:old"]
+    backend.clear_session("s")
+    assert redis.keys("*") == []
+
+
+def test_cached_backend_loads_remaining_ttls(backend):
+    backend.add_memories("s", [("1", "Q1", {})], ttl=60, max_items=10)
+    cached = CachedMemoryBackend(backend)
+    assert cached.list_memories("s") == [("s:1", "Q1", {})]
+    assert cached.list_memories("s") == [("s:1", "Q1", {})]
+    assert cached.stats()["remote_reads"] == 1
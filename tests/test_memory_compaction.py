@@ -0,0 +1,31 @@
+# tests/test_memory_compaction.py
+import pytest
+
+from db import memory_compaction
+from db.memory_compaction import MemoryCompactor
+from utils.tokens import count_tokens
+
+TURNS = [f"Q: day {i} plans in Goa?\nA: Beaches in the north, forts and a spice farm on day {i}." for i in range(6)]
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(memory_compaction, "list_memories",
+                        lambda session_id, start, end: [(f"m{i}", text, {}) for i, text in enumerate(TURNS)][start:end + 1])
+    monkeypatch.setattr(memory_compaction, "get_summary",
+                        lambda session_id: {"text": "Family of four, Goa in December, budget 80k INR, no seafood."})
+
+
+@pytest.mark.parametrize("cap", [20, 40, 60, 90, 150, 400])
+def test_context_never_exceeds_the_cap(session, cap):
+    compactor = MemoryCompactor(recent_turns=3, context_tokens=cap, turn_tokens=60)
+    context = compactor.build_context("s", relevant=["Q: hotels?\nA: Taj Holiday Village, Candolim."])
+    assert count_tokens(context) <= cap
+    assert compactor.last_context_tokens == count_tokens(context)
+
+
+def test_everything_fits_in_a_large_budget(session):
+    context = MemoryCompactor(recent_turns=2, context_tokens=2000).build_context("s", relevant=["Q: hotels?\nA: Candolim."])
+    assert context.startswith("Summary of earlier conversation:\n")
+    assert "Relevant earlier turns:\nQ: hotels?" in context
+    assert context.endswith("Recent turns (oldest first):\n" + TURNS[1] + "\n" + TURNS[0])
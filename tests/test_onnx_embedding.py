@@ -0,0 +1,14 @@
+# tests/test_onnx_embedding.py
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+
+from db import onnx_embedding
+from db.onnx_embedding import ModelNotDownloaded, OnnxMiniLM
+
+
+def test_missing_model_raises_instead_of_downloading(tmp_path, monkeypatch):
+    monkeypatch.setattr(onnx_embedding, "download_model", lambda *a, **k: pytest.fail("downloaded on the request path"))
+    with pytest.raises(ModelNotDownloaded, match="python -m db.onnx_embedding download"):
+        OnnxMiniLM(model_dir=str(tmp_path))
@@ -0,0 +1,75 @@
+# tests/test_ors_matrix.py
+import pytest
+
+from db import cache
+from tools import ors_tool
+from tools.ors_tool import _MatrixPlan, _leg_key
+
+
+class RecordingRedis:
+    """Dict-backed stand-in for the Redis client that records each round trip."""
+
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+
+    def mget(self, keys):
+        self.calls.append("mget")
+        return [self.data.get(key) for key in keys]
+
+    def get(self, key):
+        self.calls.append("get")
+        return self.data.get(key)
+
+    def pipeline(self, transaction=False):
+        redis = self
+
+        class Pipe:
+            def __init__(self):
+                self.ops = []
+
+            def setex(self, key, ttl, value):
+                self.ops.append((key, value))
+
+            def execute(self):
+                redis.calls.append("pipeline")
+                redis.data.update(self.ops)
+
+        return Pipe()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    store = cache.TieredCache("route-test", ttl=60)
+    store._redis = RecordingRedis()
+    monkeypatch.setattr(ors_tool, "route_leg_cache", store)
+    return store._redis
+
+
+POINTS = [(15.49, 73.82), (15.55, 73.75), (15.60, 73.73), (15.28, 73.96), (15.49, 73.82)]
+
+
+def test_plan_reads_all_legs_in_one_round_trip(redis):
+    plan = _MatrixPlan(POINTS, "driving-car")
+    assert redis.calls == ["mget"]
+    # Points 0 and 4 coincide: a zero leg, not a request
+    assert (0, 4) not in plan.missing
+    assert len(plan.missing) == 9
+
+
+def test_apply_writes_legs_in_one_pipeline_and_later_plans_reuse_them(redis):
+    plan = _MatrixPlan(POINTS[:3], "driving-car")
+    sources, destinations = [0, 1, 2], [0, 1, 2]
+    data = {
+        "distances": [[0, 10, 20], [10, 0, 15], [20, 15, 0]],
+        "durations": [[0, 600, 1200], [600, 0, 900], [1200, 900, 0]],
+    }
+    redis.calls.clear()
+    plan.apply(sources, destinations, data)
+    assert redis.calls == ["pipeline"]
+    assert plan.distances[0][2] == 20 and plan.durations[1][2] == 15.0
+    assert _leg_key("driving-car", POINTS[0], POINTS[1]) in {k.split("route-test:")[1] for k in redis.data}
+
+    ors_tool.route_leg_cache._lru.clear()
+    again = _MatrixPlan(POINTS[:3], "driving-car")
+    assert not again.missing and again.batches() == []
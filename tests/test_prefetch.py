@@ -0,0 +1,58 @@
+# tests/test_prefetch.py
+import threading
+
+import pytest
+
+from prefetch import PrefetchScheduler
+
+
+@pytest.fixture
+def scheduler():
+    return PrefetchScheduler(max_workers=1, max_foreground=1)
+
+
+def test_claim_hands_over_a_started_job(scheduler):
+    started, release = threading.Event(), threading.Event()
+    job = scheduler.submit("s", "weather", "fp1", lambda: (started.set(), release.wait(1), "sunny")[-1])
+    assert started.wait(1)
+    claimed = scheduler.claim("s", "weather", "fp1")
+    assert claimed is job
+    release.set()
+    assert claimed.result(timeout=1) == "sunny"
+    assert scheduler.stats()["claimed"] == 1
+
+
+def test_claim_cancels_a_queued_job(scheduler):
+    with scheduler.foreground():  # holds back background runs
+        job = scheduler.submit("s", "hotels", "fp1", lambda: "hotels")
+        assert scheduler.claim("s", "hotels", "fp1") is None
+    assert job.cancelled
+    assert scheduler.pending("s") == {}
+
+
+def test_claim_ignores_jobs_for_other_inputs(scheduler):
+    with scheduler.foreground():
+        scheduler.submit("s", "hotels", "fp-old", lambda: "stale")
+        assert scheduler.claim("s", "hotels", "fp-new") is None
+        assert scheduler.claim("other-session", "hotels", "fp-old") is None
+        assert scheduler.pending("s") == {"hotels": "fp-old"}
+
+
+def test_cancel_drops_only_the_named_queued_jobs(scheduler):
+    ran = []
+    with scheduler.foreground():
+        scheduler.submit("s", "hotels", "fp", lambda: ran.append("hotels"))
+        weather = scheduler.submit("s", "weather", "fp", lambda: ran.append("weather"))
+        other = scheduler.submit("t", "hotels", "fp", lambda: ran.append("other"))
+        assert scheduler.cancel("s", ["hotels"]) == 1
+    weather.result(timeout=1)
+    other.result(timeout=1)
+    assert sorted(ran) == ["other", "weather"]
+
+
+def test_resubmitting_the_same_inputs_reuses_the_job(scheduler):
+    with scheduler.foreground():
+        first = scheduler.submit("s", "budget", "fp", lambda: 1)
+        assert scheduler.submit("s", "budget", "fp", lambda: 2) is first
+        replaced = scheduler.submit("s", "budget", "fp2", lambda: 3)
+    assert first.cancelled and replaced.result(timeout=1) == 3
@@ -0,0 +1,27 @@
+# tests/test_search_cache.py
+import pytest
+
+from tools.search_cache import normalize_query
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Best  hotels in Goa!", "best hotels goa"),
+    ("ＧＯＡ beaches", "goa beaches"),
+    ("Things to do in Goa", "things to do in goa"),
+])
+def test_equivalent_queries_share_a_key(a, b):
+    assert normalize_query(a) == normalize_query(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("delhi goa train", "goa delhi train"),
+    ("delhi to goa train", "goa to delhi train"),
+    ("flights from goa", "flights to goa"),
+    ('"goa" -beach', "goa beach"),
+])
+def test_directional_queries_do_not(a, b):
+    assert normalize_query(a) != normalize_query(b)
+
+
+def test_all_stopword_query_is_kept():
+    assert normalize_query("The In") == "the in"
@@ -0,0 +1,87 @@
+# tests/test_slot_extractor.py
+from datetime import date
+
+import pytest
+
+from slot_extractor import SlotExtractor, normalize_date
+
+TODAY = date(2025, 6, 1)
+extractor = SlotExtractor()
+
+
+@pytest.mark.parametrize("text", [
+    "what is the best time to visit in december",
+    "is it safe to visit in may",
+    "is it worth visiting during monsoon",
+    "best hotels to visit near Baga beach",
+    "I'll visit my friends",
+    "go to the beach",
+    "how to travel to the airport",
+    "weather in december",
+    "stay in budget",
+])
+def test_no_false_destination(text):
+    assert "destination" not in extractor.extract_all(text, TODAY)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("weather in Goa on 10-12-2025", {"destination": "Goa", "start_date": "2025-12-10"}),
+    ("trip for 2 to Goa", {"destination": "Goa", "travelers": 2}),
+    ("trip for 4 people to Goa", {"destination": "Goa", "travelers": 4}),
+    ("trip for 5 days to Goa", {"destination": "Goa"}),
+    ("flights to Goa 20 Dec - 25 Dec", {
+        "travel_mode_preference": "flight", "destination": "Goa",
+        "start_date": "2025-12-20", "end_date": "2025-12-25",
+    }),
+    ("What's the weather like in Manali?", {"destination": "Manali"}),
+    ("visit Cape May", {"destination": "Cape May"}),
+    ("Plan a trip from Delhi to Goa from 10/12/2025 to 15/12/2025", {
+        "origin": "Delhi", "destination": "Goa", "start_date": "2025-12-10", "end_date": "2025-12-15",
+    }),
+    ("from São Paulo to Rio de Janeiro on 2025-11-02", {
+        "origin": "São Paulo", "destination": "Rio De Janeiro", "start_date": "2025-11-02",
+    }),
+    ("2 people, flying from Mumbai to Leh Ladakh between 3rd March and 8th March", {
+        "travelers": 2, "travel_mode_preference": "flight", "origin": "Mumbai", "destination": "Leh Ladakh",
+        "start_date": "2026-03-03", "end_date": "2026-03-08",
+    }),
+    ("family of five going to Kerala from 2025-12-20 to 2025-12-27", {
+        "travelers": 5, "destination": "Kerala", "start_date": "2025-12-20", "end_date": "2025-12-27",
+    }),
+    ("We are 4 people travelling by train", {"travelers": 4, "travel_mode_preference": "train"}),
+    ("budget is ₹50k for the whole trip", {"budget_total": 50000, "budget_currency": "INR"}),
+    ("Keep it under 2 lakh rupees", {"budget_total": 200000, "budget_currency": "INR"}),
+    ("hotels in Jaipur under $200 per night", {"destination": "Jaipur"}),
+    ("self drive from Bengaluru to Coorg, budget 15000", {
+        "travel_mode_preference": "car", "origin": "Bengaluru", "destination": "Coorg", "budget_total": 15000,
+    }),
+    ("honeymoon trip to Bali, budget of 3,000 USD", {
+        "travelers": 2, "destination": "Bali", "budget_total": 3000, "budget_currency": "USD",
+    }),
+    ("how do I reach Agra", {}),
+])
+def test_extract_all(text, expected):
+    assert extractor.extract_all(text, TODAY) == expected
+
+
+def test_extract_returns_only_changed_slots():
+    current = {"destination": "Goa", "start_date": "2025-12-10"}
+    assert extractor.extract("weather in Goa on 12-12-2025", current, TODAY) == {"start_date": "2025-12-12"}
+
+
+@pytest.mark.parametrize("text, remainder", [
+    ("hotels near Baga beach with a pool", ["hotels", "near", "baga", "beach", "with", "a", "pool"]),
+    ("budget is ₹50k for the whole trip", ["for", "the", "whole", "trip"]),
+])
+def test_remainder(text, remainder):
+    assert extractor.remainder(text) == remainder
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("10/12/2025", "2025-12-10"),
+    ("2025-11-02", "2025-11-02"),
+    ("3rd March", "2026-03-03"),
+    ("Dec 20", "2025-12-20"),
+])
+def test_normalize_date(token, expected):
+    assert normalize_date(token, TODAY) == expected
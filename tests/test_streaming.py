@@ -0,0 +1,37 @@
+# tests/test_streaming.py
+import json
+
+import pytest
+
+from streaming import _FinalAnswerFilter, _JsonFieldFilter
+
+ANSWER = "Thought: I know it\nFinal Answer: " + json.dumps({
+    "daily_forecasts": [{"date": "2025-12-10", "conditions": "sunny"}],
+    "quick_summary": 'Warm "dry" days\nhighs 31°C — pack 🕶️ and a \\ hat.',
+    "safety": ["Stay hydrated"],
+})
+SUMMARY = 'Warm "dry" days\nhighs 31°C — pack 🕶️ and a \\ hat.'
+
+
+def _feed(text_filter, text, size):
+    return "".join(text_filter.feed(text[i:i + size]) for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 13, 50, len(ANSWER)])
+def test_json_field_streams_unescaped_whatever_the_split(size):
+    assert _feed(_JsonFieldFilter("quick_summary"), ANSWER, size) == SUMMARY
+
+
+def test_json_field_never_emits_a_partial_escape():
+    text_filter = _JsonFieldFilter("quick_summary")
+    out = [text_filter.feed(piece) for piece in ('Final Answer: {"quick_summary": "a\\', "u00", "e9b", '"}')]
+    assert out == ["a", "", "éb", ""]
+
+
+def test_missing_field_streams_nothing():
+    assert _feed(_JsonFieldFilter("summary"), ANSWER, 4) == ""
+
+
+def test_final_answer_filter_drops_the_preamble():
+    text = "Thought: look up\nAction: search\nObservation: ...\nFinal Answer: Goa is warm in December."
+    assert _feed(_FinalAnswerFilter(), text, 4) == "Goa is warm in December."
@@ -0,0 +1,54 @@
+# tests/test_vector_memory.py
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from db.vector_memory import VectorMemory
+
+
+class HashEmbedder:
+    """Deterministic bag-of-words vectors, no model download."""
+
+    def embed_texts(self, texts):
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                out[row, hash(word) % 64] += 1.0
+        return out
+
+    def embed_text(self, text):
+        return self.embed_texts([text])[0]
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return VectorMemory(root=str(tmp_path), embedder_factory=HashEmbedder, loaded_sessions=1)
+
+
+def test_add_does_not_write_on_the_calling_thread(memory, monkeypatch):
+    writers = []
+    real_savez = np.savez
+    monkeypatch.setattr(np, "savez", lambda *a, **k: (writers.append(threading.current_thread().name), real_savez(*a, **k)))
+    memory.add("s1", "m1", "Q: beaches in Goa\nA: Palolem", {})
+    memory.flush()
+    assert writers and all(name.startswith("vector-memory") for name in writers)
+    assert os.path.exists(memory._path("s1"))
+
+
+def test_pending_write_survives_eviction_and_reload(memory, tmp_path):
+    memory.add("s1", "m1", "beaches in goa palolem", {})
+    memory.add("s2", "m2", "forts in jaipur amber", {})  # evicts s1 from the loaded sessions
+    assert memory.query("s1", "goa beaches", min_similarity=0.0)["documents"] == [["beaches in goa palolem"]]
+    memory.flush()
+    reopened = VectorMemory(root=str(tmp_path), embedder_factory=HashEmbedder)
+    assert reopened.query("s2", "jaipur forts", min_similarity=0.0)["documents"] == [["forts in jaipur amber"]]
+
+
+def test_clear_wins_over_a_pending_write(memory):
+    memory.add("s1", "m1", "beaches in goa", {})
+    memory.clear("s1")
+    memory.flush()
+    assert not os.path.exists(memory._path("s1"))
+    assert memory.query("s1", "goa")["documents"] == [[]]
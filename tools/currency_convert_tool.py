@@ -1,4 +1,4 @@
-import requests
+from tools import http_client
 from dotenv import load_dotenv
 import os
 
@@ -27,7 +27,7 @@ class CurrencyTool:
             "access_key": self.api_key
         }
 
-        response = requests.get(self.base_url, params=params)
+        response = http_client.get(self.base_url, params=params)
         data = response.json()
 
         if not data.get("success", False):
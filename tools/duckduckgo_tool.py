@@ -1,11 +1,26 @@
 # tools/duckduckgo_tool.py
 
+import asyncio
 from ddgs import DDGS
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
+from tools.search_cache import cached_search, acached_search
 
 def search_duckduckgo(query: str, max_results: int = 10):
+    """Search DuckDuckGo, served from the shared search cache when available."""
+    return cached_search("duckduckgo", query, max_results, lambda: _fetch_duckduckgo(query, max_results))
+
+async def asearch_duckduckgo(query: str, max_results: int = 10):
+    """
+    Async counterpart of `search_duckduckgo`.
+    ddgs has no async API, so the fetch itself runs in a worker thread.
+    """
+    return await acached_search(
+        "duckduckgo", query, max_results, lambda: asyncio.to_thread(_fetch_duckduckgo, query, max_results)
+    )
+
+def _fetch_duckduckgo(query: str, max_results: int):
     """Original search function"""
     results = []
     with DDGS() as ddg:
@@ -30,6 +45,9 @@ class DuckDuckGoSearchTool(BaseTool):
     def _run(self, query: str) -> str:
         return search_duckduckgo(query, max_results=5)
 
+    async def _arun(self, query: str) -> str:
+        return await asearch_duckduckgo(query, max_results=5)
+
 if __name__ == "__main__":
     # Test the tool
     try:
@@ -0,0 +1,208 @@
+# tools/geocode_store.py
+import difflib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from config.setting import GEOCODE_DB_PATH, GEOCODE_LRU_SIZE, GEOCODE_FUZZY_CUTOFF
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "data", "gazetteer.json")
+
+_NON_WORD = re.compile(r"[^\w\s,]")
+
+# Other ways a qualifier may name a gazetteer country ("Manchester, UK")
+_COUNTRY_ALIASES = {
+    "united kingdom": ("uk", "u k", "britain", "great britain"),
+    "united states": ("us", "u s", "usa", "u s a", "united states of america", "america"),
+    "united arab emirates": ("uae", "u a e"),
+    "czech republic": ("czechia",),
+    "south korea": ("korea", "republic of korea"),
+}
+
+
+def _strip_accents(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class GeocodeStore:
+    """
+    Persistent place-name -> (lat, lon) store backed by SQLite, with an
+    in-memory LRU in front. Seeded from the bundled gazetteer so common
+    cities and landmarks resolve without any network call.
+
+    Lookups are normalised ("New Delhi" -> "new delhi") and resolved through
+    aliases ("new delhi" -> "delhi"). A bare name that is not known is
+    fuzzy-matched against gazetteer names and aliases. A qualified name
+    ("Manali, Himachal Pradesh") matches the gazetteer entry for its first
+    component only if every other component is that entry's region or
+    country, so "Paris, Texas" is left to the geocoding API instead of
+    resolving to Paris, France. Places learned from the geocoding API only
+    ever match exactly.
+    """
+
+    def __init__(self, db_path: str = GEOCODE_DB_PATH, gazetteer_path: str = GAZETTEER_PATH,
+                 lru_size: int = GEOCODE_LRU_SIZE, fuzzy_cutoff: float = GEOCODE_FUZZY_CUTOFF):
+        self.lru_size = lru_size
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._lru: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS places (
+                key TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL,
+                source TEXT NOT NULL, updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS aliases (alias TEXT PRIMARY KEY, key TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        self._qualifiers: Dict[str, set[str]] = {}
+        self.seed(gazetteer_path)
+        self._load_names()
+
+    # -------------------
+    # Normalisation
+    # -------------------
+    def normalize(self, location: str) -> str:
+        """Canonical key: accents and punctuation stripped, case-folded."""
+        return " ".join(self._components(location))
+
+    @staticmethod
+    def _components(location: str) -> list[str]:
+        text = _NON_WORD.sub(" ", _strip_accents(str(location)).casefold())
+        parts = [" ".join(p.split()) for p in text.split(",")]
+        return [p for p in parts if p]
+
+    # -------------------
+    # Seeding
+    # -------------------
+    def seed(self, gazetteer_path: str):
+        """Load the gazetteer into SQLite once per gazetteer version."""
+        with open(gazetteer_path, encoding="utf-8") as f:
+            gazetteer = json.load(f)
+        places = gazetteer.get("places", [])
+        self._qualifiers = {}
+        for place in places:
+            names = {self.normalize(place[field]) for field in ("country", "region") if place.get(field)}
+            for country, aliases in _COUNTRY_ALIASES.items():
+                if country in names:
+                    names.update(aliases)
+            self._qualifiers[self.normalize(place["name"])] = names
+
+        version = str(gazetteer.get("version", 0))
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'gazetteer_version'").fetchone()
+        if row and row[0] == version:
+            return
+
+        now = time.time()
+        with self._lock, self._conn:
+            for place in places:
+                key = self.normalize(place["name"])
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO places (key, lat, lon, source, updated_at) VALUES (?, ?, ?, 'gazetteer', ?)",
+                    (key, place["lat"], place["lon"], now),
+                )
+                for alias in place.get("aliases", []):
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO aliases (alias, key) VALUES (?, ?)", (self.normalize(alias), key)
+                    )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('gazetteer_version', ?)", (version,)
+            )
+
+    def _load_names(self):
+        with self._lock:
+            aliases = dict(self._conn.execute("SELECT alias, key FROM aliases").fetchall())
+            gazetteer_keys = {r[0] for r in self._conn.execute("SELECT key FROM places WHERE source = 'gazetteer'")}
+        self._aliases = aliases
+        self._gazetteer_keys = gazetteer_keys
+        self._names = sorted(gazetteer_keys | set(aliases))
+
+    # -------------------
+    # Lookup
+    # -------------------
+    def _resolve(self, key: str) -> str:
+        return self._aliases.get(key, key)
+
+    def _fetch(self, key: str) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            row = self._conn.execute("SELECT lat, lon FROM places WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _lru_get(self, key: str) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            coords = self._lru.get(key)
+            if coords is not None:
+                self._lru.move_to_end(key)
+            return coords
+
+    def _lru_put(self, key: str, coords: Tuple[float, float]):
+        with self._lock:
+            self._lru[key] = coords
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def lookup(self, location: str) -> Optional[Tuple[float, float]]:
+        """Return (lat, lon) for a known location, or None if it needs geocoding."""
+        parts = self._components(location)
+        if not parts:
+            return None
+        query = " ".join(parts)
+
+        coords = self._lru_get(query)
+        if coords is not None:
+            return coords
+
+        candidates = [self._resolve(query)]
+        if len(parts) == 1:
+            # Typo tolerance only for bare names; a qualifier means the user was specific
+            close = difflib.get_close_matches(query, self._names, n=1, cutoff=self.fuzzy_cutoff)
+            if close:
+                candidates.append(self._resolve(close[0]))
+        else:
+            first = self._resolve(parts[0])
+            qualifiers = self._qualifiers.get(first, set())
+            if first in self._gazetteer_keys and all(part in qualifiers for part in parts[1:]):
+                candidates.append(first)
+
+        for key in candidates:
+            coords = self._fetch(key)
+            if coords is not None:
+                self._lru_put(query, coords)
+                return coords
+        return None
+
+    def save(self, location: str, lat: float, lon: float, source: str = "ors"):
+        """Persist a geocoding result under the normalised location name."""
+        key = self.normalize(location)
+        if not key:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places (key, lat, lon, source, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (key, lat, lon, source, time.time()),
+            )
+        self._lru_put(key, (lat, lon))
+
+
+_store: Optional[GeocodeStore] = None
+_store_lock = threading.Lock()
+
+
+def get_geocode_store() -> GeocodeStore:
+    """Process-wide GeocodeStore, opened on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = GeocodeStore()
+    return _store
@@ -1,10 +1,19 @@
 # tools/google_serper_tool.py
 
 import os
+import threading
+import httpx
 import requests
+from tools import http_client
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
+from tools.search_cache import cached_search, acached_search
+
+
+class SerperAPIError(Exception):
+    """Non-200 response from the Serper API."""
+
 
 class GoogleSerperSearch:
     """
@@ -21,8 +30,30 @@ class GoogleSerperSearch:
 
     def search(self, query: str, num_results: int = 10):
         """
-        Perform a Google search via Serper API
+        Perform a Google search via Serper API.
+        Results are served from the shared search cache when available.
         """
+        try:
+            return cached_search("serper", query, num_results, lambda: self._fetch(query, num_results))
+        except SerperAPIError as e:
+            return str(e)
+        except requests.exceptions.RequestException as e:
+            return f"Request failed: {str(e)}"
+        except Exception as e:
+            return f"Error occurred: {str(e)}"
+
+    async def asearch(self, query: str, num_results: int = 10):
+        """Async counterpart of `search`."""
+        try:
+            return await acached_search("serper", query, num_results, lambda: self._afetch(query, num_results))
+        except SerperAPIError as e:
+            return str(e)
+        except httpx.HTTPError as e:
+            return f"Request failed: {str(e)}"
+        except Exception as e:
+            return f"Error occurred: {str(e)}"
+
+    def _request(self, query: str, num_results: int):
         headers = {
             "X-API-KEY": self.api_key,
             "Content-Type": "application/json"
@@ -32,29 +63,46 @@ class GoogleSerperSearch:
             "q": query,
             "num": num_results
         }
+        return headers, payload
 
-        try:
-            response = requests.post(self.endpoint, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code != 200:
-                return f"Serper API error: {response.status_code}, {response.text}"
+    @staticmethod
+    def _format(response, num_results: int) -> str:
+        """Format a requests/httpx response; raises SerperAPIError on non-200."""
+        if response.status_code != 200:
+            raise SerperAPIError(f"Serper API error: {response.status_code}, {response.text}")
 
-            data = response.json()
-            results = []
+        data = response.json()
+        results = []
 
-            # Format results for better readability
-            for item in data.get("organic", [])[:num_results]:
-                result_text = f"- {item.get('title', 'No title')} ({item.get('link', 'No link')})\n  {item.get('snippet', 'No snippet available')}"
-                results.append(result_text)
+        # Format results for better readability
+        for item in data.get("organic", [])[:num_results]:
+            result_text = f"- {item.get('title', 'No title')} ({item.get('link', 'No link')})\n  {item.get('snippet', 'No snippet available')}"
+            results.append(result_text)
 
-            return "\n\n".join(results) if results else "No results found."
-            
-        except requests.exceptions.RequestException as e:
-            return f"Request failed: {str(e)}"
-        except Exception as e:
-            return f"Error occurred: {str(e)}"
+        return "\n\n".join(results) if results else "No results found."
+
+    def _fetch(self, query: str, num_results: int) -> str:
+        """Call the Serper API and format the organic results; raises on failure."""
+        headers, payload = self._request(query, num_results)
+        response = http_client.post(self.endpoint, headers=headers, json=payload, timeout=30)
+        return self._format(response, num_results)
+
+    async def _afetch(self, query: str, num_results: int) -> str:
+        headers, payload = self._request(query, num_results)
+        response = await http_client.apost(self.endpoint, headers=headers, json=payload, timeout=30)
+        return self._format(response, num_results)
 
-_serper_search = GoogleSerperSearch()
+_serper_search = None
+_serper_lock = threading.Lock()
+
+def get_serper_search() -> GoogleSerperSearch:
+    """Shared client, created on first search so a missing key only fails the search, not the import."""
+    global _serper_search
+    if _serper_search is None:
+        with _serper_lock:
+            if _serper_search is None:
+                _serper_search = GoogleSerperSearch()
+    return _serper_search
 
 # Input schema for the tool
 class GoogleSerperSearchInput(BaseModel):
@@ -72,7 +120,11 @@ class GoogleSerperSearchTool(BaseTool):
 
     def _run(self, query: str) -> str:
         query = str(query)
-        return _serper_search.search(query, num_results=5)
+        return get_serper_search().search(query, num_results=5)
+
+    async def _arun(self, query: str) -> str:
+        query = str(query)
+        return await get_serper_search().asearch(query, num_results=5)
 
 if __name__ == "__main__":
     # Test the tool
@@ -1,4 +1,4 @@
-import requests
+from tools import http_client
 from datetime import datetime
 from collections import defaultdict
 from dotenv import load_dotenv
@@ -38,7 +38,7 @@ class OpenWeatherTool:
             "units": "metric"
         }
 
-        response = requests.get(self.base_url, params=params)
+        response = http_client.get(self.base_url, params=params)
         if response.status_code != 200:
             raise Exception(f"OpenWeather API error: {response.status_code} - {response.text}")
 
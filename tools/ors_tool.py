@@ -1,9 +1,15 @@
+import asyncio
 import os
+import httpx
 import requests
+from tools import http_client
 from dotenv import load_dotenv
-from typing import Type
+from typing import Type, List, Tuple, Optional
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from tools.geocode_store import get_geocode_store
+from db.cache import TieredCache
+from config.setting import ROUTE_CACHE_TTL, ROUTE_CACHE_MAX_ENTRIES, ORS_MATRIX_MAX_LOCATIONS
 
 # Load environment variables
 load_dotenv()
@@ -11,14 +17,16 @@ load_dotenv()
 # -----------------------------
 # Original ORS API call logic
 # -----------------------------
-def get_route_summary(start_lat, start_lon, end_lat, end_lon, mode="driving-car"):
+def _api_key():
     api_key = os.getenv("ORS_API_KEY")
     if not api_key:
         raise ValueError("ORS_API_KEY not set in .env file")
+    return api_key
 
+def _directions_request(start_lat, start_lon, end_lat, end_lon, mode):
     url = f"https://api.openrouteservice.org/v2/directions/{mode}"
     headers = {
-        "Authorization": api_key,
+        "Authorization": _api_key(),
         "Content-Type": "application/json"
     }
     body = {
@@ -27,16 +35,9 @@ def get_route_summary(start_lat, start_lon, end_lat, end_lon, mode="driving-car"
             [end_lon, end_lat]
         ]
     }
+    return url, headers, body
 
-    try:
-        response = requests.post(url, json=body, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Request failed: {e}")
-    except ValueError:
-        raise Exception("Invalid JSON response received from ORS API")
-
+def _parse_route(data, mode):
     if "routes" not in data or not data["routes"]:
         raise Exception(f"No route data found: {data}")
 
@@ -47,6 +48,205 @@ def get_route_summary(start_lat, start_lon, end_lat, end_lon, mode="driving-car"
         "mode": mode
     }
 
+def get_route_summary(start_lat, start_lon, end_lat, end_lon, mode="driving-car"):
+    url, headers, body = _directions_request(start_lat, start_lon, end_lat, end_lon, mode)
+
+    try:
+        response = http_client.post(url, json=body, headers=headers, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Request failed: {e}")
+    except ValueError:
+        raise Exception("Invalid JSON response received from ORS API")
+
+    return _parse_route(data, mode)
+
+async def aget_route_summary(start_lat, start_lon, end_lat, end_lon, mode="driving-car"):
+    """Async counterpart of `get_route_summary`."""
+    url, headers, body = _directions_request(start_lat, start_lon, end_lat, end_lon, mode)
+
+    try:
+        response = await http_client.apost(url, json=body, headers=headers, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+    except httpx.HTTPError as e:
+        raise Exception(f"Request failed: {e}")
+    except ValueError:
+        raise Exception("Invalid JSON response received from ORS API")
+
+    return _parse_route(data, mode)
+
+# -----------------------------
+# Many-to-many routing (ORS matrix endpoint)
+# -----------------------------
+# Legs are cached symmetrically: A->B and B->A share one entry.
+route_leg_cache = TieredCache("route", ttl=ROUTE_CACHE_TTL, max_entries=ROUTE_CACHE_MAX_ENTRIES)
+
+
+def _leg_key(mode: str, a: Tuple[float, float], b: Tuple[float, float]) -> str:
+    ends = sorted(f"{round(p[0], 5)},{round(p[1], 5)}" for p in (a, b))
+    return f"{mode}:{ends[0]}|{ends[1]}"
+
+
+def _cover(pairs: set) -> List[int]:
+    """Greedy vertex cover of the missing legs: few sources that touch every missing pair."""
+    remaining = set(pairs)
+    sources = []
+    while remaining:
+        counts = {}
+        for i, j in remaining:
+            counts[i] = counts.get(i, 0) + 1
+            counts[j] = counts.get(j, 0) + 1
+        best = max(counts, key=counts.get)
+        sources.append(best)
+        remaining = {p for p in remaining if best not in p}
+    return sorted(sources)
+
+
+def _chunks(items: List[int], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class _MatrixPlan:
+    """
+    Distance/duration matrix for a set of points, pre-filled from the leg
+    cache (one MGET for all pairs), plus the matrix requests still needed
+    for the missing legs.
+    """
+
+    def __init__(self, points: List[Tuple[float, float]], mode: str):
+        self.points = points
+        self.mode = mode
+        n = len(points)
+        self.distances: List[List[Optional[float]]] = [[0.0 if i == j else None for j in range(n)] for i in range(n)]
+        self.durations: List[List[Optional[float]]] = [[0.0 if i == j else None for j in range(n)] for i in range(n)]
+        self.missing = set()
+        pairs = {}
+        for i in range(n):
+            for j in range(i + 1, n):
+                if points[i] == points[j]:
+                    self._fill(i, j, {"distance_km": 0.0, "duration_min": 0.0})
+                else:
+                    pairs[(i, j)] = _leg_key(mode, points[i], points[j])
+        cached = route_leg_cache.get_many(list(set(pairs.values()))) if pairs else {}
+        for (i, j), key in pairs.items():
+            leg = cached.get(key)
+            if leg is not None:
+                self._fill(i, j, leg)
+            else:
+                self.missing.add((i, j))
+
+    def _fill(self, i, j, leg):
+        self.distances[i][j] = self.distances[j][i] = leg["distance_km"]
+        self.durations[i][j] = self.durations[j][i] = leg["duration_min"]
+
+    def batches(self) -> List[Tuple[List[int], List[int]]]:
+        """(sources, destinations) index chunks that together cover every missing leg."""
+        if not self.missing:
+            return []
+        sources = _cover(self.missing)
+        destinations = sorted({idx for pair in self.missing for idx in pair})
+        size = max(1, ORS_MATRIX_MAX_LOCATIONS // 2)
+        return [
+            (src_chunk, dst_chunk)
+            for src_chunk in _chunks(sources, size)
+            for dst_chunk in _chunks(destinations, size)
+            if any((min(s, d), max(s, d)) in self.missing for s in src_chunk for d in dst_chunk)
+        ]
+
+    def request(self, sources: List[int], destinations: List[int]):
+        """URL, headers and body for one matrix request."""
+        indices = sorted(set(sources) | set(destinations))
+        position = {idx: pos for pos, idx in enumerate(indices)}
+        body = {
+            "locations": [[self.points[i][1], self.points[i][0]] for i in indices],
+            "sources": [position[i] for i in sources],
+            "destinations": [position[i] for i in destinations],
+            "metrics": ["distance", "duration"],
+            "units": "km",
+        }
+        headers = {
+            "Authorization": _api_key(),
+            "Content-Type": "application/json"
+        }
+        return f"https://api.openrouteservice.org/v2/matrix/{self.mode}", headers, body
+
+    def apply(self, sources: List[int], destinations: List[int], data):
+        """Cache every leg in a matrix response (one pipeline) and fill the missing ones."""
+        if "durations" not in data or "distances" not in data:
+            raise Exception(f"No matrix data found: {data}")
+
+        legs = {}
+        for r, src in enumerate(sources):
+            for c, dst in enumerate(destinations):
+                distance, duration = data["distances"][r][c], data["durations"][r][c]
+                if src == dst or distance is None or duration is None:
+                    continue
+                leg = {"distance_km": round(distance, 2), "duration_min": round(duration / 60, 2)}
+                legs[_leg_key(self.mode, self.points[src], self.points[dst])] = leg
+                if (min(src, dst), max(src, dst)) in self.missing:
+                    self._fill(src, dst, leg)
+        if legs:
+            route_leg_cache.set_many(legs)
+
+    def result(self, requests_made: int):
+        return {
+            "mode": self.mode,
+            "distances_km": self.distances,
+            "durations_min": self.durations,
+            "requests": requests_made,
+        }
+
+
+def get_route_matrix(points: List[Tuple[float, float]], mode: str = "driving-car"):
+    """
+    Distances and durations between every pair of (lat, lon) points.
+
+    Cached legs are reused; only the missing ones are requested, in as few
+    matrix calls as ORS_MATRIX_MAX_LOCATIONS allows. Unroutable legs are None.
+
+    Returns:
+        dict: {"mode", "distances_km": NxN list, "durations_min": NxN list, "requests": int}
+    """
+    plan = _MatrixPlan(points, mode)
+    batches = plan.batches()
+    for sources, destinations in batches:
+        url, headers, body = plan.request(sources, destinations)
+        try:
+            response = http_client.post(url, json=body, headers=headers, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {e}")
+        except ValueError:
+            raise Exception("Invalid JSON response received from ORS API")
+        plan.apply(sources, destinations, data)
+    return plan.result(len(batches))
+
+
+async def aget_route_matrix(points: List[Tuple[float, float]], mode: str = "driving-car"):
+    """Async counterpart of `get_route_matrix`; batches are requested concurrently."""
+    plan = await asyncio.to_thread(_MatrixPlan, points, mode)
+    batches = plan.batches()
+
+    async def fetch(sources, destinations):
+        url, headers, body = plan.request(sources, destinations)
+        try:
+            response = await http_client.apost(url, json=body, headers=headers, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            raise Exception(f"Request failed: {e}")
+        except ValueError:
+            raise Exception("Invalid JSON response received from ORS API")
+
+    responses = await asyncio.gather(*(fetch(src, dst) for src, dst in batches))
+    for (sources, destinations), data in zip(batches, responses):
+        await asyncio.to_thread(plan.apply, sources, destinations, data)
+    return plan.result(len(batches))
+
 # -----------------------------
 # Simplified Input schema for location-based searches
 # -----------------------------
@@ -58,39 +258,80 @@ class ORSLocationInput(BaseModel):
 # -----------------------------
 # Helper function to get coordinates from location names
 # -----------------------------
+GEOCODE_URL = "https://api.openrouteservice.org/geocode/search"
+
+def _geocode_params(location: str):
+    return {
+        "api_key": _api_key(),
+        "text": location,
+        "size": 1
+    }
+
+def _parse_geocode(data, location: str):
+    if not data.get("features"):
+        raise Exception(f"Location '{location}' not found")
+
+    coordinates = data["features"][0]["geometry"]["coordinates"]
+    return coordinates[1], coordinates[0]  # lat, lon
+
 def get_coordinates(location: str):
     """
-    Get coordinates for a location using a geocoding service.
-    This is a simplified version - you might want to use a proper geocoding API.
+    Get coordinates for a location.
+    Known places are resolved from the local geocode store (gazetteer + cached
+    lookups); anything else goes to the OpenRouteService geocoding API and is
+    saved for next time.
     """
+    store = get_geocode_store()
+    cached = store.lookup(location)
+    if cached is not None:
+        return cached
+
     # Using OpenRouteService geocoding API
-    api_key = os.getenv("ORS_API_KEY")
-    if not api_key:
-        raise ValueError("ORS_API_KEY not set in .env file")
-    
-    geocode_url = "https://api.openrouteservice.org/geocode/search"
-    params = {
-        "api_key": api_key,
-        "text": location,
-        "size": 1
-    }
-    
+    params = _geocode_params(location)
+
     try:
-        response = requests.get(geocode_url, params=params, timeout=10)
+        response = http_client.get(GEOCODE_URL, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
-        
-        if not data.get("features"):
-            raise Exception(f"Location '{location}' not found")
-        
-        coordinates = data["features"][0]["geometry"]["coordinates"]
-        return coordinates[1], coordinates[0]  # lat, lon
+        lat, lon = _parse_geocode(response.json(), location)
     except Exception as e:
         raise Exception(f"Failed to geocode '{location}': {e}")
 
+    store.save(location, lat, lon)
+    return lat, lon
+
+async def aget_coordinates(location: str):
+    """
+    Async counterpart of `get_coordinates`. The geocode store does SQLite
+    I/O (and seeds the gazetteer when first opened), so it runs in a worker thread.
+    """
+    store = await asyncio.to_thread(get_geocode_store)
+    cached = await asyncio.to_thread(store.lookup, location)
+    if cached is not None:
+        return cached
+
+    params = _geocode_params(location)
+
+    try:
+        response = await http_client.aget(GEOCODE_URL, params=params, timeout=10)
+        response.raise_for_status()
+        lat, lon = _parse_geocode(response.json(), location)
+    except Exception as e:
+        raise Exception(f"Failed to geocode '{location}': {e}")
+
+    await asyncio.to_thread(store.save, location, lat, lon)
+    return lat, lon
+
 # -----------------------------
 # ORS Tool as CrewAI BaseTool (Location-based)
 # -----------------------------
+def _format_route(start_location: str, end_location: str, summary) -> str:
+    return (
+        f"Route from {start_location} to {end_location}\n"
+        f"Mode: {summary['mode']}\n"
+        f"Distance: {summary['distance_km']} km\n"
+        f"Duration: {summary['duration_min']} minutes"
+    )
+
 class ORSLocationTool(BaseTool):
     name: str = "OpenRouteService Location Route Finder"
     description: str = (
@@ -111,15 +352,73 @@ class ORSLocationTool(BaseTool):
             # Get route summary
             summary = get_route_summary(start_lat, start_lon, end_lat, end_lon, mode)
             
-            return (
-                f"Route from {start_location} to {end_location}\n"
-                f"Mode: {summary['mode']}\n"
-                f"Distance: {summary['distance_km']} km\n"
-                f"Duration: {summary['duration_min']} minutes"
+            return _format_route(start_location, end_location, summary)
+        except Exception as e:
+            return f"Error getting route information: {str(e)}"
+
+    async def _arun(self, start_location: str, end_location: str, mode: str = "driving-car") -> str:
+        """
+        Async counterpart of `_run`; both locations are geocoded concurrently.
+        """
+        try:
+            (start_lat, start_lon), (end_lat, end_lon) = await asyncio.gather(
+                aget_coordinates(start_location), aget_coordinates(end_location)
             )
+            summary = await aget_route_summary(start_lat, start_lon, end_lat, end_lon, mode)
+            return _format_route(start_location, end_location, summary)
         except Exception as e:
             return f"Error getting route information: {str(e)}"
 
+# -----------------------------
+# ORS Matrix Tool (many locations at once)
+# -----------------------------
+class ORSMatrixInput(BaseModel):
+    locations: List[str] = Field(..., description="List of locations (cities, addresses, or landmarks), at least two")
+    mode: str = Field("driving-car", description="Transport mode: driving-car, cycling-regular, foot-walking, etc.")
+
+def _format_matrix(locations: List[str], matrix) -> str:
+    lines = [f"Distance matrix (mode: {matrix['mode']})"]
+    for i in range(len(locations)):
+        for j in range(i + 1, len(locations)):
+            distance, duration = matrix["distances_km"][i][j], matrix["durations_min"][i][j]
+            if distance is None:
+                lines.append(f"{locations[i]} <-> {locations[j]}: no route found")
+            else:
+                lines.append(f"{locations[i]} <-> {locations[j]}: {distance} km, {duration} minutes")
+    return "\n".join(lines)
+
+class ORSMatrixTool(BaseTool):
+    name: str = "OpenRouteService Distance Matrix"
+    description: str = (
+        "Get travel distance and duration between every pair of several locations in one call. "
+        "Use this for multi-stop itineraries instead of asking for each route separately."
+    )
+    args_schema: Type[BaseModel] = ORSMatrixInput
+
+    def _run(self, locations: List[str], mode: str = "driving-car") -> str:
+        """
+        CrewAI tool interface to call the ORS matrix API with location names.
+        """
+        try:
+            if len(locations) < 2:
+                return "Please provide at least two locations."
+            points = [get_coordinates(location) for location in locations]
+            return _format_matrix(locations, get_route_matrix(points, mode))
+        except Exception as e:
+            return f"Error getting route matrix: {str(e)}"
+
+    async def _arun(self, locations: List[str], mode: str = "driving-car") -> str:
+        """
+        Async counterpart of `_run`; all locations are geocoded concurrently.
+        """
+        try:
+            if len(locations) < 2:
+                return "Please provide at least two locations."
+            points = await asyncio.gather(*(aget_coordinates(location) for location in locations))
+            return _format_matrix(locations, await aget_route_matrix(list(points), mode))
+        except Exception as e:
+            return f"Error getting route matrix: {str(e)}"
+
 # -----------------------------
 # Original coordinate-based tool (kept for backward compatibility)
 # -----------------------------
@@ -148,6 +447,16 @@ class ORSTool(BaseTool):
         except Exception as e:
             return f"Error getting route information: {str(e)}"
 
+    async def _arun(self, start_lat: float, start_lon: float, end_lat: float, end_lon: float, mode: str = "driving-car") -> str:
+        """
+        Async counterpart of `_run`.
+        """
+        try:
+            summary = await aget_route_summary(start_lat, start_lon, end_lat, end_lon, mode)
+            return f"Mode: {summary['mode']}\nDistance: {summary['distance_km']} km\nDuration: {summary['duration_min']} minutes"
+        except Exception as e:
+            return f"Error getting route information: {str(e)}"
+
 # -----------------------------
 # Test run
 # -----------------------------
@@ -0,0 +1,53 @@
+# tools/search_cache.py
+import re
+import unicodedata
+from typing import Awaitable, Callable
+
+from config.setting import SEARCH_CACHE_TTL, SEARCH_CACHE_EMPTY_TTL, SEARCH_CACHE_MAX_ENTRIES
+from db.cache import TieredCache, hash_key
+
+search_cache = TieredCache("search", ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+
+# Queries containing these depend on their small words ("flights to goa" vs "flights from goa")
+# or use search operators, so their stopwords are kept.
+_ORDER_SENSITIVE = re.compile(r"\b(?:to|from|vs|versus|before|after|between|via|not|or)\b|[\"+:-]")
+_PUNCTUATION = re.compile(r"[^\w\s\"+:-]")
+_STOPWORDS = {"a", "an", "the", "in", "of", "for", "at", "on", "and"}
+_EMPTY_RESULTS = {"", "no results found."}
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a search query: Unicode-normalised, case-folded,
+    punctuation and extra whitespace removed, and stopwords dropped when the
+    query has no order-sensitive word or operator. Word order is always kept:
+    "delhi goa train" and "goa delhi train" are different journeys.
+    """
+    q = unicodedata.normalize("NFKC", str(query)).casefold()
+    q = _PUNCTUATION.sub(" ", q)
+    tokens = q.split()
+    if not _ORDER_SENSITIVE.search(q):
+        tokens = [t for t in tokens if t not in _STOPWORDS] or tokens
+    return " ".join(tokens)
+
+
+def _ttl_for(results: str) -> int:
+    # An empty answer is often transient (rate limit, backend hiccup); don't let it hide real results for long
+    return SEARCH_CACHE_EMPTY_TTL if str(results).strip().casefold() in _EMPTY_RESULTS else SEARCH_CACHE_TTL
+
+
+def cached_search(engine: str, query: str, num_results: int, fetch: Callable[[], str], refresh: bool = False) -> str:
+    """
+    Return formatted results for `query` from the search cache, calling `fetch`
+    on a miss. Identical concurrent queries share a single outbound request.
+    `fetch` should raise on failure so error messages are never cached;
+    empty results are cached for SEARCH_CACHE_EMPTY_TTL only.
+    """
+    key = hash_key(engine, normalize_query(query), num_results)
+    return search_cache.get_or_compute(key, fetch, ttl=_ttl_for, refresh=refresh)
+
+
+async def acached_search(engine: str, query: str, num_results: int, fetch: Callable[[], Awaitable[str]], refresh: bool = False) -> str:
+    """Async counterpart of `cached_search` for coroutine fetchers."""
+    key = hash_key(engine, normalize_query(query), num_results)
+    return await search_cache.aget_or_compute(key, fetch, ttl=_ttl_for, refresh=refresh)
@@ -0,0 +1,85 @@
+# utils/importtime.py
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry points that must stay cheap to import, and heavy packages they must not pull in eagerly
+DEFAULT_MODULES = ("orchestration",)
+DEFAULT_FORBIDDEN = ("crewai", "litellm", "torch", "langchain_huggingface", "onnxruntime")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class ImportEntry:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(module: str, env: Dict[str, str] = None) -> List[ImportEntry]:
+    """Import `module` in a fresh interpreter with `-X importtime` and parse its report."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, **(env or {})},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(ImportEntry(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def report(module: str, entries: Sequence[ImportEntry], top: int = 10) -> str:
+    total = next((e.cumulative_us for e in reversed(entries) if e.module == module), 0)
+    lines = [f"{module}: {total / 1000:.1f} ms, {len(entries)} modules"]
+    for entry in sorted(entries, key=lambda e: -e.self_us)[:top]:
+        lines.append(f"  {entry.self_us / 1000:8.1f} ms self  {entry.cumulative_us / 1000:8.1f} ms cum  {entry.module}")
+    return "\n".join(lines)
+
+
+def check(module: str, entries: Sequence[ImportEntry], max_ms: float = None,
+          forbidden: Sequence[str] = DEFAULT_FORBIDDEN) -> List[str]:
+    """Startup regressions: the import took longer than `max_ms`, or loaded a forbidden package."""
+    problems = []
+    total_ms = next((e.cumulative_us for e in reversed(entries) if e.module == module), 0) / 1000
+    if max_ms is not None and total_ms > max_ms:
+        problems.append(f"{module} took {total_ms:.1f} ms to import (limit {max_ms:.0f} ms)")
+    loaded = {e.module.split(".")[0] for e in entries}
+    for package in forbidden:
+        if package in loaded:
+            problems.append(f"{module} imports {package} eagerly")
+    return problems
+
+
+if __name__ == "__main__":
+    # python -m utils.importtime [module ...] [--max-ms 500] [--top 15]
+    # Exits non-zero on a regression so it can run in CI.
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Track cold-start import cost of the app's entry points.")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list, by self time")
+    parser.add_argument("--max-ms", type=float, help="fail if an import takes longer than this")
+    parser.add_argument("--allow", nargs="*", default=[], help="heavy packages allowed to load at import")
+    args = parser.parse_args()
+
+    forbidden = [p for p in DEFAULT_FORBIDDEN if p not in args.allow]
+    failures = []
+    for name in args.modules:
+        measured = measure(name)
+        print(report(name, measured, args.top))
+        failures += check(name, measured, args.max_ms, forbidden)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,63 @@
+# utils/tokens.py
+from functools import lru_cache
+
+TOKEN_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        # No tiktoken or no cached BPE file: fall back to ~4 characters per token
+        print(f"tiktoken unavailable, estimating token counts: {e}")
+        return None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Number of tokens in `text` under the cl100k_base encoding."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, budget: int, suffix: str = " …") -> str:
+    """`text` cut to at most `budget` tokens (suffix included), on a token boundary."""
+    if budget <= 0 or not text:
+        return ""
+    if count_tokens(text) <= budget:
+        return text
+    keep = max(budget - count_tokens(suffix), 0)
+    encoding = _encoding()
+    if encoding is None:
+        return text[: keep * 4] + suffix
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]) + suffix
+
+
+def fit_to_budget(parts: list[str], budget: int, separator: str = "\n") -> tuple[list[str], int]:
+    """
+    Keep `parts` in order until the budget runs out; the part that overflows is
+    truncated and the rest dropped. Returns the kept parts and the tokens used.
+    """
+    kept: list[str] = []
+    used = 0
+    sep_tokens = count_tokens(separator)
+    for part in parts:
+        remaining = budget - used - (sep_tokens if kept else 0)
+        if remaining <= 0:
+            break
+        cost = count_tokens(part)
+        if cost > remaining:
+            part = truncate_to_tokens(part, remaining)
+            if not part:
+                break
+            cost = count_tokens(part)
+        used += cost + (sep_tokens if kept else 0)
+        kept.append(part)
+    return kept, used
+